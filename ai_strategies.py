@@ -0,0 +1,109 @@
+from maze_grid import Vec2I
+from maze_pathfinding import descend
+from maze_simulation import DOWN, LEFT, RIGHT, UP, MazeSimulation
+
+# Headings in clockwise order (North, East, South, West), so turning right is +1
+HEADINGS = (UP, RIGHT, DOWN, LEFT)
+
+class Strategy:
+    # A maze-running policy for one player. reset() is called at the start of each
+    # round and choose() whenever the player may move; it returns a direction or None.
+    name = ""
+
+    def reset(self, sim: MazeSimulation, player: int) -> None:
+        pass
+
+    def choose(self, sim: MazeSimulation, player: int) -> Vec2I | None:
+        raise NotImplementedError
+
+def _position(sim: MazeSimulation, player: int) -> Vec2I:
+    return sim.player1_pos if player == 1 else sim.player2_pos
+
+def _target(sim: MazeSimulation, player: int) -> Vec2I:
+    return sim.player1_target if player == 1 else sim.player2_target
+
+class AStarGreedy(Strategy):
+    # The original move_ai: follow an A* path, falling back to a random step that
+    # prefers moves towards the target when no path is known
+    name = "astar"
+
+    def __init__(self) -> None:
+        self.path: list[Vec2I] = []
+
+    def reset(self, sim: MazeSimulation, player: int) -> None:
+        self.path = []
+
+    def choose(self, sim: MazeSimulation, player: int) -> Vec2I | None:
+        pos = _position(sim, player)
+        target = _target(sim, player)
+        if not self.path or sim.get_distance(pos, self.path[0]) != 1:
+            self.path = sim.find_path(pos, target)
+
+        if self.path:
+            next_pos = self.path.pop(0)
+            return Vec2I(next_pos.x - pos.x, next_pos.y - pos.y)
+
+        possible_moves = [move for move in (LEFT, RIGHT, UP, DOWN) if sim.can_move(pos, move)]
+        if not possible_moves:
+            return None
+        distance = sim.get_distance(pos, target)
+        toward_target_moves = [move for move in possible_moves if sim.get_distance(pos + move, target) < distance]
+        return sim.rng.choice(toward_target_moves or possible_moves)
+
+class RandomWalker(Strategy):
+    name = "random"
+
+    def choose(self, sim: MazeSimulation, player: int) -> Vec2I | None:
+        pos = _position(sim, player)
+        possible_moves = [move for move in HEADINGS if sim.can_move(pos, move)]
+        return sim.rng.choice(possible_moves) if possible_moves else None
+
+class WallFollower(Strategy):
+    # Keeps one hand on the wall; in a perfect maze this visits every cell, so the
+    # exit is always found eventually
+    def __init__(self, hand: str = "left") -> None:
+        self.hand = hand
+        self.name = f"{hand}-wall"
+        # Turn order relative to the current heading: hand side, straight, other side, back
+        self.turns = (3, 0, 1, 2) if hand == "left" else (1, 0, 3, 2)
+        self.heading = 1
+
+    def reset(self, sim: MazeSimulation, player: int) -> None:
+        # Player 1 enters on the west side facing east, player 2 the other way round
+        self.heading = 1 if player == 1 else 3
+
+    def choose(self, sim: MazeSimulation, player: int) -> Vec2I | None:
+        pos = _position(sim, player)
+        for turn in self.turns:
+            heading = (self.heading + turn) % 4
+            if sim.can_move(pos, HEADINGS[heading]):
+                self.heading = heading
+                return HEADINGS[heading]
+        return None
+
+class DistanceFieldWalker(Strategy):
+    # Steps down the exit distance field computed in setup_game
+    name = "distance"
+
+    def choose(self, sim: MazeSimulation, player: int) -> Vec2I | None:
+        pos = _position(sim, player)
+        w = sim.maze_width
+        field = sim.exit_distances(player)
+        nxt = descend(sim.maze, field, pos.y * w + pos.x)
+        if nxt < 0:
+            return None
+        return Vec2I(nxt % w - pos.x, nxt // w - pos.y)
+
+STRATEGIES = {
+    "astar": AStarGreedy,
+    "random": RandomWalker,
+    "left-wall": lambda: WallFollower("left"),
+    "right-wall": lambda: WallFollower("right"),
+    "distance": DistanceFieldWalker,
+}
+
+def create_strategy(name: str) -> Strategy:
+    try:
+        return STRATEGIES[name]()
+    except KeyError:
+        raise ValueError(f"Unknown strategy {name!r}, expected one of {', '.join(STRATEGIES)}") from None
@@ -1,20 +1,51 @@
-import pygame
-import random
+from startup_clock import STARTUP_CLOCK  # first, so the clock predates the other imports
+import argparse
 import time
-from enum import Enum
-
-# Initialize Pygame
-pygame.init()
+import pygame
+from array import array
+from collections import OrderedDict, deque
+from collections.abc import Iterator
+from pathlib import Path
+import maze_raster
+from maze_grid import CellPath, Vec2I, np, parse_size
+from maze_camera import Camera, ChunkCache
+from maze_format import load_maze
+from maze_generators import GENERATORS
+from maze_prefetch import MazePrefetcher
+from maze_profiler import FrameProfiler, StartupTimer
+from maze_replay import Replay
+from maze_scheduler import TimeSlicedScheduler
+from maze_simulation import (AI_MOVE_INTERVAL, CARVE_BATCH, DOWN, KEY_COOLDOWN, LEFT, RIGHT, TICK_SECONDS, UP,
+                             GameState, MazeSimulation, PreparedMaze)
 
 # Constants
 SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
 DRAWING_SCALE = 8
-AI_MOVE_INTERVAL = 0.25
 MAZE_OFFSET = (80, 50)
 MAZE_COLOR = (189, 252, 201)  # Mint color
-KEY_COOLDOWN = 0.1
 GAME_FONT = "Consolas"
+FRAME_RATE = 60
+MAX_CATCH_UP_TICKS = 5  # logic ticks per frame before the backlog is dropped
+
+# Mazes too big for the screen scroll: cameras show pre-rendered chunks of the maze
+VIEWPORT = pygame.Rect(0, 50, SCREEN_WIDTH, 490)  # between the top and bottom HUD lines
+SPLIT_VIEWPORTS = (pygame.Rect(0, 50, SCREEN_WIDTH // 2 - 2, 490),
+                   pygame.Rect(SCREEN_WIDTH // 2 + 2, 50, SCREEN_WIDTH // 2 - 2, 490))
+CHUNK_CELLS = 16  # cells per chunk side (512 pixels at the game's drawing scale)
+CHUNK_CACHE_SIZE = 32
+WORLD_MARGIN = 64  # pixels around the maze, room for the exit markers
+
+# Profiling overlay (when profiling is enabled) and the cProfile capture length
+PROFILE_OVERLAY_POS = (SCREEN_WIDTH - 200, 55)
+PROFILE_CAPTURE_FRAMES = 300
+
+# Incremental generation: a maze is carved a few milliseconds per frame during warm-up
+# instead of in one blocking call. --reveal shows every maze being carved; mazes from
+# INCREMENTAL_CELLS up are carved this way whenever no prefetched one is ready.
+CARVE_BUDGET_MS = 4.0
+INCREMENTAL_CELLS = 250_000
+REVEAL_SECONDS = 2.0  # pacing of --reveal for mazes that carve faster than the budget
 
 # Colors
 BLACK = (0, 0, 0)
@@ -26,329 +57,256 @@ CYAN = (0, 255, 255)
 YELLOW = (255, 255, 0)
 BEIGE = (245, 245, 220)
 MINT = (189, 252, 201)
+ORANGE = (255, 165, 0)
 
-class CellPath(Enum):
-    NORTH = 1
-    EAST = 2
-    SOUTH = 4
-    WEST = 8
-    VISITED = 16
+# Key bindings, in the order the directions are applied
+PLAYER1_KEYS = ((pygame.K_LEFT, LEFT), (pygame.K_RIGHT, RIGHT), (pygame.K_UP, UP), (pygame.K_DOWN, DOWN))
+PLAYER2_KEYS = ((pygame.K_a, LEFT), (pygame.K_d, RIGHT), (pygame.K_w, UP), (pygame.K_s, DOWN))
 
-class GameState(Enum):
-    TITLE = 0
-    WARMUP = 1
-    PLAYING = 2
-    PAUSED = 3
-    RESULT = 4
-
-class Vec2I:
-    def __init__(self, x: int, y: int) -> None:
-        self.x: int = x
-        self.y: int = y
+class FrameTimer:
+    def __init__(self, window: int = 60) -> None:
+        # Rolling window of recent frame times plus totals since start
+        self.samples: deque[float] = deque(maxlen=window)
+        self.total = 0.0
+        self.frames = 0
     
-    def __add__(self, other: "Vec2I") -> "Vec2I":
-        return Vec2I(self.x + other.x, self.y + other.y)
+    def record(self, seconds: float) -> None:
+        self.samples.append(seconds)
+        self.total += seconds
+        self.frames += 1
     
-    def __eq__(self, other: "Vec2I") -> bool:
-        return self.x == other.x and self.y == other.y
+    @property
+    def average_ms(self) -> float:
+        return 1000.0 * sum(self.samples) / len(self.samples) if self.samples else 0.0
     
-    def __hash__(self) -> int:
-        return hash((self.x, self.y))
+    @property
+    def overall_ms(self) -> float:
+        return 1000.0 * self.total / self.frames if self.frames else 0.0
+
+class TextCache:
+    def __init__(self, max_size: int = 256) -> None:
+        # Least-recently-used rendered text surfaces keyed by (font, text, color)
+        self.surfaces: OrderedDict[tuple, pygame.Surface] = OrderedDict()
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
     
-    def __str__(self) -> str:
-        return f"({self.x}, {self.y})"
+    def render(self, font: pygame.font.Font, text: str, color: tuple) -> pygame.Surface:
+        key = (font, text, color)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+        
+        self.misses += 1
+        surface = font.render(text, True, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_size:
+            self.surfaces.popitem(last=False)
+        return surface
+    
+    def blit_glyphs(self, target: pygame.Surface, font: pygame.font.Font, text: str, color: tuple,
+                    pos: tuple[int, int]) -> pygame.Rect:
+        # Composite per-character glyphs, so fast-changing text such as the timer
+        # reuses a handful of cached surfaces instead of rendering every new value
+        x, y = pos
+        rect = pygame.Rect(x, y, 0, 0)
+        for char in text:
+            glyph_rect = target.blit(self.render(font, char, color), (x, y))
+            rect.union_ip(glyph_rect)
+            x += glyph_rect.width
+        return rect
 
-class PathNode:
-    def __init__(self, position: Vec2I) -> None:
-        self.position: Vec2I = position
-        self.parent: PathNode | None = None
-        self.g_cost: int = 0
-        self.h_cost: int = 0
+class FontCache:
+    def __init__(self, name: str = GAME_FONT, path: str | None = None, bold: bool = True) -> None:
+        # Fonts by size, each resolved the first time it is drawn with. Looking up a
+        # system font scans the installed fonts (fontconfig on Linux), so a TTF file
+        # given as path, e.g. one bundled with the game, is loaded directly instead;
+        # it should be the face to draw with, since no bold is applied to it.
+        self.name = name
+        self.path = path
+        self.bold = bold
+        self.fonts: dict[int, pygame.font.Font] = {}
+        self.load_seconds = 0.0
     
-    @property
-    def f_cost(self) -> int:
-        return self.g_cost + self.h_cost
+    def get(self, size: int) -> pygame.font.Font:
+        font = self.fonts.get(size)
+        if font is None:
+            start = time.perf_counter()
+            if self.path:
+                font = pygame.font.Font(self.path, size)
+            else:
+                font = pygame.font.SysFont(self.name, size, self.bold)
+            self.fonts[size] = font
+            self.load_seconds += time.perf_counter() - start
+        return font
 
-class AmazingMaze:
-    def __init__(self) -> None:
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+class AmazingMaze(MazeSimulation):
+    def __init__(self, seed: int | None = None, frame_rate: int = FRAME_RATE, vsync: bool = False,
+                 record_path: str | None = None, maze_path: str | None = None, algorithm: str = "dfs",
+                 maze_width: int = 20, maze_height: int = 15, profiler: FrameProfiler | None = None,
+                 profile_capture_frames: int = PROFILE_CAPTURE_FRAMES, reveal: bool = False,
+                 racers: int = 0, min_difficulty: float = 0.0, font_path: str | None = None,
+                 startup: StartupTimer | None = None, shifting_walls: bool = False) -> None:
+        # Only the subsystems the game uses (pygame.init() would also start audio and
+        # joysticks); startup, when given, times each phase up to the first title frame
+        self.startup = startup
+        pygame.display.init()
+        pygame.font.init()
+        if startup is not None:
+            startup.mark("pygame display and font")
+        if vsync:
+            self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SCALED, vsync=1)
+        else:
+            self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption("Amazing Maze Remake")
-        self.clock = pygame.time.Clock()
-        self.font_tiny = pygame.font.SysFont(GAME_FONT, 12, True)
-        self.font_small = pygame.font.SysFont(GAME_FONT, 24, True)
-        self.font_medium = pygame.font.SysFont(GAME_FONT, 36, True)
-        self.font_large = pygame.font.SysFont(GAME_FONT, 48, True)
-        
-        # Maze parameters
-        self.maze_width = 20
-        self.maze_height = 15
+        if startup is not None:
+            startup.mark("window")
+        # Frame pacing: 0 frames per second (or vsync) renders as fast as the display allows
+        self.frame_rate = 0 if vsync else frame_rate
+        self.fonts = FontCache(GAME_FONT, font_path)
+        
+        # Maze, players and timers live in the pygame-free MazeSimulation
+        super().__init__(maze_width, maze_height, seed=seed, algorithm=algorithm, racers=racers,
+                         min_difficulty=min_difficulty, shifting_walls=shifting_walls)
         self.path_width = 3
-        self.maze = []
-        
-        # Game state
-        self.game_state = GameState.TITLE
-        self.visited_cells = 0
-        self.stack = []
-        
-        # Player and AI variables
-        self.player1_pos = Vec2I(0, 0)
-        self.player2_pos = Vec2I(0, 0)
-        self.player1_start = Vec2I(0, 0)
-        self.player2_start = Vec2I(0, 0)
-        self.player1_target = Vec2I(0, 0)
-        self.player2_target = Vec2I(0, 0)
-        self.player1_finished = False
-        self.player2_finished = False
-        self.game_timer = 0.0
-        self.warmup_timer = 0.0
-        self.ai_move_timer = 0.0
-        self.ai_path = None
-        self.player1_key_timer = 0.0
-        self.player2_key_timer = 0.0
         self.pause_pressed = False
         
-        # Game mode
-        self.two_player_mode = False
+        # Fixed-timestep logic: real time accumulates and is spent in TICK_SECONDS steps
+        self.tick_accumulator = 0.0
+        # Sprite glides as (from cell, to cell, tick of the move), for interpolated drawing
+        self.player1_motion = (Vec2I(0, 0), Vec2I(0, 0), 0)
+        self.player2_motion = (Vec2I(0, 0), Vec2I(0, 0), 0)
+        
+        # Replay recording of each round, saved when the round ends as record_path with
+        # the round number added to its name (round.amr -> round-1.amr, round-2.amr...)
+        self.record_path = record_path
+        self.replay: Replay | None = None
+        self.recorded_rounds = 0
+        
+        # A maze file to play every round on instead of generated mazes
+        self.maze_path = maze_path
+        
+        # Rendering: static maze layer plus the screen regions drawn over it last frame
+        self.maze_surface: pygame.Surface | None = None
+        self.full_redraw = True
+        self.hud_text: dict[str, tuple[str, pygame.Rect]] = {}
+        self.sprite_rects: list[pygame.Rect] = []
+        self.sprite_positions: tuple = ()
+        self.frame_timer = FrameTimer()
+        self.text_cache = TextCache()
+        self.show_frame_time = False
+        self.frame_time_text = ""
+        self.rasterise = np is not None  # maze cells as one image.frombuffer surface (maze_raster), not per-cell draw calls
+        
+        # Opt-in per-phase frame profiling: F4 toggles its overlay, F5 runs cProfile
+        self.profiler = profiler or FrameProfiler()
+        self.profile_capture_frames = profile_capture_frames
+        self.show_profile = self.profiler.enabled
+        self.profile_overlay: pygame.Surface | None = None
+        
+        # Scrolling view for mazes that do not fit on screen (split in two-player mode)
+        self.chunks = ChunkCache(self.render_chunk, CHUNK_CACHE_SIZE)
+        self.cameras = [Camera(VIEWPORT)]
+        self.split_cameras = [Camera(viewport) for viewport in SPLIT_VIEWPORTS]
+        
+        # Time-sliced incremental carving; carve_head is the last cell carved, which the
+        # camera follows until the players appear
+        self.reveal = reveal
+        self.scheduler = TimeSlicedScheduler(CARVE_BUDGET_MS)
+        self.carve_head = 0
+        self.reveal_rect: pygame.Rect | None = None  # screen area carved since the last frame
+        self.shift_rect: pygame.Rect | None = None  # screen area whose walls shifted since the last frame
         
         # Colors
         self.player1_color = CYAN
         self.player2_color = GREEN
         self.ai_color = YELLOW
-        
-        self.generate_maze()
-        self.setup_game()
+        self.racer_color = ORANGE
+        
+        # Mazes for upcoming rounds are generated in the background (unless every maze
+        # is to be carved on screen), starting once the title screen is up; the first
+        # round's maze is not made before then either
+        self.prefetcher = MazePrefetcher(self.maze_width, self.maze_height, self.seed_source,
+                                         size=0 if reveal else 2, algorithm=self.maze_algorithm,
+                                         min_difficulty=min_difficulty, start=False)
+        self.round_start_ms = 0.0
+        if startup is not None:
+            startup.mark("game state")
+    
+    @property
+    def font_tiny(self) -> pygame.font.Font:
+        return self.fonts.get(12)
+    
+    @property
+    def font_small(self) -> pygame.font.Font:
+        return self.fonts.get(24)
+    
+    @property
+    def font_medium(self) -> pygame.font.Font:
+        return self.fonts.get(36)
+    
+    @property
+    def font_large(self) -> pygame.font.Font:
+        return self.fonts.get(48)
     
     def generate_maze(self) -> None:
-        # Initialize maze
-        self.maze = [0] * (self.maze_width * self.maze_height)
-        self.visited_cells = 0
-        self.stack: list[Vec2I] = []
-        
-        # Choose a starting cell
-        x = random.randint(0, self.maze_width - 1)
-        y = random.randint(0, self.maze_height - 1)
-        self.stack.append(Vec2I(x, y))
-        self.maze[y * self.maze_width + x] = CellPath.VISITED.value
-        self.visited_cells = 1
-        
-        # Generate maze using depth-first search
-        while self.visited_cells < self.maze_width * self.maze_height:
-            def offset(xo, yo):
-                new_x = self.stack[-1].x + xo
-                new_y = self.stack[-1].y + yo
-                if new_x < 0 or new_x >= self.maze_width or new_y < 0 or new_y >= self.maze_height:
-                    return -1
-                return new_y * self.maze_width + new_x
-            
-            # Create a set of unvisited neighbours
-            neighbours = []
-            
-            # Check all four directions
-            if self.stack[-1].y > 0 and (self.maze[offset(0, -1)] & CellPath.VISITED.value) == 0:
-                neighbours.append(0)
-            if self.stack[-1].x < self.maze_width - 1 and (self.maze[offset(1, 0)] & CellPath.VISITED.value) == 0:
-                neighbours.append(1)
-            if self.stack[-1].y < self.maze_height - 1 and (self.maze[offset(0, 1)] & CellPath.VISITED.value) == 0:
-                neighbours.append(2)
-            if self.stack[-1].x > 0 and (self.maze[offset(-1, 0)] & CellPath.VISITED.value) == 0:
-                neighbours.append(3)
-            
-            if neighbours:
-                # Choose random neighbor
-                next_dir = random.choice(neighbours)
-                
-                if next_dir == 0:  # North
-                    self.maze[offset(0, -1)] = self.maze[offset(0, -1)] | CellPath.VISITED.value | CellPath.SOUTH.value
-                    self.maze[offset(0, 0)] = self.maze[offset(0, 0)] | CellPath.NORTH.value
-                    self.stack.append(Vec2I(self.stack[-1].x, self.stack[-1].y - 1))
-                elif next_dir == 1:  # East
-                    self.maze[offset(1, 0)] = self.maze[offset(1, 0)] | CellPath.VISITED.value | CellPath.WEST.value
-                    self.maze[offset(0, 0)] = self.maze[offset(0, 0)] | CellPath.EAST.value
-                    self.stack.append(Vec2I(self.stack[-1].x + 1, self.stack[-1].y))
-                elif next_dir == 2:  # South
-                    self.maze[offset(0, 1)] = self.maze[offset(0, 1)] | CellPath.VISITED.value | CellPath.NORTH.value
-                    self.maze[offset(0, 0)] = self.maze[offset(0, 0)] | CellPath.SOUTH.value
-                    self.stack.append(Vec2I(self.stack[-1].x, self.stack[-1].y + 1))
-                elif next_dir == 3:  # West
-                    self.maze[offset(-1, 0)] = self.maze[offset(-1, 0)] | CellPath.VISITED.value | CellPath.EAST.value
-                    self.maze[offset(0, 0)] = self.maze[offset(0, 0)] | CellPath.WEST.value
-                    self.stack.append(Vec2I(self.stack[-1].x - 1, self.stack[-1].y))
-                
-                self.visited_cells += 1
-            else:
-                self.stack.pop()
-    
-    def setup_game(self) -> None:
-        # Set up entrances and player positions
-        # Randomly choose entrance positions on left and right sides
-        left_entrance_y = random.randint(1, self.maze_height - 2)
-        right_entrance_y = random.randint(1, self.maze_height - 2)
-        
-        # Create openings at entrances
-        self.maze[left_entrance_y * self.maze_width] |= CellPath.WEST.value
-        self.maze[right_entrance_y * self.maze_width + (self.maze_width - 1)] |= CellPath.EAST.value
-        
-        # Set player starting positions
-        self.player1_pos = Vec2I(0, left_entrance_y)
-        self.player2_pos = Vec2I(self.maze_width - 1, right_entrance_y)
-        
-        self.player1_start = Vec2I(0, left_entrance_y)
-        self.player2_start = Vec2I(self.maze_width - 1, right_entrance_y)
-        
-        # Set targets (opposite sides)
-        self.player1_target = Vec2I(self.maze_width - 1, right_entrance_y)
-        self.player2_target = Vec2I(0, left_entrance_y)
-        
-        self.player1_finished = False
-        self.player2_finished = False
-        self.game_timer = 0.0
-        self.warmup_timer = 0.0
-        self.ai_move_timer = 0.0
-        self.ai_path = None
-    
-    def can_move(self, from_pos: Vec2I, direction: Vec2I) -> bool:
-        to_pos = from_pos + direction
-        if to_pos.x < 0 or to_pos.x >= self.maze_width or to_pos.y < 0 or to_pos.y >= self.maze_height:
-            return False
-        
-        cell = self.maze[from_pos.y * self.maze_width + from_pos.x]
-        
-        # Check if there's a path in the desired direction
-        if direction.x == -1 and (cell & CellPath.WEST.value) != 0:
-            return True  # Moving left
-        if direction.x == 1 and (cell & CellPath.EAST.value) != 0:
-            return True  # Moving right
-        if direction.y == -1 and (cell & CellPath.NORTH.value) != 0:
-            return True  # Moving up
-        if direction.y == 1 and (cell & CellPath.SOUTH.value) != 0:
-            return True  # Moving down
-        return False
-    
-    def move_player(self, player: int, direction: Vec2I) -> None:
-        current_pos = self.player1_pos if player == 1 else self.player2_pos
-        
-        if self.can_move(current_pos, direction):
-            new_pos = current_pos + direction
-            
-            # Check if player reached target
-            if player == 1 and new_pos == self.player1_target:
-                self.player1_finished = True
-            elif player == 2 and new_pos == self.player2_target:
-                self.player2_finished = True
-            
-            if player == 1:
-                self.player1_pos = new_pos
-            else:
-                self.player2_pos = new_pos
+        super().generate_maze()
+        self.maze_surface = None
+        self.chunks.clear()
     
-    def get_distance(self, pos_a: Vec2I, pos_b: Vec2I) -> int:
-        return abs(pos_a.x - pos_b.x) + abs(pos_a.y - pos_b.y)
+    def carve_incrementally(self, batch: int) -> Iterator[array]:
+        carving = super().carve_incrementally(batch)
+        self.maze_surface = None
+        self.chunks.clear()
+        return carving
     
-    def find_path(self, start: Vec2I, target: Vec2I) -> list[Vec2I]:
-        open_set: list[PathNode] = []
-        closed_set: set[Vec2I] = set()
-        
-        start_node = PathNode(start)
-        start_node.g_cost = 0
-        start_node.h_cost = self.get_distance(start, target)
-        open_set.append(start_node)
-        
-        while open_set:
-            current_node = open_set[0]
-            for i in range(1, len(open_set)):
-                if (open_set[i].f_cost < current_node.f_cost or 
-                    (open_set[i].f_cost == current_node.f_cost and open_set[i].h_cost < current_node.h_cost)):
-                    current_node = open_set[i]
-            
-            open_set.remove(current_node)
-            closed_set.add(current_node.position)
-            
-            # If we reached the target
-            if current_node.position == target:
-                path = []
-                node = current_node
-                
-                while node is not None and node != start_node:
-                    path.append(node.position)
-                    node = node.parent
-                
-                path.reverse()
-                return path
-            
-            # Check all neighbors
-            for direction in [Vec2I(0, -1), Vec2I(1, 0), Vec2I(0, 1), Vec2I(-1, 0)]:
-                if self.can_move(current_node.position, direction):
-                    neighbor_pos = current_node.position + direction
-                    
-                    if neighbor_pos in closed_set:
-                        continue
-                    
-                    move_cost_to_neighbor = current_node.g_cost + self.get_distance(current_node.position, neighbor_pos)
-                    neighbor_node = next((n for n in open_set if n.position == neighbor_pos), None)
-                    
-                    if neighbor_node is None:
-                        neighbor_node = PathNode(neighbor_pos)
-                        neighbor_node.g_cost = move_cost_to_neighbor
-                        neighbor_node.h_cost = self.get_distance(neighbor_pos, target)
-                        neighbor_node.parent = current_node
-                        open_set.append(neighbor_node)
-                    elif move_cost_to_neighbor < neighbor_node.g_cost:
-                        neighbor_node.g_cost = move_cost_to_neighbor
-                        neighbor_node.parent = current_node
-        
-        # No path found
-        return []
+    def place_entrances(self, left_entrance_y: int, right_entrance_y: int, distance_fields: bool = True) -> None:
+        super().place_entrances(left_entrance_y, right_entrance_y, distance_fields)
+        self.maze_surface = None  # the entrances were just opened
+        self.chunks.clear()
+        self.player1_motion = (self.player1_pos, self.player1_pos, 0)
+        self.player2_motion = (self.player2_pos, self.player2_pos, 0)
     
-    def move_ai(self) -> None:
-        if self.ai_path is None or (len(self.ai_path) > 0 and self.player2_pos != self.ai_path[0]):
-            self.ai_path = self.find_path(self.player2_pos, self.player2_target)
-        
-        if self.ai_path:
-            try:
-                next_pos = self.ai_path[0]
-                direction = Vec2I(next_pos.x - self.player2_pos.x, next_pos.y - self.player2_pos.y)
-                
-                if self.can_move(self.player2_pos, direction):
-                    self.player2_pos = next_pos
-                    self.ai_path.pop(0)
-                    
-                    if self.player2_pos == self.player2_target:
-                        self.player2_finished = True
-                        self.ai_path = None
-                else:
-                    self.ai_path = None
-            except (IndexError, ValueError):
-                self.ai_path = None
-        else:
-            target = self.player2_target
-            current_pos = self.player2_pos
-            possible_moves = []
-            toward_target_moves = []
-            
-            for move in [Vec2I(-1, 0), Vec2I(1, 0), Vec2I(0, -1), Vec2I(0, 1)]:
-                if self.can_move(current_pos, move):
-                    possible_moves.append(move)
-            
-            if not possible_moves:
-                return
-            
-            for move in possible_moves:
-                new_pos: Vec2I = current_pos + move
-                dist_before = abs(current_pos.x - target.x) + abs(current_pos.y - target.y)
-                dist_after = abs(new_pos.x - target.x) + abs(new_pos.y - target.y)
-                
-                if dist_after < dist_before:
-                    toward_target_moves.append(move)
-            
-            if toward_target_moves:
-                best_move = random.choice(toward_target_moves)
-            else:
-                best_move = random.choice(possible_moves)
-            
-            new_ai_pos = current_pos + best_move
-            if new_ai_pos == target:
-                self.player2_finished = True
-            self.player2_pos = new_ai_pos
+    def start_round(self, two_player_mode: bool, warmup: bool = True, seed: int | None = None,
+                    prepared: PreparedMaze | None = None, incremental: bool = False) -> None:
+        # Take the maze file's maze, or one from the background prefetcher when it is ready
+        start = time.perf_counter()
+        source = "given"
+        if prepared is None and seed is None and self.maze_path:
+            with load_maze(self.maze_path) as maze_file:
+                prepared = maze_file.prepared()
+            source = "loaded"
+        elif prepared is None and seed is None:
+            self.prefetcher.resize(self.maze_width, self.maze_height, self.maze_algorithm)
+            self.prefetcher.fill()  # in case no title frame started it
+            seed, prepared = self.prefetcher.take()
+            source = "prefetched"
+        if prepared is None:
+            source = "generated"
+            incremental |= self.reveal or self.maze_width * self.maze_height >= INCREMENTAL_CELLS
+        # --reveal spreads even small mazes over about REVEAL_SECONDS, in batches of the
+        # cells to show each frame; otherwise only the time budget limits each frame
+        cells_per_frame = -(-self.maze_width * self.maze_height // int(REVEAL_SECONDS * FRAME_RATE))
+        self.carve_batch = min(cells_per_frame, CARVE_BATCH) if self.reveal else CARVE_BATCH
+        self.scheduler.clear()
+        super().start_round(two_player_mode, warmup, seed, prepared, incremental)
+        if self.carving is not None:
+            source = "incrementally carved"
+            self.scheduler.add(self.carving, self.reveal_cells,
+                               -(-cells_per_frame // self.carve_batch) if self.reveal else None,
+                               self.finish_reveal)
+        self.tick_accumulator = 0.0
+        if self.record_path:
+            self.replay = Replay(self.maze_width, self.maze_height, self.seed, two_player_mode, warmup,
+                                 algorithm=self.maze_algorithm, racers=self.racer_count,
+                                 min_difficulty=self.min_difficulty, shifting_walls=self.shifting_walls,
+                                 maze=prepared if source == "loaded" else None)
+            self.input_recorder = self.replay
+        self.round_start_ms = (time.perf_counter() - start) * 1000
+        if self.show_frame_time or self.profiler.enabled:
+            print(f"Round start: {self.round_start_ms:.2f} ms ({source} maze, seed {self.seed})")
     
     def update_title_screen(self) -> bool:
         for event in pygame.event.get():
@@ -356,118 +314,114 @@ class AmazingMaze:
                 return False
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_1:
-                    self.two_player_mode = False
-                    self.generate_maze()
-                    self.setup_game()
-                    self.game_state = GameState.WARMUP
+                    self.start_round(two_player_mode=False)
                 elif event.key == pygame.K_2:
-                    self.two_player_mode = True
-                    self.generate_maze()
-                    self.setup_game()
-                    self.game_state = GameState.WARMUP
+                    self.start_round(two_player_mode=True)
         
         self.screen.fill(BLACK)
         
         # Draw title
-        title_text = self.font_large.render("AMAZING MAZE REMAKE", True, self.player1_color)
+        title_text = self.text_cache.render(self.font_large, "AMAZING MAZE REMAKE", self.player1_color)
         self.screen.blit(title_text, (100, 150))
         
-        single_text = self.font_medium.render('* PRESS "1" FOR SINGLE PLAYER', True, self.ai_color)
+        single_text = self.text_cache.render(self.font_medium, '* PRESS "1" FOR SINGLE PLAYER', self.ai_color)
         self.screen.blit(single_text, (50, 240))
         
-        two_text = self.font_medium.render('* PRESS "2" FOR TWO PLAYERS', True, self.player2_color)
+        two_text = self.text_cache.render(self.font_medium, '* PRESS "2" FOR TWO PLAYERS', self.player2_color)
         self.screen.blit(two_text, (50, 300))
         
-        p1_text = self.font_medium.render("Player 1 moves with arrow keys", True, WHITE)
+        p1_text = self.text_cache.render(self.font_medium, "Player 1 moves with arrow keys", WHITE)
         self.screen.blit(p1_text, (50, 400))
         
-        p2_text = self.font_medium.render("Player 2 moves with W,A,S,D", True, WHITE)
+        p2_text = self.text_cache.render(self.font_medium, "Player 2 moves with W,A,S,D", WHITE)
         self.screen.blit(p2_text, (50, 450))
         
         pygame.display.flip()
+        if self.startup is not None:
+            self.startup.record("fonts", self.fonts.load_seconds)
+            self.startup.mark("first title frame")
+            return False  # --measure-startup stops here
+        self.prefetcher.fill()
         return True
     
     def update_game(self, dt: float) -> bool:
         self.pause_pressed = False
         
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                return False
-            elif event.type == pygame.KEYDOWN:
-                # Handle pause based on event
-                if event.key == pygame.K_p:
-                    self.pause_pressed = True
-                elif event.key == pygame.K_ESCAPE:
+        with self.profiler.phase("events"):
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
                     return False
-        
-        if self.pause_pressed:
-            self.game_state = GameState.PAUSED
-        
-        # Check if still in warm-up phase
-        if self.game_state == GameState.WARMUP:
-            self.warmup_timer += dt
-            if self.warmup_timer >= 3.0:
-                self.game_state = GameState.PLAYING
-        else:
-            self.game_timer += dt
-            # Only allow movement if not in warm-up
-            self.player1_key_timer += dt
-            self.player2_key_timer += dt
+                elif event.type == pygame.KEYDOWN:
+                    # Handle pause based on event
+                    if event.key == pygame.K_p:
+                        self.pause_pressed = True
+                    elif event.key == pygame.K_ESCAPE:
+                        return False
+                    elif event.key == pygame.K_F3:
+                        self.show_frame_time = not self.show_frame_time
+                    elif event.key == pygame.K_F4 and self.profiler.enabled:
+                        self.show_profile = not self.show_profile
+                        self.full_redraw = True  # uncover the maze under the overlay
+                    elif event.key == pygame.K_F5:
+                        self.profiler.start_capture(self.profile_capture_frames)
             
-            # Player 1's movement with cooldown
-            if self.player1_key_timer > KEY_COOLDOWN:
-                keys = pygame.key.get_pressed()
-                moved = False
-                if keys[pygame.K_LEFT]:
-                    self.move_player(1, Vec2I(-1, 0))
-                    moved = True
-                if keys[pygame.K_RIGHT]:
-                    self.move_player(1, Vec2I(1, 0))
-                    moved = True
-                if keys[pygame.K_UP]:
-                    self.move_player(1, Vec2I(0, -1))
-                    moved = True
-                if keys[pygame.K_DOWN]:
-                    self.move_player(1, Vec2I(0, 1))
-                    moved = True
-                
-                if moved:
-                    self.player1_key_timer = 0.0  # Reset cooldown timer
+            if self.pause_pressed:
+                self.game_state = GameState.PAUSED
             
-            if self.two_player_mode:
-                # Player 2's movement with cooldown
-                if self.player2_key_timer > KEY_COOLDOWN:
-                    keys = pygame.key.get_pressed()
-                    moved = False
-                    if keys[pygame.K_a]:
-                        self.move_player(2, Vec2I(-1, 0))
-                        moved = True
-                    if keys[pygame.K_d]:
-                        self.move_player(2, Vec2I(1, 0))
-                        moved = True
-                    if keys[pygame.K_w]:
-                        self.move_player(2, Vec2I(0, -1))
-                        moved = True
-                    if keys[pygame.K_s]:
-                        self.move_player(2, Vec2I(0, 1))
-                        moved = True
-                    
-                    if moved:
-                        self.player2_key_timer = 0.0  # Reset cooldown timer
-            else:
-                # AI movement
-                self.ai_move_timer += dt
-                if self.ai_move_timer > AI_MOVE_INTERVAL:
-                    self.move_ai()
-                    self.ai_move_timer = 0.0
-        
-        # Check game over
-        if self.player1_finished or self.player2_finished:
-            self.game_state = GameState.RESULT
-        
-        self.draw_game()
+            keys = pygame.key.get_pressed()
+            player1_moves = [move for key, move in PLAYER1_KEYS if keys[key]]
+            player2_moves = [move for key, move in PLAYER2_KEYS if keys[key]] if self.two_player_mode else []
+        
+        # Run as many fixed logic ticks as the elapsed time covers; while the maze is
+        # still being carved, this frame's share of the carving instead
+        with self.profiler.phase("logic"):
+            if self.scheduler.pending:
+                self.scheduler.run()
+                dt = 0.0
+            self.tick_accumulator += dt
+            ticks = 0
+            while self.tick_accumulator >= TICK_SECONDS and self.game_state in (GameState.WARMUP, GameState.PLAYING):
+                if ticks == MAX_CATCH_UP_TICKS:
+                    self.tick_accumulator = 0.0  # far behind (GC pause, window drag): drop the backlog
+                    break
+                self.step(player1_moves, player2_moves, TICK_SECONDS)
+                self.track_motion()
+                self.tick_accumulator -= TICK_SECONDS
+                ticks += 1
+        
+        if self.game_state == GameState.RESULT and self.replay is not None:
+            self.recorded_rounds += 1
+            path = Path(self.record_path)
+            self.replay.save(str(path.with_stem(f"{path.stem}-{self.recorded_rounds}")))
+            self.input_recorder = self.replay = None
+        
+        self.draw_game(self.tick_accumulator / TICK_SECONDS)
         return True
     
+    def move_ai(self) -> None:
+        # Profiled separately, although it also counts towards "logic"
+        with self.profiler.phase("ai"):
+            super().move_ai()
+    
+    def find_path(self, start: Vec2I, target: Vec2I) -> list[Vec2I]:
+        with self.profiler.phase("ai"):
+            return super().find_path(start, target)
+    
+    def track_motion(self) -> None:
+        # Start a new glide for each sprite that changed cell during the last tick
+        if self.player1_pos != self.player1_motion[1]:
+            self.player1_motion = (self.player1_motion[1], self.player1_pos, self.ticks)
+        if self.player2_pos != self.player2_motion[1]:
+            self.player2_motion = (self.player2_motion[1], self.player2_pos, self.ticks)
+    
+    def sprite_position(self, motion: tuple[Vec2I, Vec2I, int], glide_time: float,
+                        alpha: float) -> tuple[float, float]:
+        # Cell coordinates between the glide's endpoints; alpha is the fraction of a tick
+        # elapsed since the last logic step
+        start, end, tick = motion
+        t = min(1.0, (self.ticks - tick + alpha) * TICK_SECONDS / glide_time)
+        return (start.x + (end.x - start.x) * t, start.y + (end.y - start.y) * t)
+    
     def update_paused_screen(self) -> bool:
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
@@ -475,13 +429,14 @@ class AmazingMaze:
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_p:
                     self.game_state = GameState.PLAYING
+                    self.full_redraw = True  # the pause overlay covers the maze
         
         # Draw pause overlay
         pygame.draw.rect(self.screen, BLACK, (245, 250, 350, 125))
-        pause_text = self.font_medium.render("GAME PAUSED", True, BEIGE)
+        pause_text = self.text_cache.render(self.font_medium, "GAME PAUSED", BEIGE)
         self.screen.blit(pause_text, (290, 280))
         
-        continue_text = self.font_small.render('PRESS "P" TO CONTINUE', True, WHITE)
+        continue_text = self.text_cache.render(self.font_small, 'PRESS "P" TO CONTINUE', WHITE)
         self.screen.blit(continue_text, (250, 340))
         
         pygame.display.flip()
@@ -508,105 +463,383 @@ class AmazingMaze:
         
         # Draw result overlay
         pygame.draw.rect(self.screen, BLACK, (240, 250, 400, 150))
-        result_surface = self.font_medium.render(result_text, True, color)
+        result_surface = self.text_cache.render(self.font_medium, result_text, color)
         self.screen.blit(result_surface, (250, 270))
         
-        time_text = self.font_small.render(f"TIME: {self.game_timer:.1f}s", True, WHITE)
-        self.screen.blit(time_text, (270, 330))
+        self.text_cache.blit_glyphs(self.screen, self.font_small, f"TIME: {self.game_timer:.1f}s", WHITE, (270, 330))
         
-        continue_text = self.font_small.render("PRESS ENTER TO CONTINUE", True, WHITE)
+        continue_text = self.text_cache.render(self.font_small, "PRESS ENTER TO CONTINUE", WHITE)
         self.screen.blit(continue_text, (250, 370))
         
         pygame.display.flip()
         return True
     
-    def draw_game(self) -> None:
-        self.screen.fill(BLACK)
-        
-        # Draw Maze
+    @property
+    def cell_pitch(self) -> int:
+        # Pixels from one cell to the next: the path plus one wall
+        return (self.path_width + 1) * DRAWING_SCALE
+    
+    @property
+    def camera_mode(self) -> bool:
+        # Whether the maze is too big to draw in one piece at MAZE_OFFSET
+        return (MAZE_OFFSET[0] + (self.maze_width + 1) * self.cell_pitch > SCREEN_WIDTH
+                or MAZE_OFFSET[1] + self.maze_height * self.cell_pitch > VIEWPORT.bottom)
+    
+    def build_maze_surface(self) -> pygame.Surface:
+        # Everything that stays fixed for a round: maze walls, entrance and exit markers.
+        # In camera mode the maze lives in chunks and this is just the HUD background.
+        surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)).convert()
+        surface.fill(BLACK)
+        if not self.camera_mode:
+            self.draw_maze(surface, MAZE_OFFSET, range(self.maze_width), range(self.maze_height))
+        return surface
+    
+    def render_chunk(self, cx: int, cy: int) -> pygame.Surface:
+        # One chunk of the maze in world pixels, where cell (0, 0) is at WORLD_MARGIN
+        pitch = self.cell_pitch
+        size = CHUNK_CELLS * pitch
+        surface = pygame.Surface((size, size)).convert()
+        surface.fill(BLACK)
+        
+        left = cx * size - WORLD_MARGIN
+        top = cy * size - WORLD_MARGIN
+        cells_x = range(max(left // pitch, 0), min(-(-(left + size) // pitch), self.maze_width))
+        cells_y = range(max(top // pitch, 0), min(-(-(top + size) // pitch), self.maze_height))
+        self.draw_maze(surface, (-left, -top), cells_x, cells_y)
+        return surface
+    
+    def draw_maze(self, surface: pygame.Surface, offset: tuple[int, int], cells_x: range, cells_y: range) -> None:
+        # Draw the given cells with cell (0, 0) at offset; the maze background, entrance
+        # and exit markers are drawn whole and clipped by the surface
         cell_size = self.path_width * DRAWING_SCALE
-        max_cell_x = MAZE_OFFSET[0] + self.maze_width * (self.path_width + 1) * DRAWING_SCALE
-        max_cell_y = MAZE_OFFSET[1] + self.maze_height * (self.path_width + 1) * DRAWING_SCALE
+        pitch = self.cell_pitch
+        offset_x, offset_y = offset
         
         # Draw maze background
-        pygame.draw.rect(self.screen, MAZE_COLOR, 
-                        (MAZE_OFFSET[0] - self.path_width * 2, 
-                         MAZE_OFFSET[1] - self.path_width * 2,
-                         max_cell_x + self.path_width - MAZE_OFFSET[0],
-                         max_cell_y + self.path_width - MAZE_OFFSET[1]))
-        
-        for x in range(self.maze_width):
-            for y in range(self.maze_height):
-                cell_x = MAZE_OFFSET[0] + x * (self.path_width + 1) * DRAWING_SCALE
-                cell_y = MAZE_OFFSET[1] + y * (self.path_width + 1) * DRAWING_SCALE
-                
-                # Draw cell background
-                pygame.draw.rect(self.screen, BLACK, (cell_x, cell_y, cell_size, cell_size))
-                
-                # Draw passageways between cells
-                if self.maze[y * self.maze_width + x] & CellPath.SOUTH.value:
-                    pygame.draw.rect(self.screen, BLACK, (cell_x, cell_y + cell_size, cell_size, DRAWING_SCALE))
-                if self.maze[y * self.maze_width + x] & CellPath.EAST.value:
-                    pygame.draw.rect(self.screen, BLACK, (cell_x + cell_size, cell_y, DRAWING_SCALE, cell_size))
+        pygame.draw.rect(surface, MAZE_COLOR, self.maze_background(offset))
+        self.draw_cells(surface, offset, cells_x, cells_y)
+        
+        if self.carving is not None:
+            return  # the entrances are drawn once the round is set up
         
         # Draw entrance openings
-        pygame.draw.rect(self.screen, BLACK, 
-                        (MAZE_OFFSET[0] - self.path_width * 2,
-                         MAZE_OFFSET[1] + self.player1_start.y * (self.path_width + 1) * DRAWING_SCALE,
+        pygame.draw.rect(surface, BLACK, 
+                        (offset_x - self.path_width * 2,
+                         offset_y + self.player1_start.y * pitch,
                          DRAWING_SCALE, cell_size))
         
         # Draw exit markers
-        self.draw_exit_markers(self.player1_start, True)
-        self.draw_exit_markers(self.player2_start, False)
-        
-        # Draw players
-        self.draw_player(self.player1_pos, self.player1_color, "P1")
-        if self.two_player_mode:
-            self.draw_player(self.player2_pos, self.player2_color, "P2")
-        else:
-            self.draw_player(self.player2_pos, self.ai_color, "AI")
-        
+        self.draw_exit_markers(self.player1_start, True, surface, offset)
+        self.draw_exit_markers(self.player2_start, False, surface, offset)
+    
+    def maze_background(self, offset: tuple[int, int]) -> pygame.Rect:
+        # The maze area including its outer walls, with cell (0, 0) at offset
+        return pygame.Rect(offset[0] - self.path_width * 2,
+                           offset[1] - self.path_width * 2,
+                           self.maze_width * self.cell_pitch + self.path_width,
+                           self.maze_height * self.cell_pitch + self.path_width)
+    
+    def draw_cells(self, surface: pygame.Surface, offset: tuple[int, int], cells_x: range,
+                   cells_y: range) -> pygame.Rect:
+        # The given cells with the walls or passages to their east and south, with cell
+        # (0, 0) at offset and clipped to the maze background. Walls are drawn as well,
+        # so this also redraws cells whose passages closed. Returns the area drawn.
+        cell_size = self.path_width * DRAWING_SCALE
+        pitch = self.cell_pitch
+        offset_x, offset_y = offset
+        block = pygame.Rect(offset_x + cells_x.start * pitch, offset_y + cells_y.start * pitch,
+                            len(cells_x) * pitch, len(cells_y) * pitch)
+        area = block.clip(self.maze_background(offset))
+        
+        if self.rasterise and cells_x and cells_y:
+            # All the cells rasterised from their wall bits at once
+            image = maze_raster.render(self.maze, cells_x, cells_y, cell_size, DRAWING_SCALE, (MAZE_COLOR, BLACK))
+            surface.blit(image, area, area.move(-block.x, -block.y))
+            return area
+        
+        pygame.draw.rect(surface, MAZE_COLOR, area)
+        for x in cells_x:
+            for y in cells_y:
+                cell_x = offset_x + x * pitch
+                cell_y = offset_y + y * pitch
+                cell = self.maze[y * self.maze_width + x]
+                if not cell & CellPath.VISITED.value:
+                    continue  # not carved yet (the maze is still being generated)
+                
+                # Draw cell background
+                pygame.draw.rect(surface, BLACK, (cell_x, cell_y, cell_size, cell_size))
+                
+                # Draw passageways between cells
+                if cell & CellPath.SOUTH.value:
+                    pygame.draw.rect(surface, BLACK, (cell_x, cell_y + cell_size, cell_size, DRAWING_SCALE))
+                if cell & CellPath.EAST.value:
+                    pygame.draw.rect(surface, BLACK, (cell_x + cell_size, cell_y, DRAWING_SCALE, cell_size))
+        return area
+    
+    def draw_cell(self, surface: pygame.Surface, offset: tuple[int, int], index: int) -> pygame.Rect:
+        # One cell and its passages on all four sides, with cell (0, 0) at offset; walls
+        # only ever open while carving, so this is all a newly carved cell changes.
+        # Returns the area drawn.
+        cell_size = self.path_width * DRAWING_SCALE
+        cell = self.maze[index]
+        cell_x = offset[0] + index % self.maze_width * self.cell_pitch
+        cell_y = offset[1] + index // self.maze_width * self.cell_pitch
+        pygame.draw.rect(surface, BLACK, (cell_x, cell_y, cell_size, cell_size))
+        if cell & CellPath.NORTH.value:
+            pygame.draw.rect(surface, BLACK, (cell_x, cell_y - DRAWING_SCALE, cell_size, DRAWING_SCALE))
+        if cell & CellPath.EAST.value:
+            pygame.draw.rect(surface, BLACK, (cell_x + cell_size, cell_y, DRAWING_SCALE, cell_size))
+        if cell & CellPath.SOUTH.value:
+            pygame.draw.rect(surface, BLACK, (cell_x, cell_y + cell_size, cell_size, DRAWING_SCALE))
+        if cell & CellPath.WEST.value:
+            pygame.draw.rect(surface, BLACK, (cell_x - DRAWING_SCALE, cell_y, DRAWING_SCALE, cell_size))
+        return pygame.Rect(cell_x - DRAWING_SCALE, cell_y - DRAWING_SCALE, self.cell_pitch + DRAWING_SCALE,
+                           self.cell_pitch + DRAWING_SCALE)
+    
+    def reveal_cells(self, carved: array) -> None:
+        # Scheduler callback: draw the cells carved by one step of the incremental
+        # generation onto the maze layer, or onto whichever chunks are cached (the others
+        # are rendered from the maze as it is when they come into view)
+        if not carved:
+            return
+        self.carve_head = carved[-1]
+        if self.camera_mode:
+            pitch = self.cell_pitch
+            size = CHUNK_CELLS * pitch
+            for index in carved:
+                left = WORLD_MARGIN + index % self.maze_width * pitch - DRAWING_SCALE
+                top = WORLD_MARGIN + index // self.maze_width * pitch - DRAWING_SCALE
+                for cy in range(top // size, (top + pitch) // size + 1):
+                    for cx in range(left // size, (left + pitch) // size + 1):
+                        surface = self.chunks.surfaces.get((cx, cy))
+                        if surface is not None:
+                            self.draw_cell(surface, (WORLD_MARGIN - cx * size, WORLD_MARGIN - cy * size), index)
+        elif self.maze_surface is not None:
+            rect = self.reveal_rect
+            for index in carved:
+                cell_rect = self.draw_cell(self.maze_surface, MAZE_OFFSET, index)
+                rect = cell_rect if rect is None else rect.union(cell_rect)
+            self.reveal_rect = rect
+    
+    def shift_walls(self) -> list[int]:
+        # Redraw the 2x2 blocks whose walls moved on the maze layer, or on whichever
+        # chunks are cached (the others are rendered from the maze as it is)
+        changed = super().shift_walls()
+        pitch = self.cell_pitch
+        size = CHUNK_CELLS * pitch
+        for index in changed:
+            x, y = index % self.maze_width, index // self.maze_width
+            cells_x, cells_y = range(x, x + 2), range(y, y + 2)
+            if self.camera_mode:
+                left, top = WORLD_MARGIN + x * pitch, WORLD_MARGIN + y * pitch
+                for cy in range(top // size, (top + 2 * pitch - 1) // size + 1):
+                    for cx in range(left // size, (left + 2 * pitch - 1) // size + 1):
+                        surface = self.chunks.surfaces.get((cx, cy))
+                        if surface is not None:
+                            self.draw_cells(surface, (WORLD_MARGIN - cx * size, WORLD_MARGIN - cy * size),
+                                            cells_x, cells_y)
+            elif self.maze_surface is not None:
+                rect = self.draw_cells(self.maze_surface, MAZE_OFFSET, cells_x, cells_y)
+                self.shift_rect = rect if self.shift_rect is None else self.shift_rect.union(rect)
+        return changed
+    
+    def finish_reveal(self) -> None:
+        # The round is set up: redraw the maze layers with the entrances and exit markers
+        self.maze_surface = None
+        self.chunks.clear()
+    
+    def restore_background(self, rect: pygame.Rect) -> None:
+        self.screen.blit(self.maze_surface, rect, rect)
+    
+    def draw_hud_text(self, key: str, text: str, font: pygame.font.Font, color: tuple,
+                      pos: tuple[int, int], dirty: list[pygame.Rect], glyphs: bool = False) -> None:
+        # Redraw a HUD line only when its text changed; an empty text erases it
+        last = self.hud_text.get(key)
+        if last is not None and last[0] == text:
+            return
+        if last is not None:
+            self.restore_background(last[1])
+            dirty.append(last[1])
+            del self.hud_text[key]
+        if text:
+            if glyphs:
+                rect = self.text_cache.blit_glyphs(self.screen, font, text, color, pos)
+            else:
+                rect = self.screen.blit(self.text_cache.render(font, text, color), pos)
+            self.hud_text[key] = (text, rect)
+            dirty.append(rect)
+    
+    def draw_game(self, alpha: float = 0.0) -> None:
+        with self.profiler.phase("maze"):
+            dirty = self.draw_maze_layer(alpha)
+        with self.profiler.phase("text"):
+            self.draw_hud(dirty)
+        
+        with self.profiler.phase("flip"):
+            if self.full_redraw:
+                pygame.display.flip()
+                self.full_redraw = False
+            elif dirty:
+                pygame.display.update(dirty)
+    
+    def draw_maze_layer(self, alpha: float) -> list[pygame.Rect]:
+        # The maze and the sprites; returns the screen regions that changed
+        if self.maze_surface is None:
+            self.maze_surface = self.build_maze_surface()
+            self.full_redraw = True
+        
+        dirty: list[pygame.Rect] = []
+        if self.full_redraw:
+            self.screen.blit(self.maze_surface, (0, 0))
+            self.hud_text.clear()
+            self.sprite_rects = []
+            self.sprite_positions = ()
+        
+        if self.carving is not None:
+            # The maze is still being carved: no players yet, the camera follows the carving
+            if self.camera_mode:
+                head = (self.carve_head % self.maze_width, self.carve_head // self.maze_width)
+                dirty.extend(self.draw_viewports(head, head, sprites=False))
+            elif self.reveal_rect is not None:
+                self.restore_background(self.reveal_rect)
+                dirty.append(self.reveal_rect)
+            self.reveal_rect = None
+            return dirty
+        
+        if self.shift_rect is not None:
+            # Walls moved: show them, and draw the sprites again as they may be underneath
+            self.restore_background(self.shift_rect)
+            dirty.append(self.shift_rect)
+            self.shift_rect = None
+            self.sprite_positions = ()
+        
+        # Draw players, restoring the maze under last frame's sprites first
+        player1_xy = self.sprite_position(self.player1_motion, KEY_COOLDOWN, alpha)
+        player2_xy = self.sprite_position(self.player2_motion,
+                                          KEY_COOLDOWN if self.two_player_mode else AI_MOVE_INTERVAL, alpha)
+        positions = player1_xy + player2_xy + (self.racers.moves if self.racers is not None else 0,)
+        if self.camera_mode:
+            dirty.extend(self.draw_viewports(player1_xy, player2_xy))
+        elif positions != self.sprite_positions:
+            for rect in self.sprite_rects:
+                self.restore_background(rect)
+            dirty.extend(self.sprite_rects)
+            
+            self.sprite_rects = self.draw_racers(MAZE_OFFSET) if self.racers is not None else []
+            self.sprite_rects.append(self.draw_player(player1_xy, self.player1_color, "P1"))
+            if self.two_player_mode:
+                self.sprite_rects.append(self.draw_player(player2_xy, self.player2_color, "P2"))
+            else:
+                self.sprite_rects.append(self.draw_player(player2_xy, self.ai_color, "AI"))
+            self.sprite_positions = positions
+            dirty.extend(self.sprite_rects)
+        return dirty
+    
+    def draw_hud(self, dirty: list[pygame.Rect]) -> None:
         # Draw UI
-        time_text = self.font_small.render(f"TIME: {self.game_timer:.1f}s", True, WHITE)
-        self.screen.blit(time_text, (30, 10))
+        self.draw_hud_text("time", f"TIME: {self.game_timer:.1f}s", self.font_small, WHITE, (30, 10), dirty, glyphs=True)
         
         p1_status = "FINISHED!" if self.player1_finished else "MOVING..."
-        p1_text = self.font_small.render(f"Player 1: {p1_status}", True, self.player1_color)
-        self.screen.blit(p1_text, (75, 550))
+        self.draw_hud_text("p1", f"Player 1: {p1_status}", self.font_small, self.player1_color, (75, 550), dirty)
         
+        p2_status = "FINISHED!" if self.player2_finished else "MOVING..."
         if self.two_player_mode:
-            p2_status = "FINISHED!" if self.player2_finished else "MOVING..."
-            p2_text = self.font_small.render(f"Player 2: {p2_status}", True, self.player2_color)
+            self.draw_hud_text("p2", f"Player 2: {p2_status}", self.font_small, self.player2_color, (425, 550), dirty)
+        elif self.racers is not None:
+            if self.racers.finished:
+                p2_status = "FINISHED!"
+            self.draw_hud_text("p2", f"Computer +{self.racers.count}: {p2_status}", self.font_small, self.ai_color,
+                               (425, 550), dirty)
         else:
-            p2_status = "FINISHED!" if self.player2_finished else "MOVING..."
-            p2_text = self.font_small.render(f"Computer: {p2_status}", True, self.ai_color)
-        
-        self.screen.blit(p2_text, (425, 550))
+            self.draw_hud_text("p2", f"Computer: {p2_status}", self.font_small, self.ai_color, (425, 550), dirty)
         
         # Draw warm-up countdown if in warm-up phase
-        if self.game_state == GameState.WARMUP:
+        if self.carving is not None:
+            done = 100 * self.visited_cells // len(self.maze)
+            self.draw_hud_text("state", f"CARVING {done}%", self.font_medium, MINT, (SCREEN_WIDTH-300, 10), dirty)
+        elif self.game_state == GameState.WARMUP:
             countdown = max(0, 3 - int(self.warmup_timer))
-            warmup_text = self.font_medium.render(f"GET READY! {countdown}", True, MINT)
-            self.screen.blit(warmup_text, (SCREEN_WIDTH-300, 10))
+            self.draw_hud_text("state", f"GET READY! {countdown}", self.font_medium, MINT, (SCREEN_WIDTH-300, 10), dirty)
         elif self.game_state == GameState.PLAYING:
-            pause_text = self.font_small.render('Press "P" to pause', True, WHITE)
-            self.screen.blit(pause_text, (SCREEN_WIDTH-275, 10))
-        
-        pygame.display.flip()
+            self.draw_hud_text("state", 'Press "P" to pause', self.font_small, WHITE, (SCREEN_WIDTH-275, 10), dirty)
+        
+        # Frame-time counter (toggled with F3)
+        if self.frame_timer.frames % 30 == 0:
+            self.frame_time_text = (f"CPU {self.frame_timer.average_ms:.2f} ms/frame  "
+                                    f"text {self.text_cache.hits}/{self.text_cache.misses}")
+            if self.camera_mode:
+                self.frame_time_text += f"  chunks {self.chunks.hits}/{self.chunks.misses}"
+        frame_text = self.frame_time_text if self.show_frame_time else ""
+        self.draw_hud_text("frame_time", frame_text, self.font_tiny, WHITE,
+                           (SCREEN_WIDTH-250, SCREEN_HEIGHT-20), dirty, glyphs=True)
+        
+        if self.show_profile:
+            dirty.append(self.draw_profile_overlay())
+    
+    def draw_profile_overlay(self) -> pygame.Rect:
+        # Phase percentiles on an opaque panel, re-rendered twice a second and blitted
+        # every frame so sprites and scrolling never leave it half covered
+        if self.profile_overlay is None or self.profiler.frames % 30 == 0:
+            lines = self.profiler.report_lines()
+            if self.profiler.capture is not None:
+                lines.append(f"cProfile: {self.profiler.capture_frames} frames left")
+            line_height = self.font_tiny.get_linesize()
+            self.profile_overlay = pygame.Surface((190, line_height * 9 + 8)).convert()
+            self.profile_overlay.fill((32, 32, 32))
+            for i, line in enumerate(lines):
+                self.profile_overlay.blit(self.text_cache.render(self.font_tiny, line, WHITE), (6, 4 + i * line_height))
+        return self.screen.blit(self.profile_overlay, PROFILE_OVERLAY_POS)
     
-    def draw_exit_markers(self, pos: Vec2I, is_left_side: bool) -> None:
+    def draw_viewports(self, player1_xy: tuple[float, float], player2_xy: tuple[float, float],
+                       sprites: bool = True) -> list[pygame.Rect]:
+        # Camera mode: each camera follows its player and blits only the chunks it can
+        # see, so the cost per frame does not depend on the maze size
+        pitch = self.cell_pitch
+        chunk_size = CHUNK_CELLS * pitch
+        world_width = self.maze_width * pitch + 2 * WORLD_MARGIN
+        world_height = self.maze_height * pitch + 2 * WORLD_MARGIN
+        if self.two_player_mode:
+            views = zip(self.split_cameras, (player1_xy, player2_xy))
+        else:
+            views = zip(self.cameras, (player1_xy,))
+        player2_color, player2_label = ((self.player2_color, "P2") if self.two_player_mode
+                                        else (self.ai_color, "AI"))
+        
+        rects = []
+        for camera, (x, y) in views:
+            camera.follow(WORLD_MARGIN + (x + 0.5) * pitch, WORLD_MARGIN + (y + 0.5) * pitch,
+                          world_width, world_height)
+            self.screen.set_clip(camera.viewport)
+            self.screen.fill(BLACK, camera.viewport)
+            for cx, cy, pos in camera.visible_chunks(chunk_size, world_width, world_height):
+                self.screen.blit(self.chunks.get(cx, cy), pos)
+            
+            if sprites:
+                offset_x, offset_y = camera.offset()
+                offset = (offset_x + WORLD_MARGIN, offset_y + WORLD_MARGIN)
+                if self.racers is not None:
+                    self.draw_racers(offset)
+                self.draw_player(player1_xy, self.player1_color, "P1", offset)
+                self.draw_player(player2_xy, player2_color, player2_label, offset)
+            self.screen.set_clip(None)
+            rects.append(camera.viewport)
+        return rects
+    
+    def draw_exit_markers(self, pos: Vec2I, is_left_side: bool, surface: pygame.Surface | None = None,
+                          offset: tuple[int, int] = MAZE_OFFSET) -> None:
+        surface = surface or self.screen
         left_color = self.player2_color if self.two_player_mode else self.ai_color
         right_color = self.player1_color
         
-        base_x = MAZE_OFFSET[0] + pos.x * (self.path_width + 1) * DRAWING_SCALE
-        base_y = MAZE_OFFSET[1] + pos.y * (self.path_width + 1) * DRAWING_SCALE + (self.path_width * DRAWING_SCALE) // 2
+        base_x = offset[0] + pos.x * (self.path_width + 1) * DRAWING_SCALE
+        base_y = offset[1] + pos.y * (self.path_width + 1) * DRAWING_SCALE + (self.path_width * DRAWING_SCALE) // 2
         
         tip_size = 10
         
         if is_left_side:
             mk_base_x = base_x - 5 * DRAWING_SCALE
             mk_tip_x = base_x - 2 * DRAWING_SCALE
-            pygame.draw.polygon(self.screen, left_color, [
+            pygame.draw.polygon(surface, left_color, [
                 (mk_base_x, base_y),
                 (mk_tip_x, base_y - tip_size),
                 (mk_tip_x, base_y + tip_size)
@@ -614,32 +847,45 @@ class AmazingMaze:
         else:
             mk_base_x = base_x + (self.path_width + 5) * DRAWING_SCALE
             mk_tip_x = base_x + (self.path_width + 2) * DRAWING_SCALE
-            pygame.draw.polygon(self.screen, right_color, [
+            pygame.draw.polygon(surface, right_color, [
                 (mk_base_x, base_y),
                 (mk_tip_x, base_y - tip_size),
                 (mk_tip_x, base_y + tip_size)
             ])
     
-    def draw_player(self, pos: Vec2I, color: tuple, label: str) -> None:
-        x = MAZE_OFFSET[0] + (pos.x * (self.path_width + 1) + self.path_width // 2) * DRAWING_SCALE
-        y = MAZE_OFFSET[1] + (pos.y * (self.path_width + 1) + self.path_width // 2) * DRAWING_SCALE
+    def draw_racers(self, offset: tuple[int, int]) -> list[pygame.Rect]:
+        # A small square on every cell holding AI racers (they move a whole cell at a time)
+        size = self.path_width * DRAWING_SCALE // 2
+        inset = (self.path_width * DRAWING_SCALE - size) // 2
+        pitch = self.cell_pitch
+        w = self.maze_width
+        return [self.screen.fill(self.racer_color, (offset[0] + index % w * pitch + inset,
+                                                    offset[1] + index // w * pitch + inset, size, size))
+                for index in self.racers.cells()]
+    
+    def draw_player(self, pos: tuple[float, float], color: tuple, label: str,
+                    offset: tuple[int, int] = MAZE_OFFSET) -> pygame.Rect:
+        # pos is in (possibly fractional) cell coordinates, relative to cell (0, 0) at offset
+        x = offset[0] + round((pos[0] * (self.path_width + 1) + self.path_width // 2) * DRAWING_SCALE)
+        y = offset[1] + round((pos[1] * (self.path_width + 1) + self.path_width // 2) * DRAWING_SCALE)
         radius = (self.path_width // 2) * (DRAWING_SCALE + self.path_width)
         
         # Draw player as filled circle
-        pygame.draw.circle(self.screen, color, (x + self.path_width, y + self.path_width), radius)
+        circle_rect = pygame.draw.circle(self.screen, color, (x + self.path_width, y + self.path_width), radius)
         
         # Draw player label
-        label_text = self.font_tiny.render(label, True, BLACK)
-        self.screen.blit(label_text, (x - 5, y))
+        label_text = self.text_cache.render(self.font_tiny, label, BLACK)
+        return circle_rect.union(self.screen.blit(label_text, (x - 5, y)))
     
     def run(self) -> None:
         running = True
-        last_time = time.time()
+        frame_time = 1.0 / self.frame_rate if self.frame_rate > 0 else 0.0
+        last_time = next_frame = time.perf_counter()
         
         while running:
-            current_time = time.time()
-            dt = current_time - last_time
-            last_time = current_time
+            frame_start = time.perf_counter()
+            dt = frame_start - last_time
+            last_time = frame_start
             
             if self.game_state == GameState.TITLE:
                 running = self.update_title_screen()
@@ -650,9 +896,66 @@ class AmazingMaze:
             elif self.game_state == GameState.RESULT:
                 running = self.update_result_screen()
             
-            self.clock.tick(60)
-        
+            # CPU time spent on the frame, excluding the wait for the next one
+            frame_cpu = time.perf_counter() - frame_start
+            self.frame_timer.record(frame_cpu)
+            self.profiler.end_frame(frame_cpu)
+            
+            # Sleep (rather than spin) until the next frame is due; uncapped runs skip this
+            if frame_time:
+                next_frame = max(next_frame + frame_time, frame_start)
+                delay = next_frame - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+        
+        print(f"Average CPU time per frame: {self.frame_timer.overall_ms:.3f} ms over {self.frame_timer.frames} frames")
+        if self.show_frame_time:
+            print(f"Text cache: {self.text_cache.hits} hits, {self.text_cache.misses} misses")
+        if self.startup is not None:
+            print("\n".join(self.startup.report_lines()))
+        if self.profiler.capture is not None:
+            self.profiler.finish_capture()
+        self.profiler.dump()
+        self.prefetcher.close()
         pygame.quit()
 
 if __name__ == "__main__":
-    AmazingMaze().run()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Amazing Maze Remake")
+    parser.add_argument("--seed", type=int, help="seed for reproducible rounds")
+    parser.add_argument("--fps", type=int, default=FRAME_RATE, help="frame rate cap, 0 for uncapped")
+    parser.add_argument("--vsync", action="store_true", help="pace frames with the display's vsync instead")
+    parser.add_argument("--record", metavar="PATH",
+                        help="save a replay of each finished round, numbered after PATH "
+                             "(round.amr saves round-1.amr, round-2.amr...)")
+    parser.add_argument("--maze", metavar="PATH", help="play on a saved maze file (see maze_format.py)")
+    parser.add_argument("--algorithm", choices=list(GENERATORS), default="dfs", help="maze generation algorithm")
+    parser.add_argument("--size", type=parse_size, default="20x15",
+                        help="maze size as WIDTHxHEIGHT; mazes larger than the screen scroll")
+    parser.add_argument("--reveal", action="store_true",
+                        help="carve each maze on screen during warm-up instead of showing it finished")
+    parser.add_argument("--racers", type=int, default=0, metavar="N",
+                        help="N extra AI racers in single-player mode")
+    parser.add_argument("--shifting-walls", action="store_true",
+                        help="walls rotate every few seconds and the computer replans around them")
+    parser.add_argument("--min-difficulty", type=float, default=0.0, metavar="SCORE",
+                        help="choose entrances that make each maze at least this hard (e.g. 20)")
+    parser.add_argument("--profile", nargs="?", const="profile.json", metavar="PATH",
+                        help="time each frame phase and write the percentiles to PATH on exit "
+                             "(also enabled by AMAZING_MAZE_PROFILE=1)")
+    parser.add_argument("--font", metavar="PATH",
+                        help="draw text with this TTF file instead of looking up the Consolas system font")
+    parser.add_argument("--measure-startup", action="store_true",
+                        help="print the time from import to the first title frame by phase, then exit")
+    parser.add_argument("--profile-frames", type=int, default=PROFILE_CAPTURE_FRAMES, metavar="N",
+                        help="frames captured by cProfile when F5 is pressed")
+    args = parser.parse_args()
+    startup = None
+    if args.measure_startup:
+        startup = StartupTimer(STARTUP_CLOCK)
+        startup.mark("imports")
+    if args.shifting_walls and args.racers:
+        parser.error("--shifting-walls cannot be combined with --racers")
+    width, height = args.size
+    AmazingMaze(args.seed, args.fps, args.vsync, args.record, args.maze, args.algorithm, width, height,
+                FrameProfiler.from_environment(args.profile), args.profile_frames, args.reveal, args.racers,
+                args.min_difficulty, args.font, startup, args.shifting_walls).run()
\ No newline at end of file
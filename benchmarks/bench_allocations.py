@@ -0,0 +1,57 @@
+import argparse
+import time
+import tracemalloc
+
+from maze_grid import parse_size
+from maze_simulation import DOWN, LEFT, RIGHT, TICK_SECONDS, UP, GameState, MazeSimulation
+
+def ai_steps(sim: MazeSimulation, steps: int) -> None:
+    start = sim.player2_index
+    for _ in range(steps):
+        sim.move_ai()
+        if sim.player2_finished:
+            # Back to the entrance without starting a new round (which allocates)
+            sim.player2_index = start
+            sim.player2_finished = False
+
+def player_steps(sim: MazeSimulation, steps: int) -> None:
+    # step() with a player holding a key that changes every tick, the AI moving too
+    moves = ((LEFT,), (UP,), (RIGHT,), (DOWN,))
+    step = sim.step
+    for i in range(steps):
+        step(moves[i & 3], (), TICK_SECONDS)
+        if sim.game_state != GameState.PLAYING:
+            sim.game_state = GameState.PLAYING
+            sim.player1_finished = sim.player2_finished = False
+
+def measure(func, sim: MazeSimulation, steps: int) -> tuple[float, int, float]:
+    # (retained bytes per step, peak bytes above the start, seconds) for steps calls
+    func(sim, 100)  # warm up caches and lazily built state
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    tracemalloc.reset_peak()
+    func(sim, steps)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    func(sim, steps)
+    return (current - before) / steps, peak - before, time.perf_counter() - start
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Allocations on the movement hot path (tracemalloc)")
+    parser.add_argument("--steps", type=int, default=10_000)
+    parser.add_argument("--size", type=parse_size, default="100x100", help="maze size as WIDTHxHEIGHT")
+    parser.add_argument("--seed", type=int, default=1976)
+    args = parser.parse_args()
+
+    width, height = args.size
+    print(f"{'path':>10} {'retained B/step':>16} {'peak B':>8} {'steps/s':>12}")
+    for name, func in (("move_ai", ai_steps), ("step", player_steps)):
+        sim = MazeSimulation(width, height)
+        sim.start_round(two_player_mode=False, warmup=False, seed=args.seed)
+        retained, peak, elapsed = measure(func, sim, args.steps)
+        print(f"{name:>10} {retained:16.3f} {peak:8} {args.steps / elapsed:12,.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+import argparse
+import random
+import time
+
+from maze_analysis import JunctionGraph
+from maze_grid import EAST, NORTH, SOUTH, WEST, Vec2I, parse_size
+from maze_simulation import MazeSimulation
+
+DEFAULT_SIZES = [(20, 15), (200, 200), (1000, 1000)]
+QUERIES = 200
+
+def cell_degrees(sim: MazeSimulation) -> list[int]:
+    # Passages per cell straight from the maze, ignoring the entrance openings
+    w = sim.maze_width
+    degrees = []
+    for i in range(len(sim.maze)):
+        cell, x = sim.maze[i], i % w
+        degrees.append(bool(cell & NORTH) + bool(cell & SOUTH) + bool(cell & EAST and x < w - 1)
+                       + bool(cell & WEST and x > 0))
+    return degrees
+
+def border_cells(width: int, height: int) -> list[int]:
+    return [y * width for y in range(height)] + [y * width + width - 1 for y in range(height)]
+
+def path_statistics(sim: MazeSimulation, start: int, target: int, degrees: list[int]) -> tuple[int, int]:
+    # Solution length and junctions passed, the find_path way
+    w = sim.maze_width
+    path = sim.find_path(Vec2I(start % w, start // w), Vec2I(target % w, target // w))
+    return len(path), sum(1 for pos in path[:-1] if degrees[pos.y * w + pos.x] >= 3)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Junction graph index: build and query time against find_path")
+    parser.add_argument("sizes", nargs="*", type=parse_size, default=DEFAULT_SIZES, help="maze sizes as WIDTHxHEIGHT")
+    parser.add_argument("--seed", type=int, default=1976)
+    args = parser.parse_args()
+
+    print(f"{'size':>12} {'nodes':>9} {'dead ends':>10} {'build ms':>9} {'query us':>9} {'find_path us':>13}")
+    for width, height in args.sizes:
+        size = f"{width}x{height}"
+        sim = MazeSimulation(width, height)
+        sim.start_round(two_player_mode=False, seed=args.seed)
+        start = time.perf_counter()
+        graph = JunctionGraph(sim.maze, border_cells(width, height))
+        build = time.perf_counter() - start
+
+        rng = random.Random(args.seed)
+        pairs = [(rng.randrange(height) * width, rng.randrange(height) * width + width - 1) for _ in range(QUERIES)]
+        start = time.perf_counter()
+        for a, b in pairs:
+            graph.difficulty(a, b)
+        query = (time.perf_counter() - start) / len(pairs)
+
+        degrees = cell_degrees(sim)
+        searches = pairs[:max(1, QUERIES // (1 + width * height // 10_000))]
+        start = time.perf_counter()
+        for a, b in searches:
+            path_statistics(sim, a, b, degrees)
+        search = (time.perf_counter() - start) / len(searches)
+        print(f"{size:>12} {len(graph.node_cells):9,} {graph.dead_end_count:10,} {1000 * build:9.2f} "
+              f"{1e6 * query:9.2f} {1e6 * search:13.1f}")
+
+if __name__ == "__main__":
+    main()
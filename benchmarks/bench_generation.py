@@ -0,0 +1,105 @@
+import argparse
+import random
+import time
+
+from maze_grid import CellPath, generate_dfs, parse_size
+
+DEFAULT_SIZES = [(20, 15), (500, 500), (4000, 4000)]
+
+class _LegacyVec2I:
+    def __init__(self, x: int, y: int) -> None:
+        self.x = x
+        self.y = y
+
+def legacy_generate(width: int, height: int, rng: random.Random) -> list[int]:
+    # The original AmazingMaze.generate_maze loop, kept verbatim as the baseline
+    maze = [0] * (width * height)
+    stack = []
+    x = rng.randint(0, width - 1)
+    y = rng.randint(0, height - 1)
+    stack.append(_LegacyVec2I(x, y))
+    maze[y * width + x] = CellPath.VISITED.value
+    visited_cells = 1
+
+    while visited_cells < width * height:
+        def offset(xo, yo):
+            new_x = stack[-1].x + xo
+            new_y = stack[-1].y + yo
+            if new_x < 0 or new_x >= width or new_y < 0 or new_y >= height:
+                return -1
+            return new_y * width + new_x
+
+        neighbours = []
+        if stack[-1].y > 0 and (maze[offset(0, -1)] & CellPath.VISITED.value) == 0:
+            neighbours.append(0)
+        if stack[-1].x < width - 1 and (maze[offset(1, 0)] & CellPath.VISITED.value) == 0:
+            neighbours.append(1)
+        if stack[-1].y < height - 1 and (maze[offset(0, 1)] & CellPath.VISITED.value) == 0:
+            neighbours.append(2)
+        if stack[-1].x > 0 and (maze[offset(-1, 0)] & CellPath.VISITED.value) == 0:
+            neighbours.append(3)
+
+        if neighbours:
+            next_dir = rng.choice(neighbours)
+            if next_dir == 0:
+                maze[offset(0, -1)] = maze[offset(0, -1)] | CellPath.VISITED.value | CellPath.SOUTH.value
+                maze[offset(0, 0)] = maze[offset(0, 0)] | CellPath.NORTH.value
+                stack.append(_LegacyVec2I(stack[-1].x, stack[-1].y - 1))
+            elif next_dir == 1:
+                maze[offset(1, 0)] = maze[offset(1, 0)] | CellPath.VISITED.value | CellPath.WEST.value
+                maze[offset(0, 0)] = maze[offset(0, 0)] | CellPath.EAST.value
+                stack.append(_LegacyVec2I(stack[-1].x + 1, stack[-1].y))
+            elif next_dir == 2:
+                maze[offset(0, 1)] = maze[offset(0, 1)] | CellPath.VISITED.value | CellPath.NORTH.value
+                maze[offset(0, 0)] = maze[offset(0, 0)] | CellPath.SOUTH.value
+                stack.append(_LegacyVec2I(stack[-1].x, stack[-1].y + 1))
+            elif next_dir == 3:
+                maze[offset(-1, 0)] = maze[offset(-1, 0)] | CellPath.VISITED.value | CellPath.EAST.value
+                maze[offset(0, 0)] = maze[offset(0, 0)] | CellPath.WEST.value
+                stack.append(_LegacyVec2I(stack[-1].x - 1, stack[-1].y))
+            visited_cells += 1
+        else:
+            stack.pop()
+
+    return maze
+
+def time_generation(func, width: int, height: int, seed: int, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        rng = random.Random(seed)
+        start = time.perf_counter()
+        func(width, height, rng)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Maze generation throughput (cells/second)")
+    parser.add_argument("sizes", nargs="*", type=parse_size, default=DEFAULT_SIZES, help="maze sizes as WIDTHxHEIGHT")
+    parser.add_argument("--seed", type=int, default=1976)
+    parser.add_argument("--repeat", type=int, default=3, help="runs per size; the best time is reported")
+    parser.add_argument("--legacy-limit", type=int, default=1_000_000,
+                        help="skip the legacy generator above this many cells (it needs minutes and GBs)")
+    args = parser.parse_args()
+
+    print(f"{'size':>12} {'legacy cells/s':>16} {'grid cells/s':>16} {'speed-up':>9}")
+    for width, height in args.sizes:
+        size = f"{width}x{height}"
+        cells = width * height
+        # Large mazes are only timed once, the per-run noise is negligible there
+        repeat = args.repeat if cells <= 1_000_000 else 1
+
+        grid_time = time_generation(generate_dfs, width, height, args.seed, repeat)
+        grid_rate = cells / grid_time
+
+        if cells <= args.legacy_limit:
+            legacy_time = time_generation(legacy_generate, width, height, args.seed, repeat)
+            legacy_rate = f"{cells / legacy_time:16,.0f}"
+            speed_up = f"{legacy_time / grid_time:8.1f}x"
+        else:
+            legacy_rate = f"{'skipped':>16}"
+            speed_up = f"{'-':>9}"
+
+        print(f"{size:>12} {legacy_rate} {grid_rate:16,.0f} {speed_up}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+import argparse
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from maze_format import stream_maze
+from maze_generators import GENERATORS
+from maze_grid import MazeGrid, parse_size
+
+DEFAULT_SIZES = [(20, 15), (500, 500), (1000, 1000)]
+
+def stream_size(text: str) -> tuple[int, int] | None:
+    # --stream takes a size, or '' to skip streaming
+    return parse_size(text) if text else None
+
+def measure(carve, width: int, height: int, seed: int, repeat: int) -> tuple[float, int]:
+    # Best wall time, then the peak traced allocation of one more (traced, so slower) run
+    best = float("inf")
+    for _ in range(repeat):
+        rng = random.Random(seed)
+        start = time.perf_counter()
+        carve(MazeGrid(width, height), rng)
+        best = min(best, time.perf_counter() - start)
+
+    rng = random.Random(seed)
+    tracemalloc.start()
+    carve(MazeGrid(width, height), rng)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak
+
+def measure_stream(width: int, height: int, seed: int) -> tuple[float, int]:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "stream.amz")
+        start = time.perf_counter()
+        stream_maze(path, width, height, seed)
+        elapsed = time.perf_counter() - start
+
+        tracemalloc.start()
+        stream_maze(path, width, height, seed)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return elapsed, peak
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare maze generation algorithms: speed and peak memory")
+    parser.add_argument("sizes", nargs="*", type=parse_size, default=DEFAULT_SIZES, help="maze sizes as WIDTHxHEIGHT")
+    parser.add_argument("--algorithms", nargs="*", default=list(GENERATORS), help="algorithms to time")
+    parser.add_argument("--seed", type=int, default=1976)
+    parser.add_argument("--repeat", type=int, default=3, help="runs per size; the best time is reported")
+    parser.add_argument("--stream", type=stream_size, default="1000x20000",
+                        help="also stream an Eller's maze of this size to disk ('' to skip)")
+    args = parser.parse_args()
+
+    unknown = [name for name in args.algorithms if name not in GENERATORS]
+    if unknown:
+        parser.error(f"unknown algorithms: {', '.join(unknown)}")
+
+    # Peak memory counts the grid itself (one byte per cell) plus the algorithm's working set
+    print(f"{'size':>12} {'algorithm':>10} {'cells/s':>14} {'peak KiB':>12} {'bytes/cell':>11}")
+    for width, height in args.sizes:
+        size = f"{width}x{height}"
+        cells = width * height
+        repeat = args.repeat if cells <= 1_000_000 else 1
+        for name in args.algorithms:
+            elapsed, peak = measure(GENERATORS[name], width, height, args.seed, repeat)
+            print(f"{size:>12} {name:>10} {cells / elapsed:14,.0f} {peak / 1024:12,.1f} {peak / cells:11.2f}")
+
+    if args.stream:
+        width, height = args.stream
+        elapsed, peak = measure_stream(width, height, args.seed)
+        cells = width * height
+        print(f"\nEller's streamed to disk, {width}x{height}: {cells / elapsed:,.0f} cells/s, "
+              f"peak {peak / 1024:,.1f} KiB for {cells:,} cells (the grid alone would be {cells / 1024:,.0f} KiB)")
+
+if __name__ == "__main__":
+    main()
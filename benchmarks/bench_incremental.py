@@ -0,0 +1,54 @@
+import argparse
+import os
+import time
+
+# Offscreen rendering; must be set before pygame creates the display
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from maze_grid import parse_size
+from maze_simulation import MazeSimulation
+
+DEFAULT_SIZES = [(20, 15), (200, 200), (1000, 1000)]
+FRAME_BUDGET_MS = 1000 / 60
+
+def bench_size(game, width: int, height: int, seed: int) -> tuple[float, list[float]]:
+    # The blocking generate_maze + setup_game time, then the frame times (scheduler
+    # slice + draw_game) of the same round carved incrementally
+    sim = MazeSimulation(width, height)
+    start = time.perf_counter()
+    sim.start_round(False, seed=seed)
+    blocking = time.perf_counter() - start
+
+    game.maze_width, game.maze_height = width, height
+    game.start_round(False, seed=seed, incremental=True)
+    frames = []
+    while game.scheduler.pending:
+        start = time.perf_counter()
+        game.scheduler.run()
+        game.draw_game(0.0)
+        frames.append(time.perf_counter() - start)
+    return blocking, frames
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Frame times while a maze is carved incrementally (offscreen)")
+    parser.add_argument("sizes", nargs="*", type=parse_size, default=DEFAULT_SIZES, help="maze sizes as WIDTHxHEIGHT")
+    parser.add_argument("--seed", type=int, default=1976)
+    args = parser.parse_args()
+
+    from amazing_maze import AmazingMaze
+
+    game = AmazingMaze(seed=args.seed)
+    game.prefetcher.close()
+    game.prefetcher.take = lambda: (None, None)  # generate synchronously, the prefetcher is closed
+    print(f"{'size':>12} {'blocking ms':>12} {'frames':>7} {'mean ms':>9} {'p95 ms':>9} {'max ms':>9} {'over 60 fps':>12}")
+    for width, height in args.sizes:
+        size = f"{width}x{height}"
+        blocking, frames = bench_size(game, width, height, args.seed)
+        frames.sort()
+        over = sum(1 for t in frames if 1000 * t > FRAME_BUDGET_MS)
+        print(f"{size:>12} {1000 * blocking:12.1f} {len(frames):7} {1000 * sum(frames) / len(frames):9.3f} "
+              f"{1000 * frames[int(len(frames) * 0.95)]:9.3f} {1000 * frames[-1]:9.3f} {over:12}")
+
+if __name__ == "__main__":
+    main()
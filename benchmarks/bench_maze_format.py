@@ -0,0 +1,43 @@
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from maze_format import load_maze, save_maze
+from maze_grid import generate_dfs, parse_size
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Maze file save/open/read timings")
+    parser.add_argument("size", nargs="?", type=parse_size, default="2000x2000", help="maze size as WIDTHxHEIGHT")
+    parser.add_argument("--seed", type=int, default=1976)
+    args = parser.parse_args()
+
+    width, height = args.size
+    grid = generate_dfs(width, height, random.Random(args.seed))
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "maze.amz")
+        start = time.perf_counter()
+        save_maze(path, grid, 1, 1, args.seed)
+        save_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        maze = load_maze(path)
+        open_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        maze.rows(height // 2, height // 2 + 1)
+        row_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        loaded = maze.to_grid()
+        full_time = time.perf_counter() - start
+        maze.close()
+
+        print(f"{width}x{height}: {os.path.getsize(path):,} bytes on disk ({len(grid):,} cells)")
+        print(f"save {save_time * 1000:.1f} ms, mmap open {open_time * 1000:.3f} ms, "
+              f"one row {row_time * 1000:.3f} ms, full load {full_time * 1000:.1f} ms, "
+              f"identical: {loaded.tobytes() == grid.tobytes()}")
+
+if __name__ == "__main__":
+    main()
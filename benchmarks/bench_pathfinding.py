@@ -0,0 +1,121 @@
+import argparse
+import random
+import time
+
+from maze_grid import CellPath, MazeGrid, Vec2I, generate_dfs, parse_size
+from maze_pathfinding import find_path
+
+DEFAULT_SIZES = [(20, 15), (100, 100), (300, 300)]
+
+class _LegacyPathNode:
+    def __init__(self, position: Vec2I) -> None:
+        self.position = position
+        self.parent = None
+        self.g_cost = 0
+        self.h_cost = 0
+
+    @property
+    def f_cost(self) -> int:
+        return self.g_cost + self.h_cost
+
+def legacy_can_move(grid: MazeGrid, from_pos: Vec2I, direction: Vec2I) -> bool:
+    to_pos = from_pos + direction
+    if to_pos.x < 0 or to_pos.x >= grid.width or to_pos.y < 0 or to_pos.y >= grid.height:
+        return False
+    cell = grid[from_pos.y * grid.width + from_pos.x]
+    if direction.x == -1 and (cell & CellPath.WEST.value) != 0:
+        return True
+    if direction.x == 1 and (cell & CellPath.EAST.value) != 0:
+        return True
+    if direction.y == -1 and (cell & CellPath.NORTH.value) != 0:
+        return True
+    if direction.y == 1 and (cell & CellPath.SOUTH.value) != 0:
+        return True
+    return False
+
+def _distance(a: Vec2I, b: Vec2I) -> int:
+    return abs(a.x - b.x) + abs(a.y - b.y)
+
+def legacy_find_path(grid: MazeGrid, start: Vec2I, target: Vec2I) -> list[Vec2I]:
+    # The original AmazingMaze.find_path (linear-scan open set), kept as the baseline
+    open_set = []
+    closed_set = set()
+    start_node = _LegacyPathNode(start)
+    start_node.h_cost = _distance(start, target)
+    open_set.append(start_node)
+
+    while open_set:
+        current_node = open_set[0]
+        for i in range(1, len(open_set)):
+            if (open_set[i].f_cost < current_node.f_cost or
+                (open_set[i].f_cost == current_node.f_cost and open_set[i].h_cost < current_node.h_cost)):
+                current_node = open_set[i]
+
+        open_set.remove(current_node)
+        closed_set.add(current_node.position)
+
+        if current_node.position == target:
+            path = []
+            node = current_node
+            while node is not None and node != start_node:
+                path.append(node.position)
+                node = node.parent
+            path.reverse()
+            return path
+
+        for direction in [Vec2I(0, -1), Vec2I(1, 0), Vec2I(0, 1), Vec2I(-1, 0)]:
+            if legacy_can_move(grid, current_node.position, direction):
+                neighbor_pos = current_node.position + direction
+                if neighbor_pos in closed_set:
+                    continue
+                move_cost = current_node.g_cost + _distance(current_node.position, neighbor_pos)
+                neighbor_node = next((n for n in open_set if n.position == neighbor_pos), None)
+                if neighbor_node is None:
+                    neighbor_node = _LegacyPathNode(neighbor_pos)
+                    neighbor_node.g_cost = move_cost
+                    neighbor_node.h_cost = _distance(neighbor_pos, target)
+                    neighbor_node.parent = current_node
+                    open_set.append(neighbor_node)
+                elif move_cost < neighbor_node.g_cost:
+                    neighbor_node.g_cost = move_cost
+                    neighbor_node.parent = current_node
+
+    return []
+
+def random_endpoints(grid: MazeGrid, rng: random.Random) -> tuple[Vec2I, Vec2I]:
+    # Entrance rows as chosen by setup_game: left column to right column
+    return (Vec2I(0, rng.randint(1, grid.height - 2)),
+            Vec2I(grid.width - 1, rng.randint(1, grid.height - 2)))
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="A* pathfinding: heap/flat-index engine vs the original")
+    parser.add_argument("sizes", nargs="*", type=parse_size, default=DEFAULT_SIZES, help="maze sizes as WIDTHxHEIGHT")
+    parser.add_argument("--seed", type=int, default=1976)
+    parser.add_argument("--legacy-limit", type=int, default=100_000,
+                        help="skip the original find_path above this many cells")
+    args = parser.parse_args()
+
+    print(f"{'size':>12} {'legacy ms':>12} {'heap ms':>12} {'speed-up':>9}")
+    for width, height in args.sizes:
+        size = f"{width}x{height}"
+        rng = random.Random(args.seed)
+        grid = generate_dfs(width, height, rng)
+        start, target = random_endpoints(grid, rng)
+
+        begin = time.perf_counter()
+        find_path(grid, start, target)
+        heap_time = time.perf_counter() - begin
+
+        if width * height <= args.legacy_limit:
+            begin = time.perf_counter()
+            legacy_find_path(grid, start, target)
+            legacy_time = time.perf_counter() - begin
+            legacy_text = f"{legacy_time * 1000:12.2f}"
+            speed_up = f"{legacy_time / heap_time:8.1f}x"
+        else:
+            legacy_text = f"{'skipped':>12}"
+            speed_up = f"{'-':>9}"
+        print(f"{size:>12} {legacy_text} {heap_time * 1000:12.2f} {speed_up}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+import argparse
+import time
+
+from maze_grid import np, parse_size
+from maze_pathfinding import descend
+from maze_racers import AIRacers
+from maze_simulation import AI_MOVE_INTERVAL, TICK_SECONDS, MazeSimulation
+
+DEFAULT_COUNTS = [1, 10, 100, 1000]
+
+def step_individually(sim: MazeSimulation, positions: list[int], timers: list[float], intervals: list[float],
+                      dt: float) -> None:
+    # The move_ai way: one descend() call per agent that is due to move
+    for i in range(len(positions)):
+        timers[i] += dt
+        if timers[i] > intervals[i]:
+            timers[i] = 0.0
+            nxt = descend(sim.maze, sim.player2_distances, positions[i])
+            if nxt >= 0:
+                positions[i] = nxt
+
+def round_with_racers(width: int, height: int, count: int, seed: int, use_numpy: bool) -> MazeSimulation:
+    sim = MazeSimulation(width, height, racers=count)
+    sim.start_round(two_player_mode=False, warmup=False, seed=seed)
+    if not use_numpy:
+        sim.racers = AIRacers.spawn(sim.maze, sim.player2_distances, count, sim.seed, AI_MOVE_INTERVAL, False)
+    return sim
+
+def time_ticks(step, ticks: int) -> float:
+    start = time.perf_counter()
+    for _ in range(ticks):
+        step(TICK_SECONDS)
+    return (time.perf_counter() - start) / ticks
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Cost per tick of N AI racers sharing one distance field")
+    parser.add_argument("counts", nargs="*", type=int, default=DEFAULT_COUNTS, help="racer counts")
+    parser.add_argument("--size", type=parse_size, default="200x200", help="maze size as WIDTHxHEIGHT")
+    parser.add_argument("--ticks", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=1976)
+    args = parser.parse_args()
+
+    width, height = args.size
+    print(f"{'racers':>7} {'per-agent us':>13} {'looped us':>10} {'batched us':>11}  (per tick)")
+    for count in args.counts:
+        sim = round_with_racers(width, height, count, args.seed, False)
+        racers = sim.racers
+        positions, timers, intervals = list(racers.positions), [0.0] * count, list(racers.intervals)
+        individual = time_ticks(lambda dt: step_individually(sim, positions, timers, intervals, dt), args.ticks)
+        looped = time_ticks(racers.step, args.ticks)
+        batched = ""
+        if np is not None:
+            fast = round_with_racers(width, height, count, args.seed, True).racers
+            batched = f"{1e6 * time_ticks(fast.step, args.ticks):11.2f}"
+        print(f"{count:7} {1e6 * individual:13.2f} {1e6 * looped:10.2f} {batched:>11}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+import argparse
+import os
+import time
+
+# Offscreen rendering; must be set before pygame creates the display
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+import maze_raster
+from maze_grid import parse_size
+
+DEFAULT_SIZES = [(20, 15), (200, 200), (1000, 1000)]
+REPEAT = 20
+
+def make_game(seed: int):
+    from amazing_maze import AmazingMaze
+
+    game = AmazingMaze(seed=seed)
+    game.prefetcher.close()
+    game.prefetcher.take = lambda: (None, None)  # generate synchronously, the prefetcher is closed
+    return game
+
+def timed(function, repeat: int = REPEAT) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Maze layer and thumbnail rendering: surfarray against draw calls")
+    parser.add_argument("sizes", nargs="*", type=parse_size, default=DEFAULT_SIZES, help="maze sizes as WIDTHxHEIGHT")
+    parser.add_argument("--seed", type=int, default=1976)
+    args = parser.parse_args()
+
+    from amazing_maze import MAZE_OFFSET, SCREEN_HEIGHT, SCREEN_WIDTH
+    game = make_game(args.seed)
+    surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)).convert()
+    print(f"{'size':>12} {'cells':>7} {'draw calls ms':>14} {'raster ms':>10} {'thumbnail ms':>13} {'thumbnail':>11}")
+    for game.maze_width, game.maze_height in args.sizes:
+        size = f"{game.maze_width}x{game.maze_height}"
+        game.start_round(two_player_mode=False, warmup=False, seed=args.seed)
+        while game.scheduler.pending:  # large mazes are carved incrementally
+            game.scheduler.run(1e9)
+        # draw_maze alone over the screen's maze (or one chunk's worth of cells)
+        cells_x, cells_y = range(min(game.maze_width, 20)), range(min(game.maze_height, 15))
+
+        def render() -> None:
+            game.draw_maze(surface, MAZE_OFFSET, cells_x, cells_y)
+
+        game.rasterise = False
+        drawn = timed(render)
+        game.rasterise = True
+        rasterised = timed(render)
+        thumbnail = timed(lambda: maze_raster.render(game.maze, cell_px=1, wall_px=1, border=True), 3)
+        width, height = 2 * game.maze_width + 1, 2 * game.maze_height + 1
+        print(f"{size:>12} {len(cells_x) * len(cells_y):7} {1000 * drawn:14.3f} {1000 * rasterised:10.3f} "
+              f"{1000 * thumbnail:13.2f} {f'{width}x{height}':>11}")
+
+if __name__ == "__main__":
+    main()
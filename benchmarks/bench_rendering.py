@@ -0,0 +1,52 @@
+import argparse
+import os
+import time
+
+# Offscreen rendering; must be set before pygame creates the display
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from amazing_maze import AmazingMaze
+from maze_grid import parse_size
+
+DEFAULT_SIZES = [(20, 15), (100, 100), (1000, 1000)]
+
+def bench_size(game: AmazingMaze, width: int, height: int, seed: int, frames: int,
+               two_player_mode: bool) -> tuple[list[float], int]:
+    # Walk player 1 along its solution one cell per frame and time draw_game
+    game.maze_width, game.maze_height = width, height
+    game.start_round(two_player_mode, warmup=False, seed=seed)
+    path = game.find_path(game.player1_pos, game.player1_target)
+    misses = game.chunks.misses
+    times = []
+    for frame in range(frames):
+        game.player1_pos = path[min(frame, len(path) - 1)]
+        game.ticks += 6
+        game.track_motion()
+        start = time.perf_counter()
+        game.draw_game(0.0)
+        times.append(time.perf_counter() - start)
+    return times, game.chunks.misses - misses
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Per-frame draw_game cost by maze size (offscreen)")
+    parser.add_argument("sizes", nargs="*", type=parse_size, default=DEFAULT_SIZES, help="maze sizes as WIDTHxHEIGHT")
+    parser.add_argument("--seed", type=int, default=1976)
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--two-player", action="store_true", help="split-screen cameras")
+    args = parser.parse_args()
+
+    game = AmazingMaze(seed=args.seed)
+    game.prefetcher.close()
+    game.prefetcher.take = lambda: (None, None)  # generate synchronously, the prefetcher is closed
+    print(f"{'size':>12} {'mode':>8} {'mean ms':>9} {'p95 ms':>9} {'chunk renders':>14}")
+    for width, height in args.sizes:
+        size = f"{width}x{height}"
+        times, renders = bench_size(game, width, height, args.seed, args.frames, args.two_player)
+        times.sort()
+        mode = "camera" if game.camera_mode else "static"
+        print(f"{size:>12} {mode:>8} {1000 * sum(times) / len(times):9.3f} "
+              f"{1000 * times[int(len(times) * 0.95)]:9.3f} {renders:>14}")
+
+if __name__ == "__main__":
+    main()
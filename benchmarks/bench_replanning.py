@@ -0,0 +1,77 @@
+import argparse
+import random
+import statistics
+import time
+
+from maze_grid import parse_size, shift_walls
+from maze_pathfinding import astar_indices, distance_field
+from maze_replanning import DStarLite, SplicedPath
+from maze_simulation import MazeSimulation
+
+DEFAULT_SIZES = [(100, 100), (300, 300), (1000, 1000)]
+DEFAULT_CHANGES = [1, 4, 16, 64]
+REPLANS = 20
+MOVES_BETWEEN = 4  # agent moves between two wall shifts
+
+def block_cells(width: int, blocks: list[int]) -> set[int]:
+    return {cell for index in blocks for cell in (index, index + 1, index + width, index + width + 1)}
+
+def bench_size(width: int, height: int, changes: list[int], seed: int) -> None:
+    # Both planners follow the computer through the same wall shifts; planning from
+    # scratch (a distance field, or A* from the computer) is the baseline
+    sim = MazeSimulation(width, height, shifting_walls=True)
+    sim.start_round(two_player_mode=False, warmup=False, seed=seed)
+    goal = sim.player2_target_index
+    start = time.perf_counter()
+    field = distance_field(sim.maze, goal)
+    full_field = time.perf_counter() - start
+    start = time.perf_counter()
+    astar_indices(sim.maze, sim.player2_index, goal)
+    full_astar = time.perf_counter() - start
+
+    rng = random.Random(seed)
+    for count in changes:
+        field = distance_field(sim.maze, goal)
+        spliced = SplicedPath(sim.maze, goal, sim.player2_index, field)
+        dstar = DStarLite(sim.maze, goal, sim.player2_index, field)
+        splice_times, dstar_times, expanded = [], [], []
+        for _ in range(REPLANS):
+            for _ in range(MOVES_BETWEEN):
+                cell = spliced.next_cell()
+                if cell >= 0:
+                    spliced.move_to(cell)
+                    dstar.move_to(cell)
+            blocks = []
+            elapsed = 0.0
+            for _ in range(count):
+                for index in shift_walls(sim.maze, rng, 1):
+                    start = time.perf_counter()
+                    spliced.splice_block(index)
+                    elapsed += time.perf_counter() - start
+                    blocks.append(index)
+            splice_times.append(elapsed)
+            before = dstar.expanded
+            start = time.perf_counter()
+            dstar.update_walls(block_cells(width, blocks))
+            dstar_times.append(time.perf_counter() - start)
+            expanded.append(dstar.expanded - before)
+        print(f"{f'{width}x{height}':>12} {count:7} {1e6 * statistics.mean(splice_times):10.1f} "
+              f"{1000 * statistics.mean(dstar_times):9.3f} {statistics.mean(expanded):10.1f} "
+              f"{1000 * full_field:9.1f} {1000 * full_astar:8.1f}")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Replanning after wall shifts: path splicing and D* Lite against planning "
+                                                 "from scratch")
+    parser.add_argument("sizes", nargs="*", type=parse_size, default=DEFAULT_SIZES, help="maze sizes as WIDTHxHEIGHT")
+    parser.add_argument("--changes", type=int, nargs="+", default=DEFAULT_CHANGES, metavar="N",
+                        help="walls shifted between two replans")
+    parser.add_argument("--seed", type=int, default=1976)
+    args = parser.parse_args()
+
+    print(f"{'size':>12} {'shifts':>7} {'splice us':>10} {'D* ms':>9} {'D* cells':>10} {'field ms':>9} "
+          f"{'A* ms':>8}  (per replan)")
+    for width, height in args.sizes:
+        bench_size(width, height, args.changes, args.seed)
+
+if __name__ == "__main__":
+    main()
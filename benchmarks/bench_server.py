@@ -0,0 +1,107 @@
+import argparse
+import asyncio
+import multiprocessing
+import random
+import struct
+import time
+
+from maze_grid import parse_size
+from maze_server import MSG_PONG, MazeClient, MazeServer, percentiles
+from maze_simulation import DOWN, LEFT, RIGHT, TICK_SECONDS, UP
+
+# Loopback load test: the server runs here, the clients in a second process (so the
+# server's CPU time is its own), each client changing its held keys every few ticks
+# and pinging twice a second. Rooms per core = rooms / fraction of a core the server used.
+DEFAULT_ROOMS = [10, 100, 500]
+INPUT_TICKS = 10
+PING_TICKS = 30
+_PING = struct.Struct("<d")
+DIRECTIONS = [(), (LEFT,), (RIGHT,), (UP,), (DOWN,), (LEFT, UP), (RIGHT, DOWN)]
+
+async def receive_all(client: MazeClient, rtts: list[float]) -> None:
+    try:
+        while True:
+            kind, payload = await client.receive()
+            if kind == MSG_PONG:
+                rtts.append(time.perf_counter() - _PING.unpack(payload)[0])
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+
+async def drive_clients(port: int, rooms: int, players: int, seconds: float, seed: int) -> list[float]:
+    rng = random.Random(seed)
+    clients = [await MazeClient.connect(f"room-{i // players}", players, port=port) for i in range(rooms * players)]
+    rtts: list[float] = []
+    readers = [asyncio.create_task(receive_all(client, rtts)) for client in clients]
+
+    loop = asyncio.get_running_loop()
+    end = loop.time() + seconds
+    tick = 0
+    while loop.time() < end:
+        await asyncio.sleep(TICK_SECONDS * INPUT_TICKS)
+        tick += INPUT_TICKS
+        stamp = _PING.pack(time.perf_counter())
+        for client in clients:
+            client.send_input(rng.choice(DIRECTIONS))
+            if tick % PING_TICKS == 0:
+                client.ping(stamp)
+    for client in clients:
+        await client.close()
+    for reader in readers:
+        reader.cancel()
+    return rtts
+
+def run_clients(port: int, rooms: int, players: int, seconds: float, seed: int,
+                results: multiprocessing.Queue) -> None:
+    results.put(asyncio.run(drive_clients(port, rooms, players, seconds, seed)))
+
+async def load_step(rooms: int, players: int, seconds: float, size: tuple[int, int], seed: int) -> dict:
+    server = MazeServer(*size, seed=seed)
+    port = await server.start("127.0.0.1", 0)
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    process = context.Process(target=run_clients, args=(port, rooms, players, seconds + 1.0, seed, results))
+    process.start()
+
+    # Measure once every client has joined
+    while len(server.connections) < rooms * players:
+        await asyncio.sleep(0.05)
+    server.tick_times.clear()
+    server.tick_lateness.clear()
+    sent = server.bytes_sent
+    cpu = time.process_time()
+    start = time.perf_counter()
+    await asyncio.sleep(seconds)
+    elapsed = time.perf_counter() - start
+    core_fraction = (time.process_time() - cpu) / elapsed
+    stats = server.stats()
+
+    rtts = await asyncio.get_running_loop().run_in_executor(None, results.get)
+    process.join()
+    await server.stop()
+    return {
+        "rooms": rooms, "core": core_fraction, "tick_ms": stats["tick_ms"], "lateness_ms": stats["lateness_ms"],
+        "rtt_ms": percentiles(rtts), "bytes_per_room_s": (stats["bytes_sent"] - sent) / elapsed / rooms,
+    }
+
+async def main_async(args: argparse.Namespace) -> None:
+    print(f"{'rooms':>6} {'core':>6} {'rooms/core':>11} {'tick p50':>9} {'tick p99':>9} "
+          f"{'late p99':>9} {'rtt p50':>8} {'rtt p99':>8} {'B/room/s':>9}")
+    for rooms in args.rooms:
+        result = await load_step(rooms, args.players, args.seconds, args.size, args.seed)
+        print(f"{rooms:6} {result['core']:6.2f} {rooms / max(result['core'], 1e-9):11,.0f} "
+              f"{result['tick_ms']['p50']:9.3f} {result['tick_ms']['p99']:9.3f} "
+              f"{result['lateness_ms']['p99']:9.3f} {result['rtt_ms'][0]:8.2f} {result['rtt_ms'][2]:8.2f} "
+              f"{result['bytes_per_room_s']:9,.0f}")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Loopback load test of maze_server: rooms per core and tick latency")
+    parser.add_argument("rooms", nargs="*", type=int, default=DEFAULT_ROOMS, help="concurrent room counts to try")
+    parser.add_argument("--players", type=int, choices=(1, 2), default=1,
+                        help="clients per room (1 races the server's AI)")
+    parser.add_argument("--seconds", type=float, default=5.0, help="measured time per room count")
+    parser.add_argument("--size", type=parse_size, default="20x15", help="maze size as WIDTHxHEIGHT")
+    parser.add_argument("--seed", type=int, default=1976)
+    asyncio.run(main_async(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
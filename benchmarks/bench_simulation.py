@@ -0,0 +1,49 @@
+import argparse
+import sys
+import time
+
+from maze_grid import Vec2I, parse_size
+from maze_pathfinding import descend
+from maze_simulation import GameState, MazeSimulation
+
+def player1_bot(sim: MazeSimulation) -> list[Vec2I]:
+    # Player 1 follows its exit distance field, one move per key press
+    w = sim.maze_width
+    here = sim.player1_pos.y * w + sim.player1_pos.x
+    nxt = descend(sim.maze, sim.player1_distances, here)
+    if nxt < 0:
+        return []
+    return [Vec2I(nxt % w - sim.player1_pos.x, nxt // w - sim.player1_pos.y)]
+
+def play_round(sim: MazeSimulation, max_ticks: int) -> int:
+    sim.start_round(two_player_mode=False, warmup=False)
+    while sim.game_state == GameState.PLAYING and sim.ticks < max_ticks:
+        sim.step(player1_bot(sim))
+    return sim.ticks
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Headless AI-vs-AI rounds per second")
+    parser.add_argument("--rounds", type=int, default=2000)
+    parser.add_argument("--size", type=parse_size, default="20x15", help="maze size as WIDTHxHEIGHT")
+    parser.add_argument("--seed", type=int, default=1976)
+    parser.add_argument("--max-ticks", type=int, default=100_000)
+    args = parser.parse_args()
+
+    width, height = args.size
+    sim = MazeSimulation(width, height, seed=args.seed)
+
+    wins = 0
+    ticks = 0
+    start = time.perf_counter()
+    for _ in range(args.rounds):
+        ticks += play_round(sim, args.max_ticks)
+        wins += sim.player1_finished and not sim.player2_finished
+    elapsed = time.perf_counter() - start
+
+    print(f"{args.rounds} rounds of {width}x{height} in {elapsed:.2f}s: "
+          f"{args.rounds / elapsed:,.0f} rounds/s, {ticks / elapsed:,.0f} ticks/s, "
+          f"player 1 won {wins / args.rounds:.1%}")
+    print(f"pygame imported: {'pygame' in sys.modules}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+import argparse
+import time
+import tracemalloc
+from array import array
+
+from maze_generators import GENERATORS
+from maze_grid import parse_size
+from maze_pathfinding import astar_indices
+from maze_stream import EndlessRun
+
+DEFAULT_CELLS = 1_000_000
+SAMPLES = 10  # memory readings over the run
+
+def chunk_route(run: EndlessRun, cx: int) -> array:
+    # Direction numbers from the doorway into chunk cx to the one out of it (the
+    # entrance for chunk 0), plus the step through the doorway east
+    stream = run.stream
+    w = stream.chunk_width
+    grid = stream.chunk(cx)
+    previous = stream.door_row(cx - 1) * w
+    route = array("B")
+    for index in astar_indices(grid, previous, stream.door_row(cx) * w + w - 1):
+        route.append({-w: 0, 1: 1, w: 2, -1: 3}[index - previous])
+        previous = index
+    route.append(1)
+    return route
+
+def stress(cells: int, width: int, height: int, algorithm: str, seed: int) -> None:
+    # A runner follows the way east for `cells` moves through the game logic, while
+    # tracemalloc samples the memory held by Python objects as chunks are made and
+    # evicted
+    run = EndlessRun(height, width, seed, algorithm)
+    print(f"{'cells':>10} {'columns':>9} {'chunks made':>12} {'kept':>5} {'memory KiB':>11} {'peak KiB':>9}")
+    tracemalloc.start()
+    start = time.perf_counter()
+    next_sample = 0
+    cx = 0
+    while run.moves < cells:
+        for d in chunk_route(run, cx):
+            run.move(d)
+        cx += 1
+        if run.moves >= next_sample:
+            current, peak = tracemalloc.get_traced_memory()
+            print(f"{run.moves:10,} {run.furthest:9,} {run.stream.generated:12,} {len(run.stream.chunks):5} "
+                  f"{current / 1024:11.1f} {peak / 1024:9.1f}")
+            next_sample += cells // SAMPLES
+    elapsed = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{run.moves:,} cells through {run.stream.generated:,} chunks in {elapsed:.1f}s under tracemalloc "
+          f"({1000 * elapsed / run.stream.generated:.2f} ms per chunk), {current / 1024:.1f} KiB held at the end")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Streaming maze: memory while running east through generated chunks")
+    parser.add_argument("--cells", type=int, default=DEFAULT_CELLS, help="cells to travel")
+    parser.add_argument("--size", type=parse_size, default="20x15", help="chunk size as WIDTHxHEIGHT")
+    parser.add_argument("--algorithm", choices=list(GENERATORS), default="dfs")
+    parser.add_argument("--seed", type=int, default=1976)
+    args = parser.parse_args()
+
+    width, height = args.size
+    stress(args.cells, width, height, args.algorithm, args.seed)
+
+if __name__ == "__main__":
+    main()
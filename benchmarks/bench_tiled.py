@@ -0,0 +1,48 @@
+import argparse
+import os
+import random
+import time
+
+from maze_generators import GENERATORS, get_generator
+from maze_grid import MazeGrid, parse_size
+from maze_tiled import TILE_SIZE, check_perfect, generate_tiled
+
+DEFAULT_SIZE = "4096x4096"
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Tiled maze generation: scaling across worker processes")
+    parser.add_argument("size", nargs="?", type=parse_size, default=DEFAULT_SIZE, help="maze size as WIDTHxHEIGHT")
+    parser.add_argument("--workers", type=int, nargs="+", metavar="N",
+                        help="worker counts to time (default: 1, 2, 4, ... up to the core count)")
+    parser.add_argument("--tile", type=int, default=TILE_SIZE, metavar="CELLS", help="tile side in cells")
+    parser.add_argument("--algorithm", choices=list(GENERATORS), default="dfs")
+    parser.add_argument("--seed", type=int, default=1976)
+    args = parser.parse_args()
+
+    width, height = args.size
+    cores = os.cpu_count() or 1
+    workers = args.workers or [1 << i for i in range(cores.bit_length()) if 1 << i <= cores]
+    if cores not in workers and not args.workers:
+        workers.append(cores)
+
+    # One generator run over the whole grid, as generate_maze does it
+    start = time.perf_counter()
+    get_generator(args.algorithm)(MazeGrid(width, height), random.Random(args.seed))
+    single = time.perf_counter() - start
+    print(f"{width}x{height} {args.algorithm} maze, {args.tile}-cell tiles, {cores} cores; "
+          f"one generator run: {single:.2f}s")
+    print(f"{'workers':>8} {'carve s':>8} {'speedup':>8} {'efficiency':>11} {'check s':>8} {'perfect':>8}")
+    baseline = None
+    for count in workers:
+        start = time.perf_counter()
+        with generate_tiled(width, height, args.seed, args.tile, count, args.algorithm) as shared:
+            carve = time.perf_counter() - start
+            start = time.perf_counter()
+            check = check_perfect(shared, args.tile, count)
+            checked = time.perf_counter() - start
+        baseline = baseline or carve
+        print(f"{count:8} {carve:8.2f} {baseline / carve:7.2f}x {baseline / carve / count:10.0%} {checked:8.2f} "
+              f"{str(check.perfect):>8}")
+
+if __name__ == "__main__":
+    main()
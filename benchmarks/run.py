@@ -0,0 +1,200 @@
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+# Rendering benchmarks draw offscreen; must be set before pygame creates the display
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from benchmarks import bench_simulation
+from maze_format import load_maze, save_round
+from maze_generators import GENERATORS
+from maze_grid import MazeGrid, np
+from maze_simulation import MazeSimulation
+
+# The benchmark suite: every case is timed `repeat` times and reported as the best and
+# median wall time for a fixed amount of work, so runs are comparable across commits
+GENERATION_SIZES = [(20, 15), (200, 200), (1000, 1000)]
+PATHFINDING_SIZES = [(20, 15), (200, 200), (1000, 1000)]
+DRAW_SIZES = [(20, 15), (200, 200)]
+AI_STEPS = 10_000
+DRAW_FRAMES = 300
+REGRESSION_THRESHOLD = 0.10
+
+def timed(func, repeat: int) -> list[float]:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return times
+
+def suite_generation(seed: int, repeat: int) -> dict:
+    # Seeded DFS at several sizes, and every registered algorithm at the middle size
+    results = {}
+    cases = [("dfs", size) for size in GENERATION_SIZES]
+    cases += [(name, GENERATION_SIZES[1]) for name in GENERATORS if name != "dfs"]
+    for name, (width, height) in cases:
+        carve = GENERATORS[name]
+        times = timed(lambda: carve(MazeGrid(width, height), random.Random(seed)), repeat)
+        results[f"generate/{name}/{width}x{height}"] = (times, width * height, "cells")
+    return results
+
+def suite_astar(seed: int, repeat: int) -> dict:
+    # A* between the entrances setup_game picked, on seeded mazes
+    results = {}
+    for width, height in PATHFINDING_SIZES:
+        sim = MazeSimulation(width, height)
+        sim.start_round(two_player_mode=False, warmup=False, seed=seed)
+        path = []
+        def search():
+            path[:] = sim.find_path(sim.player1_start, sim.player1_target)
+        times = timed(search, repeat)
+        results[f"astar/{width}x{height}"] = (times, len(path), "path cells")
+    return results
+
+def suite_ai_steps(seed: int, repeat: int) -> dict:
+    # AI_STEPS calls of move_ai on a 100x100 maze, starting a new seeded round whenever
+    # the AI reaches the exit
+    sim = MazeSimulation(100, 100)
+    def steps():
+        round_seed = seed
+        sim.start_round(two_player_mode=False, warmup=False, seed=round_seed)
+        for _ in range(AI_STEPS):
+            sim.move_ai()
+            if sim.player2_finished:
+                round_seed += 1
+                sim.start_round(two_player_mode=False, warmup=False, seed=round_seed)
+    results = {"ai/move_ai/100x100": (timed(steps, repeat), AI_STEPS, "steps")}
+
+    # Whole headless rounds through step(), player 1 following its distance field
+    sim = MazeSimulation(20, 15, seed=seed)
+    def rounds():
+        sim.seed_source.seed(seed)
+        for _ in range(200):
+            bench_simulation.play_round(sim, 100_000)
+    results["simulation/rounds/20x15"] = (timed(rounds, repeat), 200, "rounds")
+    return results
+
+def suite_maze_format(seed: int, repeat: int) -> dict:
+    sim = MazeSimulation(1000, 1000)
+    sim.start_round(two_player_mode=False, warmup=False, seed=seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.amz")
+        results = {"format/save/1000x1000": (timed(lambda: save_round(path, sim), repeat), len(sim.maze), "cells")}
+        def load():
+            with load_maze(path) as maze:
+                maze.to_grid()
+        results["format/load/1000x1000"] = (timed(load, repeat), len(sim.maze), "cells")
+    return results
+
+def suite_draw(seed: int, repeat: int) -> dict:
+    # draw_game under the SDL dummy video driver, walking player 1 along its path
+    from benchmarks import bench_rendering
+    from amazing_maze import AmazingMaze
+
+    game = AmazingMaze(seed=seed)
+    game.prefetcher.close()
+    game.prefetcher.take = lambda: (None, None)  # generate synchronously, the prefetcher is closed
+    results = {}
+    for width, height in DRAW_SIZES:
+        times = []
+        for _ in range(repeat):
+            frame_times, _ = bench_rendering.bench_size(game, width, height, seed, DRAW_FRAMES, False)
+            times.append(sum(frame_times))
+        results[f"draw/{width}x{height}"] = (times, DRAW_FRAMES, "frames")
+    return results
+
+SUITES = {
+    "generation": suite_generation,
+    "astar": suite_astar,
+    "ai": suite_ai_steps,
+    "format": suite_maze_format,
+    "draw": suite_draw,
+}
+
+def run_suites(names: list[str], seed: int, repeat: int) -> dict:
+    results = {}
+    for name in names:
+        for case, (times, work, unit) in SUITES[name](seed, repeat).items():
+            best = min(times)
+            results[case] = {
+                "best_s": best, "median_s": statistics.median(times), "repeat": len(times),
+                "work": work, "unit": unit, "rate": work / best if best else 0.0,
+            }
+            print(f"{case:<32} {1000 * best:11.3f} ms {work / best:16,.0f} {unit}/s", file=sys.stderr)
+    return results
+
+def environment() -> dict:
+    try:
+        import pygame
+        pygame_version = pygame.version.ver
+    except ImportError:
+        pygame_version = None
+    return {
+        "python": platform.python_version(), "implementation": platform.python_implementation(),
+        "platform": platform.platform(), "machine": platform.machine(), "cpus": os.cpu_count(),
+        "numpy": np.__version__ if np is not None else None, "pygame": pygame_version,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+def compare(results: dict, baseline: dict, threshold: float) -> int:
+    # Best times against the baseline's; returns the number of regressions
+    regressions = 0
+    print(f"\n{'case':<32} {'baseline ms':>12} {'current ms':>12} {'change':>8}")
+    for case, result in results.items():
+        old = baseline["results"].get(case)
+        if old is None:
+            print(f"{case:<32} {'-':>12} {1000 * result['best_s']:12.3f} {'new':>8}")
+            continue
+        change = result["best_s"] / old["best_s"] - 1
+        flag = ""
+        if change > threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        elif change < -threshold:
+            flag = "  faster"
+        print(f"{case:<32} {1000 * old['best_s']:12.3f} {1000 * result['best_s']:12.3f} {change:+8.1%}{flag}")
+    missing = [case for case in baseline["results"] if case not in results]
+    if missing:
+        print(f"not run this time: {', '.join(missing)}")
+    return regressions
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the benchmark suite, save JSON results, compare with a baseline")
+    parser.add_argument("suites", nargs="*", default=list(SUITES),
+                        help=f"suites to run: {', '.join(SUITES)} (default: all)")
+    parser.add_argument("--seed", type=int, default=1976)
+    parser.add_argument("--repeat", type=int, default=5, help="runs per case; best and median are reported")
+    parser.add_argument("--output", metavar="PATH", help="write the results as JSON")
+    parser.add_argument("--compare", metavar="BASELINE", help="flag cases slower than a saved results file")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD,
+                        help="slowdown counted as a regression (default 0.10 = 10%%)")
+    args = parser.parse_args()
+
+    unknown = [name for name in args.suites if name not in SUITES]
+    if unknown:
+        parser.error(f"unknown suites: {', '.join(unknown)}")
+
+    results = run_suites(args.suites, args.seed, args.repeat)
+    report = {"environment": environment(), "seed": args.seed, "results": results}
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}", file=sys.stderr)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            sys.exit(f"{regressions} regression(s) over {args.threshold:.0%}")
+
+if __name__ == "__main__":
+    main()
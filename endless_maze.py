@@ -0,0 +1,206 @@
+import argparse
+import random
+import time
+
+import pygame
+
+import maze_raster
+from amazing_maze import (BLACK, CYAN, DRAWING_SCALE, FRAME_RATE, GAME_FONT, MAX_CATCH_UP_TICKS, MAZE_COLOR, MINT,
+                          PLAYER1_KEYS, SCREEN_HEIGHT, SCREEN_WIDTH, VIEWPORT, WHITE, WORLD_MARGIN, FontCache,
+                          FrameTimer, TextCache)
+from maze_camera import Camera, ChunkCache
+from maze_generators import GENERATORS
+from maze_grid import CellPath, np, parse_size
+from maze_simulation import KEY_COOLDOWN, TICK_SECONDS, WARMUP_TIME, GameState
+from maze_stream import STREAM_CACHE_CHUNKS, EndlessRun
+
+PATH_WIDTH = 3  # as in the regular game: cells are 3 drawing units wide, walls 1
+CELL_SIZE = PATH_WIDTH * DRAWING_SCALE
+CELL_PITCH = CELL_SIZE + DRAWING_SCALE
+COLLAPSE_COLOR = (90, 20, 20)
+LOOK_AHEAD = VIEWPORT.width // 6  # the camera runs this far ahead of the player
+
+class EndlessMaze:
+    def __init__(self, seed: int | None = None, frame_rate: int = FRAME_RATE, chunk_width: int = 20,
+                 maze_height: int = 15, algorithm: str = "dfs", font_path: str | None = None) -> None:
+        # Endless-runner front end: the camera follows player 1 east through a
+        # StreamingMaze, and each maze chunk is drawn once onto a surface kept in an LRU
+        # as small as the maze's own, so neither grows with the distance travelled
+        pygame.display.init()
+        pygame.font.init()
+        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        pygame.display.set_caption("Amazing Maze Remake: Endless")
+        self.frame_rate = frame_rate
+        self.fonts = FontCache(GAME_FONT, font_path)
+        self.text_cache = TextCache()
+        self.frame_timer = FrameTimer()
+        self.show_frame_time = False
+
+        self.seed_source = random.Random(seed)
+        self.chunk_width = chunk_width
+        self.maze_height = maze_height
+        self.algorithm = algorithm
+        self.run_state = self.new_run()
+        self.tick_accumulator = 0.0
+
+        self.camera = Camera(VIEWPORT)
+        self.world_height = maze_height * CELL_PITCH + 2 * WORLD_MARGIN
+
+    def new_run(self) -> EndlessRun:
+        run = EndlessRun(self.maze_height, self.chunk_width, self.seed_source.getrandbits(64), self.algorithm)
+        self.motion = (run.pos, run.pos, 0)  # sprite glide, as in the regular game
+        self.chunks = ChunkCache(self.render_chunk, STREAM_CACHE_CHUNKS)
+        print(f"Run start: {self.chunk_width}-column {self.algorithm} chunks, seed {run.seed}")
+        return run
+
+    def render_chunk(self, cx: int, cy: int) -> pygame.Surface:
+        # Chunk cx of the stream from the top of the world to its bottom; chunk -1 is
+        # the margin west of the maze, holding the outer wall and the entrance
+        chunk_px = self.chunk_width * CELL_PITCH
+        surface = pygame.Surface((chunk_px, self.world_height)).convert()
+        surface.fill(BLACK)
+        background = pygame.Rect(0, WORLD_MARGIN - 2 * PATH_WIDTH, chunk_px,
+                                 self.maze_height * CELL_PITCH + PATH_WIDTH)
+        stream = self.run_state.stream
+        if cx < 0:
+            if cx == -1:
+                surface.fill(MAZE_COLOR, background.move(chunk_px - 2 * PATH_WIDTH, 0))
+                surface.fill(BLACK, (chunk_px - 2 * PATH_WIDTH, WORLD_MARGIN + stream.door_row(-1) * CELL_PITCH,
+                                     2 * PATH_WIDTH, CELL_SIZE))
+            return surface
+
+        surface.fill(MAZE_COLOR, background)
+        grid = stream.chunk(cx)
+        if np is not None:
+            image = maze_raster.render(grid, cell_px=CELL_SIZE, wall_px=DRAWING_SCALE, colors=(MAZE_COLOR, BLACK))
+            area = image.get_rect(top=WORLD_MARGIN).clip(background)
+            surface.blit(image, area, area.move(0, -WORLD_MARGIN))
+            return surface
+
+        for index in range(len(grid)):
+            cell = grid[index]
+            x = index % self.chunk_width * CELL_PITCH
+            y = WORLD_MARGIN + index // self.chunk_width * CELL_PITCH
+            surface.fill(BLACK, (x, y, CELL_SIZE, CELL_SIZE))
+            if cell & CellPath.SOUTH.value:
+                surface.fill(BLACK, (x, y + CELL_SIZE, CELL_SIZE, DRAWING_SCALE))
+            if cell & CellPath.EAST.value:
+                surface.fill(BLACK, (x + CELL_SIZE, y, DRAWING_SCALE, CELL_SIZE))
+        return surface
+
+    def update(self, dt: float) -> bool:
+        run = self.run_state
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                return False
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_ESCAPE:
+                    return False
+                elif event.key == pygame.K_F3:
+                    self.show_frame_time = not self.show_frame_time
+                elif event.key == pygame.K_RETURN and run.game_state == GameState.RESULT:
+                    run = self.run_state = self.new_run()
+                    self.tick_accumulator = 0.0
+
+        keys = pygame.key.get_pressed()
+        moves = [move for key, move in PLAYER1_KEYS if keys[key]]
+        self.tick_accumulator += dt
+        ticks = 0
+        while self.tick_accumulator >= TICK_SECONDS and run.game_state in (GameState.WARMUP, GameState.PLAYING):
+            if ticks == MAX_CATCH_UP_TICKS:
+                self.tick_accumulator = 0.0
+                break
+            run.step(moves, TICK_SECONDS)
+            if run.pos != self.motion[1]:
+                self.motion = (self.motion[1], run.pos, run.ticks)
+            self.tick_accumulator -= TICK_SECONDS
+            ticks += 1
+
+        self.draw(self.tick_accumulator / TICK_SECONDS)
+        return True
+
+    def draw(self, alpha: float) -> None:
+        # The whole screen every frame: the view scrolls nearly all the time
+        run = self.run_state
+        start, end, tick = self.motion
+        t = min(1.0, (run.ticks - tick + alpha) * TICK_SECONDS / KEY_COOLDOWN)
+        x, y = start.x + (end.x - start.x) * t, start.y + (end.y - start.y) * t
+        self.camera.follow(WORLD_MARGIN + (x + 0.5) * CELL_PITCH + LOOK_AHEAD, WORLD_MARGIN + (y + 0.5) * CELL_PITCH,
+                           1 << 40, self.world_height)
+        offset_x, offset_y = self.camera.offset()
+
+        self.screen.fill(BLACK)
+        self.screen.set_clip(VIEWPORT)
+        chunk_px = self.chunk_width * CELL_PITCH
+        first = (self.camera.x - WORLD_MARGIN) // chunk_px
+        last = (self.camera.x + VIEWPORT.width - 1 - WORLD_MARGIN) // chunk_px
+        for cx in range(max(first, -1), last + 1):
+            self.screen.blit(self.chunks.get(cx, 0), (offset_x + WORLD_MARGIN + cx * chunk_px, offset_y))
+
+        collapse_x = offset_x + WORLD_MARGIN + round(run.collapse * CELL_PITCH)
+        if collapse_x > VIEWPORT.left:
+            self.screen.fill(COLLAPSE_COLOR, (VIEWPORT.left, VIEWPORT.top, collapse_x - VIEWPORT.left, VIEWPORT.height))
+
+        # Player 1, drawn like in the regular game
+        px = offset_x + WORLD_MARGIN + round((x * (PATH_WIDTH + 1) + PATH_WIDTH // 2) * DRAWING_SCALE)
+        py = offset_y + WORLD_MARGIN + round((y * (PATH_WIDTH + 1) + PATH_WIDTH // 2) * DRAWING_SCALE)
+        pygame.draw.circle(self.screen, CYAN, (px + PATH_WIDTH, py + PATH_WIDTH),
+                           (PATH_WIDTH // 2) * (DRAWING_SCALE + PATH_WIDTH))
+        self.screen.blit(self.text_cache.render(self.fonts.get(12), "P1", BLACK), (px - 5, py))
+        self.screen.set_clip(None)
+
+        self.draw_hud()
+        pygame.display.flip()
+
+    def draw_hud(self) -> None:
+        run = self.run_state
+        small, medium = self.fonts.get(24), self.fonts.get(36)
+        self.text_cache.blit_glyphs(self.screen, small, f"TIME: {run.game_timer:.1f}s", WHITE, (30, 10))
+        self.text_cache.blit_glyphs(self.screen, small, f"Player 1: {run.furthest} columns east", CYAN, (75, 550))
+        if run.game_state == GameState.WARMUP:
+            countdown = max(0, int(WARMUP_TIME) - int(run.warmup_timer))
+            self.screen.blit(self.text_cache.render(medium, f"GET READY! {countdown}", MINT), (SCREEN_WIDTH - 300, 10))
+        elif run.game_state == GameState.PLAYING:
+            self.screen.blit(self.text_cache.render(small, "Run east!", WHITE), (SCREEN_WIDTH - 275, 10))
+        else:
+            pygame.draw.rect(self.screen, BLACK, (200, 250, 440, 150))
+            self.screen.blit(self.text_cache.render(medium, "THE MAZE CAUGHT YOU!", CYAN), (210, 270))
+            self.text_cache.blit_glyphs(self.screen, small, f"DISTANCE: {run.furthest} columns", WHITE, (230, 330))
+            self.screen.blit(self.text_cache.render(small, "PRESS ENTER TO RUN AGAIN", WHITE), (230, 370))
+
+        if self.show_frame_time:
+            stream = run.stream
+            text = (f"CPU {self.frame_timer.average_ms:.2f} ms/frame  chunks {len(stream.chunks)} kept, "
+                    f"{stream.generated} made")
+            self.text_cache.blit_glyphs(self.screen, self.fonts.get(12), text, WHITE,
+                                        (SCREEN_WIDTH - 330, SCREEN_HEIGHT - 20))
+
+    def run(self) -> None:
+        running = True
+        frame_time = 1.0 / self.frame_rate if self.frame_rate > 0 else 0.0
+        last_time = next_frame = time.perf_counter()
+        while running:
+            frame_start = time.perf_counter()
+            dt = frame_start - last_time
+            last_time = frame_start
+            running = self.update(dt)
+            self.frame_timer.record(time.perf_counter() - frame_start)
+            if frame_time:
+                next_frame = max(next_frame + frame_time, frame_start)
+                delay = next_frame - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+        pygame.quit()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Amazing Maze Remake: endless run east through a streamed maze")
+    parser.add_argument("--seed", type=int, help="seed for reproducible runs")
+    parser.add_argument("--fps", type=int, default=FRAME_RATE, help="frame rate cap, 0 for uncapped")
+    parser.add_argument("--algorithm", choices=list(GENERATORS), default="dfs", help="maze generation algorithm")
+    parser.add_argument("--size", type=parse_size, default="20x15",
+                        help="chunk size as WIDTHxHEIGHT: columns per generated chunk and the maze's height")
+    parser.add_argument("--font", metavar="PATH",
+                        help="draw text with this TTF file instead of looking up the Consolas system font")
+    args = parser.parse_args()
+    width, height = args.size
+    EndlessMaze(args.seed, args.fps, width, height, args.algorithm, args.font).run()
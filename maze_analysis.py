@@ -0,0 +1,206 @@
+from array import array
+from collections.abc import Iterable, Iterator
+
+from maze_grid import EAST, WEST, MazeGrid
+
+# Passage bits of a cell, their count, and the direction number of a single passage bit
+_PASSAGES = bytes(mask & 15 for mask in range(256))
+_DEGREE = bytes(bin(mask & 15).count("1") for mask in range(256))
+_BIT_DIRECTION = {1: 0, 2: 1, 4: 2, 8: 3}
+_OPPOSITE_MASK = (4, 8, 1, 2)  # passage back to where a step in direction d came from
+
+class JunctionGraph:
+    def __init__(self, grid: MazeGrid | None = None, terminals: Iterable[int] = ()) -> None:
+        # Index of a perfect maze with its corridors collapsed: every cell without
+        # exactly two passages (dead ends, junctions), plus the terminal cells (e.g.
+        # entrance candidates), is a node, and every corridor between two nodes is an
+        # edge with its length in moves. Everything lives in flat arrays:
+        #   node_cells[n]  cell of node n;   node_of[cell]  its node, or -1 in a corridor
+        #   degrees[n]     passages at node n
+        #   edges of n     edge_targets/edge_lengths[edge_offsets[n]:edge_offsets[n + 1]]
+        #   dead_ends      nodes with a single passage
+        # The openings to the outside at the entrances do not count as passages.
+        # Without a grid the graph starts empty, for build() to fill in.
+        self.width = self.height = 0
+        self.node_of = array("i")
+        self.node_cells = array("I")
+        self.degrees = array("B")
+        self.dead_ends = array("I")
+        self.edge_offsets = array("I", [0])
+        self.edge_targets = array("I")
+        self.edge_lengths = array("I")
+        self.parent = array("i")
+        self.depth = array("I")
+        self.moves = array("I")
+        self.junctions = array("I")
+        if grid is not None:
+            for _ in self.build(grid, terminals):
+                pass
+
+    def build(self, grid: MazeGrid, terminals: Iterable[int] = (), batch: int = 0) -> Iterator[None]:
+        # The constructor's work as a resumable generator (see iter_junction_graph): with
+        # a batch, it yields after about that many cells scanned, walked or rooted
+        w, h = grid.width, grid.height
+        total = w * h
+        passages = bytearray(bytes(grid.cells).translate(_PASSAGES))
+        for y in range(h):
+            passages[y * w] &= ~WEST
+            passages[y * w + w - 1] &= ~EAST
+        degrees = passages.translate(_DEGREE)
+
+        node_of = array("i", [-1]) * total
+        node_cells = array("I")
+        node_degrees = array("B")
+        dead_ends = array("I")
+        step = batch or total
+        for start in range(0, total, step):
+            found = array("I", (i for i in range(start, min(start + step, total)) if degrees[i] != 2))
+            first = len(node_cells)
+            for n, cell in enumerate(found, first):
+                node_of[cell] = n
+            node_cells.extend(found)
+            node_degrees.extend(degrees[cell] for cell in found)
+            dead_ends.extend(n for n in range(first, len(node_cells)) if node_degrees[n] == 1)
+            if batch:
+                yield
+        # Terminals in corridors (two passages) become nodes too
+        for cell in sorted({cell for cell in terminals if degrees[cell] == 2}):
+            node_of[cell] = len(node_cells)
+            node_cells.append(cell)
+            node_degrees.append(2)
+        self.width = w
+        self.height = h
+        self.node_of = node_of
+        self.node_cells = node_cells
+        self.degrees = node_degrees
+        self.dead_ends = dead_ends
+
+        # Walk every corridor from both of its ends
+        steps = grid.neighbour_offsets()
+        edge_offsets = array("I", [0])
+        edge_targets = array("I")
+        edge_lengths = array("I")
+        walked = 0
+        for cell in node_cells:
+            mask = passages[cell]
+            for d in range(4):
+                if not mask & (1 << d):
+                    continue
+                current = cell + steps[d]
+                back = _OPPOSITE_MASK[d]
+                length = 1
+                while node_of[current] < 0:
+                    out = _BIT_DIRECTION[passages[current] & ~back]
+                    current += steps[out]
+                    back = _OPPOSITE_MASK[out]
+                    length += 1
+                edge_targets.append(node_of[current])
+                edge_lengths.append(length)
+                walked += length
+            edge_offsets.append(len(edge_targets))
+            if batch and walked >= batch:
+                walked = 0
+                yield
+        self.edge_offsets = edge_offsets
+        self.edge_targets = edge_targets
+        self.edge_lengths = edge_lengths
+        yield from self.build_tree(batch)
+
+    def build_tree(self, batch: int = 0) -> Iterator[None]:
+        # Root the (tree-shaped) graph at node 0: parent, moves from the root and
+        # junctions passed from the root make any path a walk up to the common ancestor
+        count = len(self.node_cells)
+        parent = array("i", [-1]) * count
+        depth = array("I", [0]) * count
+        moves = array("I", [0]) * count
+        junctions = array("I", [0]) * count
+        seen = bytearray(count)
+        offsets, targets, lengths, degrees = self.edge_offsets, self.edge_targets, self.edge_lengths, self.degrees
+        rooted = 0
+        for root in range(count):
+            if seen[root]:
+                continue  # another component (only when the maze is not connected)
+            seen[root] = 1
+            junctions[root] = degrees[root] >= 3
+            stack = [root]
+            while stack:
+                node = stack.pop()
+                for e in range(offsets[node], offsets[node + 1]):
+                    child = targets[e]
+                    if not seen[child]:
+                        seen[child] = 1
+                        parent[child] = node
+                        depth[child] = depth[node] + 1
+                        moves[child] = moves[node] + lengths[e]
+                        junctions[child] = junctions[node] + (degrees[child] >= 3)
+                        stack.append(child)
+                rooted += 1
+                if batch and rooted >= batch:
+                    rooted = 0
+                    yield
+        self.parent = parent
+        self.depth = depth
+        self.moves = moves
+        self.junctions = junctions
+
+    def common_ancestor(self, a: int, b: int) -> int:
+        parent, depth = self.parent, self.depth
+        while depth[a] > depth[b]:
+            a = parent[a]
+        while depth[b] > depth[a]:
+            b = parent[b]
+        while a != b:
+            a, b = parent[a], parent[b]
+        return a
+
+    def node(self, cell: int) -> int:
+        # Node ID of a cell, raising for corridor cells (pass them as terminals)
+        n = self.node_of[cell]
+        if n < 0:
+            raise ValueError(f"cell {cell} is not a node of the junction graph")
+        return n
+
+    def solution_length(self, start: int, target: int) -> int:
+        # Moves from cell start to cell target
+        a, b = self.node(start), self.node(target)
+        return self.moves[a] + self.moves[b] - 2 * self.moves[self.common_ancestor(a, b)]
+
+    def decisions(self, start: int, target: int) -> int:
+        # Junctions passed between start and target, where a wrong turn can be taken
+        a, b = self.node(start), self.node(target)
+        lca = self.common_ancestor(a, b)
+        degrees = self.degrees
+        count = self.junctions[a] + self.junctions[b] - 2 * self.junctions[lca] + (degrees[lca] >= 3)
+        if a != b:
+            count -= (degrees[a] >= 3) + (degrees[b] >= 3)
+        return count
+
+    def difficulty(self, start: int, target: int) -> float:
+        # Decisions on the solution times its tortuosity (solution length over the
+        # straight-line Manhattan distance): 0 when the way through has no junction,
+        # growing with both the choices to make and how far the path wanders
+        w = self.width
+        manhattan = abs(start % w - target % w) + abs(start // w - target // w)
+        return self.decisions(start, target) * self.solution_length(start, target) / max(manhattan, 1)
+
+    @property
+    def dead_end_count(self) -> int:
+        return len(self.dead_ends)
+
+    @property
+    def branching_factor(self) -> float:
+        # Mean passages per junction
+        junctions = [degree for degree in self.degrees if degree >= 3]
+        return sum(junctions) / len(junctions) if junctions else 0.0
+
+    @property
+    def longest_corridor(self) -> int:
+        return max(self.edge_lengths, default=0)
+
+def iter_junction_graph(grid: MazeGrid, terminals: Iterable[int] = (), batch: int = 4096) -> Iterator[JunctionGraph]:
+    # JunctionGraph as a resumable generator, like iter_distance_field: yields the
+    # unfinished graph after every `batch` cells of work, and the finished graph last
+    graph = JunctionGraph()
+    for _ in graph.build(grid, terminals, batch):
+        yield graph
+    yield graph
@@ -0,0 +1,69 @@
+from collections import OrderedDict
+from collections.abc import Callable, Iterator
+
+import pygame
+
+class ChunkCache:
+    def __init__(self, render: Callable[[int, int], pygame.Surface], max_size: int = 32) -> None:
+        # Least-recently-used pre-rendered chunk surfaces keyed by chunk coordinates;
+        # render(cx, cy) draws a chunk that is not cached
+        self.render = render
+        self.surfaces: OrderedDict[tuple[int, int], pygame.Surface] = OrderedDict()
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, cx: int, cy: int) -> pygame.Surface:
+        key = (cx, cy)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = self.render(cx, cy)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_size:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def clear(self) -> None:
+        self.surfaces.clear()
+
+class Camera:
+    def __init__(self, viewport: pygame.Rect) -> None:
+        # A screen rectangle showing the world (maze pixel) area whose top-left is (x, y)
+        self.viewport = viewport
+        self.x = 0
+        self.y = 0
+
+    def follow(self, world_x: float, world_y: float, world_width: int, world_height: int) -> None:
+        # Center on a world point, without scrolling past the world's edges; a world
+        # smaller than the viewport is centered instead
+        w, h = self.viewport.size
+        if world_width <= w:
+            self.x = (world_width - w) // 2
+        else:
+            self.x = min(max(round(world_x - w / 2), 0), world_width - w)
+        if world_height <= h:
+            self.y = (world_height - h) // 2
+        else:
+            self.y = min(max(round(world_y - h / 2), 0), world_height - h)
+
+    def offset(self) -> tuple[int, int]:
+        # Add to world coordinates to get screen coordinates
+        return self.viewport.x - self.x, self.viewport.y - self.y
+
+    def visible_chunks(self, chunk_size: int, world_width: int,
+                       world_height: int) -> Iterator[tuple[int, int, tuple[int, int]]]:
+        # (cx, cy, screen position) of every chunk overlapping the viewport; at most
+        # (viewport / chunk + 1) per axis however large the world is
+        w, h = self.viewport.size
+        x0, y0 = max(self.x, 0), max(self.y, 0)
+        x1 = min(self.x + w, world_width)
+        y1 = min(self.y + h, world_height)
+        ox, oy = self.offset()
+        for cy in range(y0 // chunk_size, (y1 - 1) // chunk_size + 1):
+            for cx in range(x0 // chunk_size, (x1 - 1) // chunk_size + 1):
+                yield cx, cy, (ox + cx * chunk_size, oy + cy * chunk_size)
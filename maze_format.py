@@ -0,0 +1,206 @@
+import argparse
+import mmap
+import random
+import struct
+from array import array
+
+from maze_generators import GENERATORS, eller_rows
+from maze_grid import EAST, MazeGrid, VISITED, WEST, np, parse_size
+from maze_simulation import MazeSimulation, PreparedMaze
+
+# File layout: a fixed header followed by the wall bits (CellPath N/E/S/W) packed two
+# cells per byte, even x in the low nibble. Every row starts on a byte boundary, so a
+# row (or a band of rows) can be read straight out of the memory map.
+MAZE_MAGIC = b"AMZF"
+MAZE_VERSION = 1
+_HEADER = struct.Struct("<4sB3xIIIIQ")  # magic, version, width, height, left/right entrance rows, seed
+HEADER_SIZE = _HEADER.size
+
+_WALL_BITS = bytes(b & 15 for b in range(256))
+_LOW_NIBBLE = bytes(b & 15 | VISITED for b in range(256))
+_HIGH_NIBBLE = bytes(b >> 4 | VISITED for b in range(256))
+
+def row_bytes(width: int) -> int:
+    return (width + 1) // 2
+
+def pack_cells(grid: MazeGrid) -> bytes:
+    w, h = grid.width, grid.height
+    if np is not None:
+        cells = grid.to_numpy() & 15
+        if w % 2:
+            cells = np.pad(cells, ((0, 0), (0, 1)))
+        return (cells[:, 0::2] | cells[:, 1::2] << 4).tobytes()
+
+    cells = grid.tobytes()
+    return b"".join(pack_row(cells[y * w:(y + 1) * w]) for y in range(h))
+
+def pack_row(row: bytes) -> bytes:
+    # One row of one-byte cells to its packed form
+    row = bytes(row).translate(_WALL_BITS)
+    width = len(row)
+    if width % 2:
+        row += b"\0"
+    # OR the odd cells, shifted up a nibble, into the even ones with one big-int operation
+    low = int.from_bytes(row[0::2], "little")
+    high = int.from_bytes(row[1::2], "little")
+    return (low | high << 4).to_bytes(row_bytes(width), "little")
+
+def unpack_rows(packed, width: int, rows: int) -> bytearray:
+    # Packed nibbles back to one byte per cell (with VISITED set, as after carving)
+    stride = row_bytes(width)
+    packed = bytes(packed)
+    out = bytearray(2 * stride * rows)
+    out[0::2] = packed.translate(_LOW_NIBBLE)
+    out[1::2] = packed.translate(_HIGH_NIBBLE)
+    if width % 2:
+        # Drop the padding nibble at the end of every row
+        out = bytearray().join(out[y * 2 * stride:y * 2 * stride + width] for y in range(rows))
+    return out
+
+def save_maze(path: str, grid: MazeGrid, left_entrance_y: int, right_entrance_y: int, seed: int = 0) -> None:
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(MAZE_MAGIC, MAZE_VERSION, grid.width, grid.height,
+                             left_entrance_y, right_entrance_y, seed))
+        f.write(pack_cells(grid))
+
+def stream_maze(path: str, width: int, height: int, seed: int) -> None:
+    # Eller's maze written row by row as it is generated, so memory stays O(width) for
+    # any height. The file is the same one save_round() writes for that seed after an
+    # "eller" round: entrances are drawn after carving, then patched into the header
+    # and the two edge cells.
+    rng = random.Random(seed)
+    stride = row_bytes(width)
+    with open(path, "w+b") as f:
+        f.write(_HEADER.pack(MAZE_MAGIC, MAZE_VERSION, width, height, 0, 0, seed))
+        for row in eller_rows(width, height, rng):
+            f.write(pack_row(row))
+
+        left_entrance_y = rng.randint(1, height - 2)
+        right_entrance_y = rng.randint(1, height - 2)
+        f.seek(0)
+        f.write(_HEADER.pack(MAZE_MAGIC, MAZE_VERSION, width, height, left_entrance_y, right_entrance_y, seed))
+        x = width - 1
+        for offset, bits in ((HEADER_SIZE + left_entrance_y * stride, WEST),
+                             (HEADER_SIZE + right_entrance_y * stride + x // 2, EAST << 4 if x % 2 else EAST)):
+            f.seek(offset)
+            byte = f.read(1)[0]
+            f.seek(offset)
+            f.write(bytes((byte | bits,)))
+
+class MappedMaze:
+    # A maze file opened through mmap: the header is parsed eagerly, cells are only
+    # read (and unpacked) for the rows that are asked for
+    def __init__(self, path: str) -> None:
+        self.file = open(path, "rb")
+        try:
+            self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self.file.close()
+            raise ValueError(f"{path} is empty") from None
+        try:
+            magic, version, width, height, left, right, seed = _HEADER.unpack_from(self.map)
+        except struct.error:
+            self.close()
+            raise ValueError(f"{path} is truncated") from None
+        if magic != MAZE_MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not an Amazing Maze file")
+        if version != MAZE_VERSION:
+            self.close()
+            raise ValueError(f"{path}: unsupported maze file version {version}")
+        self.width: int = width
+        self.height: int = height
+        self.left_entrance_y: int = left
+        self.right_entrance_y: int = right
+        self.seed: int = seed
+        self.stride = row_bytes(width)
+        if len(self.map) < HEADER_SIZE + self.stride * height:
+            self.close()
+            raise ValueError(f"{path} is truncated")
+        # Zero-copy view of the packed cell data
+        self.packed = memoryview(self.map)[HEADER_SIZE:HEADER_SIZE + self.stride * height]
+
+    def __enter__(self) -> "MappedMaze":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        # NumPy views from packed_array() must be dropped before closing
+        if getattr(self, "packed", None) is not None:
+            self.packed.release()
+            self.packed = None
+        self.map.close()
+        self.file.close()
+
+    def cell(self, x: int, y: int) -> int:
+        # Wall bits of one cell
+        byte = self.packed[y * self.stride + x // 2]
+        return byte >> 4 if x % 2 else byte & 15
+
+    def rows(self, y0: int, y1: int) -> bytearray:
+        # Cells of rows y0..y1-1, one byte per cell
+        return unpack_rows(self.packed[y0 * self.stride:y1 * self.stride], self.width, y1 - y0)
+
+    def packed_array(self):
+        # Zero-copy (height, row bytes) uint8 NumPy view of the packed nibbles
+        if np is None:
+            raise RuntimeError("NumPy is not installed")
+        return np.frombuffer(self.packed, dtype=np.uint8).reshape(self.height, self.stride)
+
+    def to_grid(self) -> MazeGrid:
+        return MazeGrid(self.width, self.height, array("B", self.rows(0, self.height)))
+
+    def prepared(self) -> PreparedMaze:
+        # The maze as a round for MazeSimulation.start_round(prepared=...)
+        return loaded_round(self.seed, self.width, self.height, bytes(self.rows(0, self.height)),
+                            self.left_entrance_y, self.right_entrance_y)
+
+def loaded_round(seed: int, width: int, height: int, cells: bytes,
+                 left_entrance_y: int, right_entrance_y: int) -> PreparedMaze:
+    # A round on a maze that was not carved here. The file may not have come from its
+    # seed at all (tiled, streamed or edited mazes), so the round rng starts fresh from
+    # the seed rather than where carving would have left it; such a round is only
+    # reproducible from its maze, which is why replays embed it (see maze_replay.py).
+    return PreparedMaze(seed, width, height, cells, left_entrance_y, right_entrance_y,
+                        random.Random(seed).getstate())
+
+def save_round(path: str, sim: MazeSimulation) -> None:
+    # The current round's maze, entrances and seed
+    save_maze(path, sim.maze, sim.player1_start.y, sim.player2_start.y, sim.seed)
+
+def load_maze(path: str) -> MappedMaze:
+    return MappedMaze(path)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Create or inspect Amazing Maze files")
+    commands = parser.add_subparsers(dest="command", required=True)
+    generate = commands.add_parser("generate", help="generate a maze and save it")
+    generate.add_argument("size", type=parse_size, help="maze size as WIDTHxHEIGHT")
+    generate.add_argument("path")
+    generate.add_argument("--seed", type=int)
+    generate.add_argument("--algorithm", choices=list(GENERATORS), default="dfs",
+                          help="maze generation algorithm (eller streams straight to disk)")
+    info = commands.add_parser("info", help="print a maze file's header")
+    info.add_argument("path")
+    args = parser.parse_args()
+
+    if args.command == "generate":
+        width, height = args.size
+        if args.algorithm == "eller":
+            seed = random.getrandbits(64) if args.seed is None else args.seed
+            stream_maze(args.path, width, height, seed)
+        else:
+            sim = MazeSimulation(width, height, algorithm=args.algorithm)
+            sim.start_round(two_player_mode=False, seed=args.seed)
+            save_round(args.path, sim)
+            seed = sim.seed
+        print(f"Saved {width}x{height} {args.algorithm} maze (seed {seed}) to {args.path}")
+    else:
+        with load_maze(args.path) as maze:
+            print(f"{args.path}: {maze.width}x{maze.height}, entrances at rows {maze.left_entrance_y} "
+                  f"(left) and {maze.right_entrance_y} (right), seed {maze.seed}")
+
+if __name__ == "__main__":
+    main()
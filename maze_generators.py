@@ -0,0 +1,165 @@
+import random
+from array import array
+from collections.abc import Callable, Iterator
+
+from maze_grid import EAST, NORTH, SOUTH, VISITED, WEST, MazeGrid, carve_dfs
+
+# Every generator carves a perfect maze into an empty grid and marks all cells VISITED.
+# They all take the grid and a random.Random and return the number of cells carved.
+
+def carve_kruskal(grid: MazeGrid, rng: random.Random | None = None) -> int:
+    # Randomised Kruskal: walls in random order, opened whenever they separate two
+    # trees of a union-find forest over flat cell indices
+    rng = random if rng is None else rng
+    w, h = grid.width, grid.height
+    cells = grid.cells
+    total = w * h
+
+    # Wall ids: 2 * cell for the wall east of the cell, 2 * cell + 1 for the one south of it
+    walls = array("I", (2 * c for c in range(total) if c % w < w - 1))
+    walls.extend(range(1, 2 * (total - w), 2))
+    rng.shuffle(walls)
+
+    parent = array("I", range(total)) if total else array("I")
+    joined = 0
+    for wall in walls:
+        a = wall >> 1
+        b = a + (w if wall & 1 else 1)
+
+        # Find both roots with path halving
+        while parent[a] != a:
+            parent[a] = parent[parent[a]]
+            a = parent[a]
+        while parent[b] != b:
+            parent[b] = parent[parent[b]]
+            b = parent[b]
+        if a == b:
+            continue
+        parent[b] = a
+
+        cell = wall >> 1
+        if wall & 1:
+            cells[cell] |= SOUTH
+            cells[cell + w] |= NORTH
+        else:
+            cells[cell] |= EAST
+            cells[cell + 1] |= WEST
+        joined += 1
+        if joined == total - 1:
+            break
+
+    for i in range(total):
+        cells[i] |= VISITED
+    return total
+
+def carve_wilson(grid: MazeGrid, rng: random.Random | None = None) -> int:
+    # Wilson's algorithm: loop-erased random walks from each cell outside the maze until
+    # they hit it; produces a uniformly random spanning tree
+    rng = random if rng is None else rng
+    w, h = grid.width, grid.height
+    cells = grid.cells
+    total = w * h
+    step = grid.neighbour_offsets()
+    bits = (NORTH, EAST, SOUTH, WEST)
+    opposite = (SOUTH, WEST, NORTH, EAST)
+    # Last direction taken out of each cell on the current walk; overwriting it on a
+    # revisit is what erases loops
+    walk_dir = bytearray(total)
+    randrange = rng.randrange
+
+    cells[randrange(total)] = VISITED
+    for start in range(total):
+        if cells[start] & VISITED:
+            continue
+
+        # Random walk until the maze is reached
+        current = start
+        while not cells[current] & VISITED:
+            x = current % w
+            while True:
+                d = randrange(4)
+                if ((d == 0 and current >= w) or (d == 1 and x < w - 1)
+                        or (d == 2 and current < total - w) or (d == 3 and x > 0)):
+                    break
+            walk_dir[current] = d
+            current += step[d]
+
+        # Add the loop-erased walk to the maze
+        current = start
+        while not cells[current] & VISITED:
+            d = walk_dir[current]
+            nxt = current + step[d]
+            cells[current] |= VISITED | bits[d]
+            cells[nxt] |= opposite[d]
+            current = nxt
+
+    return total
+
+def eller_rows(width: int, height: int, rng: random.Random | None = None) -> Iterator[bytearray]:
+    # Eller's algorithm, one finished row at a time: only the current row's set
+    # membership is kept, so arbitrarily tall mazes stream in O(width) memory
+    rng = random if rng is None else rng
+    sets = list(range(width))
+    members: dict[int, list[int]] = {i: [i] for i in range(width)}
+    next_set = width
+    row = bytearray([VISITED]) * width
+
+    for y in range(height):
+        last_row = y == height - 1
+
+        # Randomly join adjacent cells of different sets (all of them on the last row)
+        for x in range(width - 1):
+            a, b = sets[x], sets[x + 1]
+            if a != b and (last_row or rng.random() < 0.5):
+                row[x] |= EAST
+                row[x + 1] |= WEST
+                # Relabel the smaller set, so each cell is relabelled O(log width) times
+                if len(members[a]) < len(members[b]):
+                    a, b = b, a
+                for c in members[b]:
+                    sets[c] = a
+                members[a] += members.pop(b)
+
+        if last_row:
+            yield row
+            return
+
+        # Every set continues downwards through at least one cell
+        next_row = bytearray([VISITED]) * width
+        next_members: dict[int, list[int]] = {}
+        for set_id, cols in members.items():
+            down = [c for c in cols if rng.random() < 0.5] or [rng.choice(cols)]
+            for c in down:
+                row[c] |= SOUTH
+                next_row[c] |= NORTH
+            next_members[set_id] = down
+
+        # Cells without a passage from above start new sets
+        for c in range(width):
+            if not next_row[c] & NORTH:
+                sets[c] = next_set
+                next_members[next_set] = [c]
+                next_set += 1
+
+        yield row
+        row = next_row
+        members = next_members
+
+def carve_eller(grid: MazeGrid, rng: random.Random | None = None) -> int:
+    w = grid.width
+    for y, row in enumerate(eller_rows(w, grid.height, rng)):
+        grid.cells[y * w:(y + 1) * w] = array("B", row)
+    return w * grid.height
+
+GENERATORS: dict[str, Callable[[MazeGrid, random.Random | None], int]] = {
+    "dfs": carve_dfs,
+    "kruskal": carve_kruskal,
+    "wilson": carve_wilson,
+    "eller": carve_eller,
+}
+
+def get_generator(name: str) -> Callable[[MazeGrid, random.Random | None], int]:
+    try:
+        return GENERATORS[name]
+    except KeyError:
+        raise ValueError(f"Unknown maze algorithm {name!r}, expected one of {', '.join(GENERATORS)}") from None
@@ -0,0 +1,230 @@
+import argparse
+import random
+from array import array
+from collections.abc import Iterator
+from enum import Enum
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, the array('B') grid works on its own
+    np = None
+
+class CellPath(Enum):
+    NORTH = 1
+    EAST = 2
+    SOUTH = 4
+    WEST = 8
+    VISITED = 16
+
+# Plain-int copies of the CellPath bits for hot loops (Enum lookups are slow)
+NORTH = CellPath.NORTH.value
+EAST = CellPath.EAST.value
+SOUTH = CellPath.SOUTH.value
+WEST = CellPath.WEST.value
+VISITED = CellPath.VISITED.value
+
+# Direction tables indexed by direction number: 0 = North, 1 = East, 2 = South, 3 = West
+DIR_DX = (0, 1, 0, -1)
+DIR_DY = (-1, 0, 1, 0)
+DIR_BIT = (NORTH, EAST, SOUTH, WEST)
+OPPOSITE_BIT = (SOUTH, WEST, NORTH, EAST)
+# Direction number of each (dx, dy) in [-1, 1]^2, laid out as (dy + 1) * 3 + dx + 1
+_DELTA_DIRECTION = (-1, 0, -1, 3, -1, 1, -1, 2, -1)
+
+# Random picks are drawn in blocks of values in [0, 12); 12 is divisible by 1..4,
+# so "value % neighbour_count" is an unbiased choice among up to four neighbours
+_PICK_RANGE = 12
+_PICK_BLOCK = 1 << 16
+# Random bytes map to picks with "byte % 12"; bytes from 240 up are dropped, so every
+# pick stays equally likely
+_PICK_TABLE = bytes(b % _PICK_RANGE for b in range(256))
+_PICK_REJECTED = bytes(range(256 - 256 % _PICK_RANGE, 256))
+
+class Vec2I:
+    # Slotted: no per-instance __dict__, and attribute access is a fixed offset.
+    # Treat instances as immutable, direction constants are shared.
+    __slots__ = ("x", "y")
+
+    def __init__(self, x: int, y: int) -> None:
+        self.x: int = x
+        self.y: int = y
+
+    def __add__(self, other: "Vec2I") -> "Vec2I":
+        return Vec2I(self.x + other.x, self.y + other.y)
+
+    def __eq__(self, other: "Vec2I") -> bool:
+        return self.x == other.x and self.y == other.y
+
+    def __hash__(self) -> int:
+        # Arithmetic rather than hash((x, y)), which builds a tuple per lookup
+        return self.y * 1_000_003 + self.x
+
+    def __str__(self) -> str:
+        return f"({self.x}, {self.y})"
+
+def parse_size(text: str) -> tuple[int, int]:
+    # "WIDTHxHEIGHT" (e.g. 20x15) as (width, height), for argparse's type=: anything
+    # else, or a size below 1x1, is reported through parser.error
+    width, _, height = text.lower().partition("x")
+    try:
+        size = int(width), int(height)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected WIDTHxHEIGHT, e.g. 20x15, got {text!r}") from None
+    if min(size) < 1:
+        raise argparse.ArgumentTypeError(f"sizes are at least 1x1, got {text!r}")
+    return size
+
+def direction_index(direction: Vec2I) -> int:
+    # Direction number (0 = North .. 3 = West) of a unit step, or -1 for anything else
+    if -1 <= direction.x <= 1 and -1 <= direction.y <= 1:
+        return _DELTA_DIRECTION[(direction.y + 1) * 3 + direction.x + 1]
+    return -1
+
+class MazeGrid:
+    __slots__ = ("width", "height", "cells")
+
+    def __init__(self, width: int, height: int, cells: array | None = None) -> None:
+        self.width: int = width
+        self.height: int = height
+        # One byte per cell holding the CellPath bits, row-major (index = y * width + x)
+        self.cells: array = array("B", bytes(width * height)) if cells is None else cells
+
+    def __len__(self) -> int:
+        return len(self.cells)
+
+    def __getitem__(self, index: int) -> int:
+        return self.cells[index]
+
+    def __setitem__(self, index: int, value: int) -> None:
+        self.cells[index] = value
+
+    def index(self, x: int, y: int) -> int:
+        return y * self.width + x
+
+    def neighbour_offsets(self) -> tuple[int, int, int, int]:
+        # Flat-index deltas in direction order (N, E, S, W)
+        return (-self.width, 1, self.width, -1)
+
+    def tobytes(self) -> bytes:
+        return self.cells.tobytes()
+
+    def to_numpy(self):
+        # Zero-copy (height, width) uint8 view over the cell bytes
+        if np is None:
+            raise RuntimeError("NumPy is not installed")
+        return np.frombuffer(self.cells, dtype=np.uint8).reshape(self.height, self.width)
+
+def _pick_stream(rng: random.Random, block: int):
+    # Endless stream of values in [0, _PICK_RANGE), produced a block of random bytes at
+    # a time. Only rng and bytes.translate are involved (no NumPy), so a seed carves
+    # the same maze, and leaves rng in the same state, on every installation.
+    while True:
+        yield from rng.randbytes(block).translate(_PICK_TABLE, _PICK_REJECTED)
+
+def iter_carve_dfs(grid: MazeGrid, rng: random.Random | None = None, batch: int = 256) -> Iterator[array]:
+    # Recursive-backtracker DFS over flat cell indices, as a resumable generator: every
+    # `batch` carved cells it yields their indices (in carving order), so the work can
+    # be spread over several frames. The last yield holds whatever is left.
+    rng = random if rng is None else rng  # the module-level functions share the global generator
+    w, h = grid.width, grid.height
+    cells = grid.cells
+    total = w * h
+    last_row = total - w
+    # One pick per carved cell, so small mazes draw small blocks
+    picks = _pick_stream(rng, min(_PICK_BLOCK, total))
+    candidates = [0, 0, 0, 0]
+    step = grid.neighbour_offsets()
+
+    # Choose a starting cell
+    x = rng.randint(0, w - 1)
+    y = rng.randint(0, h - 1)
+    current = y * w + x
+    stack = array("I", [current])
+    cells[current] = VISITED
+    visited = 1
+    carved = array("I", [current])
+    left = batch - 1
+
+    while visited < total:
+        current = stack[-1]
+        x = current % w
+
+        # Collect unvisited neighbours (direction numbers) into the reusable candidate list
+        n = 0
+        if current >= w and not cells[current - w] & VISITED:
+            candidates[n] = 0
+            n += 1
+        if x < w - 1 and not cells[current + 1] & VISITED:
+            candidates[n] = 1
+            n += 1
+        if current < last_row and not cells[current + w] & VISITED:
+            candidates[n] = 2
+            n += 1
+        if x > 0 and not cells[current - 1] & VISITED:
+            candidates[n] = 3
+            n += 1
+
+        if n:
+            d = candidates[next(picks) % n]
+            nxt = current + step[d]
+            cells[current] |= DIR_BIT[d]
+            cells[nxt] |= VISITED | OPPOSITE_BIT[d]
+            stack.append(nxt)
+            visited += 1
+            carved.append(nxt)
+            left -= 1
+            if not left:
+                yield carved
+                carved = array("I")
+                left = batch
+        else:
+            stack.pop()
+
+    yield carved
+
+def carve_dfs(grid: MazeGrid, rng: random.Random | None = None) -> int:
+    # The whole maze in one go; returns the number of visited cells
+    for _ in iter_carve_dfs(grid, rng, batch=len(grid) + 1):
+        pass
+    return len(grid)
+
+def generate_dfs(width: int, height: int, rng: random.Random | None = None) -> MazeGrid:
+    grid = MazeGrid(width, height)
+    carve_dfs(grid, rng)
+    return grid
+
+def rotate_gap(grid: MazeGrid, index: int, rng: random.Random) -> bool:
+    # Shift one wall of the 2x2 block of cells whose top-left cell is index, if exactly
+    # three of its four inner passages are open: the closed one opens and a random open
+    # one closes. The four cells stay connected through the other two and nothing else
+    # changes, so a perfect maze stays perfect (and both exits reachable).
+    w = grid.width
+    cells = grid.cells
+    a, b, c, d = index, index + 1, index + w, index + w + 1
+    # Inner passages as (cell, bit, neighbour, opposite bit): top, bottom, left, right
+    passages = ((a, EAST, b, WEST), (c, EAST, d, WEST), (a, SOUTH, c, NORTH), (b, SOUTH, d, NORTH))
+    closed = [p for p in passages if not cells[p[0]] & p[1]]
+    if len(closed) != 1:
+        return False
+    cell, bit, neighbour, opposite = closed[0]
+    cells[cell] |= bit
+    cells[neighbour] |= opposite
+    cell, bit, neighbour, opposite = rng.choice([p for p in passages if p is not closed[0]])
+    cells[cell] &= ~bit
+    cells[neighbour] &= ~opposite
+    return True
+
+def shift_walls(grid: MazeGrid, rng: random.Random, count: int, tries: int = 16) -> list[int]:
+    # Up to count rotate_gap() calls on random blocks (each given `tries` random picks
+    # to find a block with a gap to rotate); returns the top-left cells of the blocks
+    # that changed, in order
+    changed = []
+    if grid.width < 2 or grid.height < 2:
+        return changed
+    for _ in range(count):
+        for _ in range(tries):
+            index = rng.randrange(grid.height - 1) * grid.width + rng.randrange(grid.width - 1)
+            if rotate_gap(grid, index, rng):
+                changed.append(index)
+                break
+    return changed
@@ -0,0 +1,162 @@
+from array import array
+from collections.abc import Iterator
+from heapq import heappop, heappush
+
+from maze_grid import EAST, NORTH, SOUTH, WEST, MazeGrid, Vec2I, np
+
+def astar_indices(grid: MazeGrid, start: int, target: int) -> list[int]:
+    # A* over flat cell indices (y * width + x) with a binary-heap open set.
+    # Returns the cells after start up to and including target, or [] if unreachable.
+    w = grid.width
+    cells = grid.cells
+    total = len(cells)
+    last_row = total - w
+    tx, ty = target % w, target // w
+
+    g_cost = array("i", [-1]) * total  # -1 marks cells that were never reached
+    parent = array("i", [-1]) * total
+    closed = bytearray(total)
+
+    h_start = abs(start % w - tx) + abs(start // w - ty)
+    g_cost[start] = 0
+    # Heap entries are (f, h, insertion order, cell): lowest f first, ties go to the
+    # lower h and then to the earlier node, matching the original linear scan
+    open_heap = [(h_start, h_start, 0, start)]
+    counter = 1
+
+    while open_heap:
+        current = heappop(open_heap)[3]
+        if closed[current]:
+            continue  # stale entry left behind by a cheaper re-push
+        closed[current] = 1
+
+        if current == target:
+            path = []
+            while current != start:
+                path.append(current)
+                current = parent[current]
+            path.reverse()
+            return path
+
+        cell = cells[current]
+        x = current % w
+        g = g_cost[current] + 1
+
+        for bit, ok, neighbour in (
+            (NORTH, current >= w, current - w),
+            (EAST, x < w - 1, current + 1),
+            (SOUTH, current < last_row, current + w),
+            (WEST, x > 0, current - 1),
+        ):
+            if not (cell & bit and ok) or closed[neighbour]:
+                continue
+            old_g = g_cost[neighbour]
+            if old_g == -1 or g < old_g:
+                g_cost[neighbour] = g
+                parent[neighbour] = current
+                h = abs(neighbour % w - tx) + abs(neighbour // w - ty)
+                heappush(open_heap, (g + h, h, counter, neighbour))
+                counter += 1
+
+    # No path found
+    return []
+
+def find_path(grid: MazeGrid, start: Vec2I, target: Vec2I) -> list[Vec2I]:
+    w = grid.width
+    path = astar_indices(grid, start.y * w + start.x, target.y * w + target.x)
+    return [Vec2I(i % w, i // w) for i in path]
+
+def distance_field(grid: MazeGrid, target: int) -> array:
+    # Breadth-first search outward from target: field[i] is the number of moves from
+    # cell i to target, or -1 if i cannot reach it
+    for field in iter_distance_field(grid, target, len(grid.cells)):
+        pass
+    return field
+
+def iter_distance_field(grid: MazeGrid, target: int, batch: int = 4096) -> Iterator[array]:
+    # distance_field as a resumable generator: yields the partly filled field after
+    # every `batch` cells expanded, and the finished field last
+    w = grid.width
+    cells = grid.cells
+    total = len(cells)
+    last_row = total - w
+
+    field = array("i", [-1]) * total
+    queue = array("I", [0]) * total  # every cell is enqueued at most once
+    field[target] = 0
+    queue[0] = target
+    head, tail = 0, 1
+
+    while head < tail:
+        stop = head + batch
+        while head < tail and head < stop:
+            current = queue[head]
+            head += 1
+            cell = cells[current]
+            x = current % w
+            d = field[current] + 1
+
+            if cell & NORTH and current >= w and field[current - w] < 0:
+                field[current - w] = d
+                queue[tail] = current - w
+                tail += 1
+            if cell & EAST and x < w - 1 and field[current + 1] < 0:
+                field[current + 1] = d
+                queue[tail] = current + 1
+                tail += 1
+            if cell & SOUTH and current < last_row and field[current + w] < 0:
+                field[current + w] = d
+                queue[tail] = current + w
+                tail += 1
+            if cell & WEST and x > 0 and field[current - 1] < 0:
+                field[current - 1] = d
+                queue[tail] = current - 1
+                tail += 1
+        if head < tail:
+            yield field
+
+    yield field
+
+def descend(grid: MazeGrid, field: array, index: int) -> int:
+    # Neighbour of index that is one move closer to the field's target, or -1 if
+    # index is the target itself or cannot reach it
+    w = grid.width
+    cell = grid.cells[index]
+    closer = field[index] - 1
+    if closer < 0:
+        return -1
+    x = index % w
+    if cell & NORTH and index >= w and field[index - w] == closer:
+        return index - w
+    if cell & EAST and x < w - 1 and field[index + 1] == closer:
+        return index + 1
+    if cell & SOUTH and index < len(field) - w and field[index + w] == closer:
+        return index + w
+    if cell & WEST and x > 0 and field[index - 1] == closer:
+        return index - 1
+    return -1
+
+def descent_table(grid: MazeGrid, field: array):
+    # descend() for every cell at once (NumPy int32 array, -1 where descend returns -1):
+    # agents sharing the field then move with one fancy-indexing operation
+    if np is None:
+        raise RuntimeError("NumPy is not installed")
+    w = grid.width
+    cells = np.frombuffer(grid.cells, dtype=np.uint8)
+    dist = np.frombuffer(field, dtype=np.int32)
+    total = len(dist)
+    index = np.arange(total, dtype=np.int32)
+    x = index % w
+    closer = dist - 1
+    table = np.full(total, -1, dtype=np.int32)
+    pending = closer >= 0
+
+    # Same direction order as descend, so the first closer neighbour wins on mazes with loops
+    for bit, offset, inside in ((NORTH, -w, index >= w), (EAST, 1, x < w - 1),
+                                (SOUTH, w, index < total - w), (WEST, -1, x > 0)):
+        step = pending & inside & (cells & bit != 0)
+        step[step] = dist[index[step] + offset] == closer[step]
+        table[step] = index[step] + offset
+        pending &= ~step
+    return table
+
@@ -0,0 +1,71 @@
+import random
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+
+from maze_simulation import PreparedMaze, prepare_maze
+
+class MazePrefetcher:
+    # Keeps up to `size` mazes being generated or ready in a background worker, so
+    # starting a round only has to dequeue one. A process is used by default, since a
+    # thread would compete with the game loop for the GIL while carving.
+    def __init__(self, width: int, height: int, seed_source: random.Random,
+                 size: int = 2, use_processes: bool = True, algorithm: str = "dfs",
+                 min_difficulty: float = 0.0, start: bool = True) -> None:
+        self.width = width
+        self.height = height
+        self.algorithm = algorithm
+        self.min_difficulty = min_difficulty
+        self.seed_source = seed_source
+        self.size = size
+        self.executor: Executor = (ProcessPoolExecutor(max_workers=1) if use_processes
+                                   else ThreadPoolExecutor(max_workers=1))
+        self.pending: deque[tuple[int, Future]] = deque()  # (seed, maze being generated), oldest first
+        self.hits = 0
+        self.misses = 0
+        if start:  # otherwise the first fill() (or resize) starts the worker
+            self.fill()
+
+    def submit(self, seed: int) -> tuple[int, Future]:
+        return seed, self.executor.submit(prepare_maze, self.width, self.height, seed,
+                                          self.algorithm, self.min_difficulty)
+
+    def fill(self) -> None:
+        while len(self.pending) < self.size:
+            self.pending.append(self.submit(self.seed_source.getrandbits(64)))
+
+    def take(self) -> tuple[int, PreparedMaze | None]:
+        # The next round's seed, with its maze from the worker (waiting for it if it is
+        # being carved right now); a maze the worker has not started is cancelled and the
+        # caller generates that same seed synchronously. Seeds are always used in the
+        # order they were drawn, so a seeded game does not depend on the worker's timing.
+        if not self.pending:
+            self.misses += 1
+            return self.seed_source.getrandbits(64), None
+        seed, future = self.pending.popleft()
+        self.fill()
+        if future.cancel():  # only succeeds while the maze is still queued
+            self.misses += 1
+            return seed, None
+        try:
+            maze = future.result()  # finishing a running maze beats carving it again
+        except Exception:  # a failed worker: generate it here instead
+            self.misses += 1
+            return seed, None
+        self.hits += 1
+        return seed, maze
+
+    def resize(self, width: int, height: int, algorithm: str | None = None) -> None:
+        # Mazes queued for another size or algorithm are useless; regenerate their seeds
+        algorithm = algorithm or self.algorithm
+        if (width, height, algorithm) != (self.width, self.height, self.algorithm):
+            for _, future in self.pending:
+                future.cancel()
+            self.width, self.height, self.algorithm = width, height, algorithm
+            self.pending = deque(self.submit(seed) for seed, _ in self.pending)
+            self.fill()
+
+    def close(self) -> None:
+        for _, future in self.pending:
+            future.cancel()
+        self.pending.clear()
+        self.executor.shutdown(cancel_futures=True)
@@ -0,0 +1,157 @@
+import cProfile
+import io
+import json
+import os
+import pstats
+import time
+from collections import deque
+from contextlib import nullcontext
+
+# Profiling is opt-in: set AMAZING_MAZE_PROFILE=1 (or to the JSON report path) or pass --profile
+PROFILE_ENV = "AMAZING_MAZE_PROFILE"
+DEFAULT_REPORT_PATH = "profile.json"
+PHASES = ("events", "logic", "ai", "maze", "text", "flip", "frame")
+
+_NO_PHASE = nullcontext()
+
+class _Phase:
+    # Reusable timing context for one phase; time inside it adds to the current frame
+    __slots__ = ("total", "start")
+
+    def __init__(self) -> None:
+        self.total = 0.0
+        self.start = 0.0
+
+    def __enter__(self) -> None:
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info) -> None:
+        self.total += time.perf_counter() - self.start
+
+class FrameProfiler:
+    def __init__(self, enabled: bool = False, report_path: str = DEFAULT_REPORT_PATH, window: int = 600) -> None:
+        # Per-phase time of each of the last `window` frames, plus totals since start
+        self.enabled = enabled
+        self.report_path = report_path
+        self.phases = {name: _Phase() for name in PHASES}
+        self.samples = {name: deque(maxlen=window) for name in PHASES}
+        self.totals = dict.fromkeys(PHASES, 0.0)
+        self.frames = 0
+
+        # cProfile capture of the next N frames
+        self.capture: cProfile.Profile | None = None
+        self.capture_frames = 0
+        self.captures = 0
+
+    @classmethod
+    def from_environment(cls, report_path: str | None = None) -> "FrameProfiler":
+        # Enabled by an explicit report path (--profile) or the environment variable
+        value = os.environ.get(PROFILE_ENV, "")
+        if report_path is None and value and value.lower() not in ("0", "false", "no"):
+            report_path = value if value.endswith(".json") else DEFAULT_REPORT_PATH
+        return cls(report_path is not None, report_path or DEFAULT_REPORT_PATH)
+
+    def phase(self, name: str):
+        # `with profiler.phase("maze"):` times the block; a no-op when disabled
+        return self.phases[name] if self.enabled else _NO_PHASE
+
+    def end_frame(self, frame_seconds: float) -> None:
+        if not self.enabled:
+            return
+        self.phases["frame"].total = frame_seconds
+        for name, phase in self.phases.items():
+            self.samples[name].append(phase.total)
+            self.totals[name] += phase.total
+            phase.total = 0.0
+        self.frames += 1
+
+        if self.capture is not None:
+            self.capture_frames -= 1
+            if self.capture_frames <= 0:
+                self.finish_capture()
+
+    def percentiles(self, name: str) -> tuple[float, float, float]:
+        # p50, p95 and p99 of the phase over the rolling window, in milliseconds
+        values = sorted(self.samples[name])
+        if not values:
+            return 0.0, 0.0, 0.0
+        last = len(values) - 1
+        return tuple(1000 * values[round(last * q)] for q in (0.50, 0.95, 0.99))
+
+    def report_lines(self) -> list[str]:
+        lines = [f"{'phase':<7}{'p50':>8}{'p95':>8}{'p99':>8} ms"]
+        for name in PHASES:
+            p50, p95, p99 = self.percentiles(name)
+            lines.append(f"{name:<7}{p50:8.3f}{p95:8.3f}{p99:8.3f}")
+        return lines
+
+    def report(self) -> dict:
+        phases = {}
+        for name in PHASES:
+            p50, p95, p99 = self.percentiles(name)
+            window = self.samples[name]
+            phases[name] = {
+                "p50_ms": round(p50, 4), "p95_ms": round(p95, 4), "p99_ms": round(p99, 4),
+                "max_ms": round(1000 * max(window, default=0.0), 4),
+                "mean_ms": round(1000 * self.totals[name] / self.frames, 4) if self.frames else 0.0,
+            }
+        return {"frames": self.frames, "window": self.samples["frame"].maxlen, "phases": phases}
+
+    def dump(self) -> None:
+        if self.enabled and self.frames:
+            with open(self.report_path, "w") as f:
+                json.dump(self.report(), f, indent=2)
+            print(f"Frame profile written to {self.report_path}")
+
+    def start_capture(self, frames: int) -> None:
+        # Run cProfile over the next `frames` frames
+        if not self.enabled or self.capture is not None:
+            return
+        self.capture = cProfile.Profile()
+        self.capture_frames = frames
+        self.capture.enable()
+
+    def finish_capture(self) -> str:
+        self.capture.disable()
+        self.captures += 1
+        path = f"{os.path.splitext(self.report_path)[0]}-{self.captures}.prof"
+        self.capture.dump_stats(path)
+
+        summary = io.StringIO()
+        pstats.Stats(self.capture, stream=summary).sort_stats("cumulative").print_stats(15)
+        print(summary.getvalue())
+        print(f"cProfile capture written to {path}")
+        self.capture = None
+        return path
+
+class StartupTimer:
+    def __init__(self, start: float | None = None) -> None:
+        # Time from `start` (a perf_counter() taken before the imports) to the first
+        # frame, split into named phases. mark() closes the phase running since the
+        # previous mark; record() books time measured elsewhere (e.g. lazy font loads)
+        # and takes it out of the phase it happened in.
+        self.start = time.perf_counter() if start is None else start
+        self.last = self.start
+        self.recorded = 0.0
+        self.phases: list[tuple[str, float]] = []
+
+    def mark(self, name: str) -> None:
+        now = time.perf_counter()
+        self.phases.append((name, now - self.last - self.recorded))
+        self.last = now
+        self.recorded = 0.0
+
+    def record(self, name: str, seconds: float) -> None:
+        self.phases.append((name, seconds))
+        self.recorded += seconds
+
+    @property
+    def total(self) -> float:
+        return self.last - self.start
+
+    def report_lines(self) -> list[str]:
+        total = self.total or 1.0
+        lines = [f"Startup: {1000 * self.total:.1f} ms from import to the first title frame"]
+        for name, seconds in self.phases:
+            lines.append(f"  {name:<24}{1000 * seconds:9.2f} ms {100 * seconds / total:5.1f}%")
+        return lines
@@ -0,0 +1,94 @@
+import random
+from array import array
+from collections.abc import Iterable
+
+from maze_grid import MazeGrid, np
+from maze_pathfinding import descend, descent_table
+
+class AIRacers:
+    def __init__(self, grid: MazeGrid, field: array, starts: list[int], intervals: list[float],
+                 use_numpy: bool = True) -> None:
+        # Any number of AI racers descending one shared distance field, each moving a
+        # cell every intervals[i] seconds from starts[i]. step() moves all of them at
+        # once: with NumPy through a per-round table of every cell's next cell, otherwise
+        # in one loop over a lazily filled copy of the same table.
+        self.grid = grid
+        self.field = field
+        self.count = len(starts)
+        self.target = field.index(0)
+        self.finished = 0  # racers that reached the target
+        self.moves = 0  # bumped whenever any racer moves, for redraws
+        self.numpy = use_numpy and np is not None
+        if self.numpy:
+            # Racers on the target (or cut off from it) stay put
+            self.next_cell = descent_table(grid, field)
+            stuck = np.flatnonzero(self.next_cell < 0)
+            self.next_cell[stuck] = stuck
+            self.positions = np.array(starts, dtype=np.int32)
+            self.intervals = np.array(intervals, dtype=np.float64)
+            self.timers = np.zeros(self.count, dtype=np.float64)
+        else:
+            self.next_cell = array("i", [-2]) * len(field)  # -2: not looked up yet
+            self.next_cell[self.target] = self.target
+            self.positions = array("i", starts)
+            self.intervals = list(intervals)
+            self.timers = [0.0] * self.count
+
+    @classmethod
+    def spawn(cls, grid: MazeGrid, field: array, count: int, seed: int, base_interval: float,
+              use_numpy: bool = True) -> "AIRacers":
+        # count racers on random cells of the column furthest from the target, each
+        # between one and two times slower than base_interval; the draws come from
+        # their own generator so the round's rng is left alone
+        rng = random.Random(f"racers:{seed}")
+        target_x = field.index(0) % grid.width
+        start_x = grid.width - 1 if target_x < grid.width // 2 else 0
+        starts = [rng.randrange(grid.height) * grid.width + start_x for _ in range(count)]
+        intervals = [base_interval * (1.0 + rng.random()) for _ in range(count)]
+        return cls(grid, field, starts, intervals, use_numpy)
+
+    def step(self, dt: float) -> None:
+        if self.numpy:
+            timers = self.timers
+            timers += dt
+            moving = timers > self.intervals
+            if moving.any():
+                current = self.positions[moving]
+                nxt = self.next_cell[current]
+                self.positions[moving] = nxt
+                timers[moving] = 0.0
+                if (nxt != current).any():  # racers on the target (or cut off) stay put
+                    self.finished = int(np.count_nonzero(self.positions == self.target))
+                    self.moves += 1
+            return
+
+        positions, timers, intervals = self.positions, self.timers, self.intervals
+        next_cell, grid, field = self.next_cell, self.grid, self.field
+        moved = False
+        for i in range(self.count):
+            timers[i] += dt
+            if timers[i] > intervals[i]:
+                timers[i] = 0.0
+                index = positions[i]
+                nxt = next_cell[index]
+                if nxt == -2:
+                    nxt = next_cell[index] = descend(grid, field, index)
+                if nxt >= 0 and nxt != index:
+                    positions[i] = nxt
+                    moved = True
+                    if nxt == self.target:
+                        self.finished += 1
+        if moved:
+            self.moves += 1
+
+    def cells(self) -> Iterable[int]:
+        # Cells holding at least one racer
+        if self.numpy:
+            return np.unique(self.positions).tolist()
+        return set(self.positions)
+
+    def leader_distance(self) -> int:
+        # Moves left for the racer closest to the target
+        if self.numpy:
+            return int(np.frombuffer(self.field, dtype=np.int32)[self.positions].min())
+        return min(self.field[index] for index in self.positions)
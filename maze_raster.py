@@ -0,0 +1,100 @@
+import argparse
+import os
+import time
+
+import pygame
+
+from maze_format import load_maze
+from maze_generators import GENERATORS
+from maze_grid import EAST, NORTH, SOUTH, WEST, CellPath, MazeGrid, np, parse_size
+from maze_simulation import MazeSimulation
+
+# Colors of the walls and of the carved cells and passages (as drawn in the game)
+WALL_COLOR = (189, 252, 201)
+PATH_COLOR = (0, 0, 0)
+
+_VISITED = CellPath.VISITED.value
+
+def open_units(grid: MazeGrid, cells_x: range | None = None, cells_y: range | None = None,
+               border: bool = False):
+    # The maze at unit resolution: a (2 * rows, 2 * columns) bool array where unit
+    # [2y, 2x] is cell (x, y), [2y, 2x + 1] the passage to its east, [2y + 1, 2x] the
+    # passage to its south and [2y + 1, 2x + 1] the wall corner below them, True where
+    # carved. Cells that are not carved yet stay walls. With border, a row and column
+    # of wall are added in front (the north and west outer walls), open where a cell on
+    # that side of the maze opens to the outside.
+    cells_x = cells_x or range(grid.width)
+    cells_y = cells_y or range(grid.height)
+    cells = grid.to_numpy()[cells_y.start:cells_y.stop, cells_x.start:cells_x.stop]
+    visited = (cells & _VISITED) != 0
+    first = int(border)
+    units = np.zeros((2 * len(cells_y) + first, 2 * len(cells_x) + first), dtype=bool)
+    units[first::2, first::2] = visited
+    units[first::2, first + 1::2] = visited & ((cells & EAST) != 0)
+    units[first + 1::2, first::2] = visited & ((cells & SOUTH) != 0)
+    if border:
+        units[1::2, 0] = visited[:, 0] & ((cells[:, 0] & WEST) != 0)
+        units[0, 1::2] = visited[0] & ((cells[0] & NORTH) != 0)
+    return units
+
+def rasterise(grid: MazeGrid, cells_x: range | None = None, cells_y: range | None = None,
+              cell_px: int = 24, wall_px: int = 8, border: bool = False):
+    # Pixel rows of the given cells, 1 where carved and 0 for wall: each unit of
+    # open_units() stretched to cell_px or wall_px pixels per side, so cell (x, y)
+    # starts at pixel (x * pitch, y * pitch) with pitch = cell_px + wall_px (plus
+    # wall_px with border)
+    units = open_units(grid, cells_x, cells_y, border)
+    rows, columns = units.shape
+    first = int(border)
+    sizes = np.full(max(rows, columns), cell_px, dtype=np.intp)
+    sizes[1 - first::2] = wall_px
+    if cell_px != 1 or wall_px != 1:
+        units = np.repeat(np.repeat(units, sizes[:rows], axis=0), sizes[:columns], axis=1)
+    return units.view(np.uint8)
+
+def render(grid: MazeGrid, cells_x: range | None = None, cells_y: range | None = None, cell_px: int = 24,
+           wall_px: int = 8, colors: tuple[tuple, tuple] = (WALL_COLOR, PATH_COLOR),
+           border: bool = False) -> pygame.Surface:
+    # rasterise() as an 8-bit surface with colors as its palette: one NumPy pass and a
+    # surface over its buffer (kept alive by the surface, not copied) instead of a
+    # few draw calls per cell
+    pixels = rasterise(grid, cells_x, cells_y, cell_px, wall_px, border)
+    surface = pygame.image.frombuffer(pixels, pixels.shape[::-1], "P")
+    surface.set_palette(colors)
+    return surface
+
+def save_thumbnail(grid: MazeGrid, path: str, cell_px: int = 1, wall_px: int = 1) -> None:
+    # The whole maze with its outer walls as an image file (PNG by extension); no
+    # display is needed
+    pygame.image.save(render(grid, cell_px=cell_px, wall_px=wall_px, border=True), path)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Write a thumbnail image of a maze (no display needed)")
+    parser.add_argument("maze", help="maze file (see maze_format.py), or WIDTHxHEIGHT to generate one")
+    parser.add_argument("output", help="image path, e.g. maze.png")
+    parser.add_argument("--seed", type=int, help="seed of a generated maze")
+    parser.add_argument("--algorithm", choices=list(GENERATORS), default="dfs", help="maze generation algorithm")
+    parser.add_argument("--cell", type=int, default=1, metavar="PX", help="pixels per cell side")
+    parser.add_argument("--wall", type=int, default=1, metavar="PX", help="pixels per wall thickness")
+    args = parser.parse_args()
+
+    if os.path.exists(args.maze):
+        with load_maze(args.maze) as maze:
+            grid = maze.to_grid()
+    else:
+        try:
+            width, height = parse_size(args.maze)
+        except argparse.ArgumentTypeError as error:
+            parser.error(f"{args.maze} is not a maze file, and {error}")
+        sim = MazeSimulation(width, height, algorithm=args.algorithm)
+        sim.start_round(two_player_mode=False, seed=args.seed)
+        grid = sim.maze
+    start = time.perf_counter()
+    image = render(grid, cell_px=args.cell, wall_px=args.wall, border=True)
+    rendered = time.perf_counter()
+    pygame.image.save(image, args.output)
+    print(f"Saved {grid.width}x{grid.height} maze thumbnail to {args.output} (rendered in "
+          f"{1000 * (rendered - start):.1f} ms, written in {1000 * (time.perf_counter() - rendered):.1f} ms)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+from array import array
+from collections.abc import Iterable
+from heapq import heappop, heappush
+
+from maze_grid import EAST, NORTH, SOUTH, WEST, MazeGrid
+from maze_pathfinding import descend
+
+INFINITY = 1 << 30  # distance of cells that cannot reach the goal (yet)
+
+class DStarLite:
+    def __init__(self, grid: MazeGrid, goal: int, start: int, field: array | None = None) -> None:
+        # Incremental shortest path from an agent at start to goal (D* Lite, i.e. LPA*
+        # searching backwards from the goal while the start moves). g[cell] is a cell's
+        # moves to the goal and rhs[cell] the one-step lookahead, 1 + the smallest g of
+        # its open neighbours; cells where they differ are queued, keyed by distance
+        # plus the Manhattan estimate back to the start. When walls change, only the
+        # changed cells are queued again, and repairing stops as soon as the start's
+        # distance is settled, so the work follows the change rather than the maze.
+        # A distance field towards goal (distance_field()) makes every cell settled
+        # from the start instead of searching the maze once.
+        self.grid = grid
+        self.goal = goal
+        self.start = start
+        self.last = start  # start at the last repair, for the key modifier
+        self.key_modifier = 0
+        self.expanded = 0  # cells settled or reopened so far, for benchmarks
+        total = len(grid)
+        self.queue: list[tuple[int, int, int]] = []
+        if field is not None:
+            self.g = array("i", (d if d >= 0 else INFINITY for d in field))
+            self.rhs = array("i", self.g)
+        else:
+            self.g = array("i", [INFINITY]) * total
+            self.rhs = array("i", [INFINITY]) * total
+            self.rhs[goal] = 0
+            heappush(self.queue, (self.heuristic(goal), 0, goal))
+            self.compute()
+
+    def heuristic(self, cell: int) -> int:
+        # Manhattan distance from the start, a lower bound on the moves
+        w = self.grid.width
+        return abs(cell % w - self.start % w) + abs(cell // w - self.start // w)
+
+    def neighbours(self, cell: int) -> list[int]:
+        # Open neighbours (the entrance openings lead nowhere)
+        w = self.grid.width
+        mask = self.grid.cells[cell]
+        x = cell % w
+        result = []
+        if mask & NORTH and cell >= w:
+            result.append(cell - w)
+        if mask & EAST and x < w - 1:
+            result.append(cell + 1)
+        if mask & SOUTH and cell < len(self.g) - w:
+            result.append(cell + w)
+        if mask & WEST and x > 0:
+            result.append(cell - 1)
+        return result
+
+    def update_cell(self, cell: int) -> None:
+        # Recompute the lookahead and queue the cell if it is now inconsistent
+        g, rhs = self.g, self.rhs
+        if cell != self.goal:
+            closest = min((g[n] for n in self.neighbours(cell)), default=INFINITY)
+            rhs[cell] = closest + 1 if closest < INFINITY else INFINITY
+        if g[cell] != rhs[cell]:
+            distance = min(g[cell], rhs[cell])
+            heappush(self.queue, (distance + self.heuristic(cell) + self.key_modifier, distance, cell))
+
+    def compute(self) -> None:
+        # Settle queued cells in key order until the start's distance is final
+        g, rhs, queue = self.g, self.rhs, self.queue
+        start = self.start
+        while queue:
+            k1, k2, cell = queue[0]
+            start_distance = min(g[start], rhs[start])
+            if (k1, k2) >= (start_distance + self.key_modifier, start_distance) and g[start] == rhs[start]:
+                break
+            heappop(queue)
+            if g[cell] == rhs[cell]:
+                continue  # settled since it was queued
+            distance = min(g[cell], rhs[cell])
+            key = (distance + self.heuristic(cell) + self.key_modifier, distance)
+            if (k1, k2) < key:
+                heappush(queue, (*key, cell))
+                continue
+            self.expanded += 1
+            if g[cell] > rhs[cell]:
+                g[cell] = rhs[cell]
+            else:
+                g[cell] = INFINITY
+                self.update_cell(cell)
+            for n in self.neighbours(cell):
+                self.update_cell(n)
+
+    def move_to(self, cell: int) -> None:
+        self.start = cell
+
+    def update_walls(self, cells: Iterable[int]) -> None:
+        # Repair after the passages of these cells changed (both sides of every wall
+        # that opened or closed)
+        w = self.grid.width
+        self.key_modifier += abs(self.last % w - self.start % w) + abs(self.last // w - self.start // w)
+        self.last = self.start
+        for cell in cells:
+            self.update_cell(cell)
+        self.compute()
+
+    def distance(self) -> int:
+        # Moves from the start to the goal, or -1 if it is cut off
+        d = self.g[self.start]
+        return d if d < INFINITY else -1
+
+    def next_cell(self) -> int:
+        # Neighbour of the start one move closer to the goal (first in N, E, S, W
+        # order), or -1 at the goal or when it cannot be reached
+        d = self.g[self.start]
+        if d == 0 or d >= INFINITY:
+            return -1
+        g = self.g
+        for n in self.neighbours(self.start):
+            if g[n] == d - 1:
+                return n
+        return -1
+
+class SplicedPath:
+    def __init__(self, grid: MazeGrid, goal: int, start: int, field: array) -> None:
+        # The agent's path to goal in a perfect maze whose walls only change by
+        # maze_grid.rotate_gap(), as a linked list: toward[cell] is the next cell for
+        # cells on the path (goal points at itself) and -1 elsewhere. A rotation only
+        # rewires the inner passages of one 2x2 block and keeps the maze a tree, so the
+        # path can only change where it runs through that block, and the run is
+        # contiguous: splice_block() relinks those at most four cells, whatever the
+        # maze size. (D* Lite repairs every distance the rotation changed, and in a
+        # tree that is the whole part of the maze behind the rotated block.)
+        self.grid = grid
+        self.goal = goal
+        self.start = start
+        self.toward = array("i", [-1]) * len(grid)
+        self.length = field[start]
+        cell = start
+        while cell != goal:
+            nxt = descend(grid, field, cell)
+            self.toward[cell] = nxt
+            cell = nxt
+        self.toward[goal] = goal
+
+    def move_to(self, cell: int) -> None:
+        # Step along the path (cell must be next_cell())
+        self.toward[self.start] = -1
+        self.start = cell
+        self.length -= 1
+
+    def next_cell(self) -> int:
+        nxt = self.toward[self.start]
+        return -1 if nxt == self.start else nxt
+
+    def distance(self) -> int:
+        return self.length
+
+    def splice_block(self, index: int) -> None:
+        # Repair after rotate_gap(grid, index, ...) changed the block with top-left cell index
+        toward = self.toward
+        w = self.grid.width
+        block = (index, index + 1, index + w, index + w + 1)
+        on_path = [cell for cell in block if toward[cell] >= 0]
+        if len(on_path) < 2:
+            return  # the path used none of the block's inner passages
+        # Where the path enters the block (no block cell leads to it) and leaves it
+        successors = {toward[cell] for cell in on_path}
+        entry = next(cell for cell in on_path if cell not in successors or cell == self.start)
+        exit_cell = next(cell for cell in on_path if toward[cell] not in on_path or toward[cell] == cell)
+
+        # The way from entry to exit inside the block now
+        route = {entry: entry}
+        frontier = [entry]
+        while exit_cell not in route:
+            cell = frontier.pop(0)
+            for n in self.block_neighbours(cell, block):
+                if n not in route:
+                    route[n] = cell
+                    frontier.append(n)
+        for cell in on_path:
+            if cell != exit_cell:
+                toward[cell] = -1
+        cell, moves = exit_cell, 0
+        while cell != entry:
+            previous = route[cell]
+            toward[previous] = cell
+            cell = previous
+            moves += 1
+        self.length += moves - (len(on_path) - 1)
+
+    def block_neighbours(self, cell: int, block: tuple[int, int, int, int]) -> list[int]:
+        w = self.grid.width
+        mask = self.grid.cells[cell]
+        result = []
+        if mask & NORTH and cell - w in block:
+            result.append(cell - w)
+        if mask & EAST and cell + 1 in block and cell % w < w - 1:
+            result.append(cell + 1)
+        if mask & SOUTH and cell + w in block:
+            result.append(cell + w)
+        if mask & WEST and cell - 1 in block and cell % w > 0:
+            result.append(cell - 1)
+        return result
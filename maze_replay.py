@@ -0,0 +1,200 @@
+import argparse
+import struct
+import time
+import zlib
+from array import array
+from collections.abc import Iterator, Sequence
+
+from maze_format import loaded_round, pack_cells, row_bytes, unpack_rows
+from maze_generators import GENERATORS
+from maze_grid import MazeGrid, Vec2I
+from maze_simulation import DOWN, LEFT, RIGHT, TICK_SECONDS, UP, GameState, MazeSimulation, PreparedMaze
+
+# File layout: header, then a zlib stream of runs of (varint repeat count, input byte).
+# The input byte holds player 1's held directions in the low nibble and player 2's
+# in the high nibble, one bit per direction in the order they are applied.
+REPLAY_MAGIC = b"AMRP"
+REPLAY_VERSION = 1
+# magic, version, width, height, seed, flags, tick seconds, number of AI racers (maze_racers.py),
+# minimum difficulty the entrances were chosen for, entrance rows of an embedded maze
+_HEADER = struct.Struct("<4sBIIQBdIdII")
+_FLAG_TWO_PLAYER = 1
+_FLAG_WARMUP = 2
+_FLAG_SHIFTING = 4  # walls shift during the round
+# The round was played on a loaded maze (maze_format.py), whose packed cells follow the
+# header; a seed cannot regenerate those
+_FLAG_MAZE = 8
+_ALGORITHM_SHIFT = 4  # the remaining flag bits hold the maze algorithm's index in GENERATORS (0 = dfs)
+_ALGORITHMS = list(GENERATORS)
+
+# Held directions as a 4-bit mask (also the network input encoding, see maze_server.py)
+DIRECTION_BITS = {LEFT: 1, RIGHT: 2, UP: 4, DOWN: 8}
+MASK_MOVES = tuple(tuple(d for d, bit in DIRECTION_BITS.items() if mask & bit) for mask in range(16))
+
+def moves_mask(moves: Sequence[Vec2I]) -> int:
+    mask = 0
+    for move in moves:
+        mask |= DIRECTION_BITS[move]
+    return mask
+
+class Replay:
+    # Seed plus run-length encoded per-tick inputs: enough to re-run a round exactly.
+    # A round on a loaded maze also carries the maze (see maze_format.loaded_round).
+    def __init__(self, width: int, height: int, seed: int, two_player_mode: bool,
+                 warmup: bool = True, tick_seconds: float = TICK_SECONDS, algorithm: str = "dfs",
+                 racers: int = 0, min_difficulty: float = 0.0, shifting_walls: bool = False,
+                 maze: PreparedMaze | None = None) -> None:
+        self.width = width
+        self.height = height
+        self.seed = seed
+        self.two_player_mode = two_player_mode
+        self.warmup = warmup
+        self.tick_seconds = tick_seconds
+        self.algorithm = algorithm
+        self.racers = racers
+        self.min_difficulty = min_difficulty
+        self.shifting_walls = shifting_walls
+        self.maze = maze
+        self.runs: list[list[int]] = []  # [repeat count, input byte]
+
+    @classmethod
+    def record_round(cls, sim: MazeSimulation, two_player_mode: bool, warmup: bool = True,
+                     seed: int | None = None, loaded: PreparedMaze | None = None) -> "Replay":
+        # Start a round on sim and record every step() until the recorder is detached;
+        # loaded is a maze from a file (MappedMaze.prepared()) to play the round on
+        sim.start_round(two_player_mode, warmup, seed, loaded)
+        replay = cls(sim.maze_width, sim.maze_height, sim.seed, two_player_mode, warmup,
+                     algorithm=sim.maze_algorithm, racers=sim.racer_count, min_difficulty=sim.min_difficulty,
+                     shifting_walls=sim.shifting_walls, maze=loaded)
+        sim.input_recorder = replay
+        return replay
+
+    @property
+    def ticks(self) -> int:
+        return sum(run[0] for run in self.runs)
+
+    def record(self, player1_moves: Sequence[Vec2I], player2_moves: Sequence[Vec2I]) -> None:
+        symbol = moves_mask(player1_moves) | moves_mask(player2_moves) << 4
+        if self.runs and self.runs[-1][1] == symbol:
+            self.runs[-1][0] += 1
+        else:
+            self.runs.append([1, symbol])
+
+    def inputs(self) -> Iterator[tuple[tuple[Vec2I, ...], tuple[Vec2I, ...]]]:
+        for count, symbol in self.runs:
+            moves = (MASK_MOVES[symbol & 15], MASK_MOVES[symbol >> 4])
+            for _ in range(count):
+                yield moves
+
+    def play(self, sim: MazeSimulation | None = None) -> MazeSimulation:
+        # Re-run the round headless, as fast as the logic allows
+        sim = sim or MazeSimulation(self.width, self.height)
+        sim.maze_width, sim.maze_height = self.width, self.height
+        sim.maze_algorithm = self.algorithm
+        sim.racer_count = self.racers
+        sim.min_difficulty = self.min_difficulty
+        sim.shifting_walls = self.shifting_walls
+        if self.maze is not None:
+            sim.start_round(self.two_player_mode, self.warmup, prepared=self.maze)
+        else:
+            sim.start_round(self.two_player_mode, self.warmup, self.seed)
+        step = sim.step
+        dt = self.tick_seconds
+        for player1_moves, player2_moves in self.inputs():
+            step(player1_moves, player2_moves, dt)
+        return sim
+
+    def to_bytes(self) -> bytes:
+        flags = (_FLAG_TWO_PLAYER if self.two_player_mode else 0) | (_FLAG_WARMUP if self.warmup else 0)
+        flags |= (_FLAG_SHIFTING if self.shifting_walls else 0) | (_FLAG_MAZE if self.maze is not None else 0)
+        flags |= _ALGORITHMS.index(self.algorithm) << _ALGORITHM_SHIFT
+        maze = self.maze
+        left, right = (maze.left_entrance_y, maze.right_entrance_y) if maze is not None else (0, 0)
+        header = _HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, self.width, self.height, self.seed, flags,
+                              self.tick_seconds, self.racers, self.min_difficulty, left, right)
+        if maze is not None:
+            header += pack_cells(MazeGrid(maze.width, maze.height, array("B", maze.cells)))
+        data = bytearray()
+        for count, symbol in self.runs:
+            # LEB128 varint repeat count followed by the input byte
+            while count > 0x7F:
+                data.append(count & 0x7F | 0x80)
+                count >>= 7
+            data.append(count)
+            data.append(symbol)
+        # Movement inputs repeat a lot (press, cooldown, press...), so they deflate well
+        return header + zlib.compress(data, 9)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Replay":
+        (magic, version, width, height, seed, flags, tick_seconds, racers, min_difficulty,
+         left, right) = _HEADER.unpack_from(data)
+        if magic != REPLAY_MAGIC:
+            raise ValueError("Not an Amazing Maze replay")
+        if version != REPLAY_VERSION:
+            raise ValueError(f"Unsupported replay version {version}")
+        offset = _HEADER.size
+        maze = None
+        if flags & _FLAG_MAZE:
+            size = row_bytes(width) * height
+            cells = bytes(unpack_rows(data[offset:offset + size], width, height))
+            maze = loaded_round(seed, width, height, cells, left, right)
+            offset += size
+        algorithm = flags >> _ALGORITHM_SHIFT
+        if algorithm >= len(_ALGORITHMS):
+            raise ValueError(f"Replay uses an unknown maze algorithm ({algorithm})")
+        replay = cls(width, height, seed, bool(flags & _FLAG_TWO_PLAYER), bool(flags & _FLAG_WARMUP), tick_seconds,
+                     _ALGORITHMS[algorithm], racers, min_difficulty, bool(flags & _FLAG_SHIFTING), maze)
+
+        data = zlib.decompress(data[offset:])
+        pos = 0
+        while pos < len(data):
+            count = shift = 0
+            while True:
+                byte = data[pos]
+                pos += 1
+                count |= (byte & 0x7F) << shift
+                shift += 7
+                if byte < 0x80:
+                    break
+            replay.runs.append([count, data[pos]])
+            pos += 1
+        return replay
+
+    def save(self, path: str) -> None:
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path: str) -> "Replay":
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+def describe_result(sim: MazeSimulation) -> str:
+    if sim.game_state != GameState.RESULT:
+        return "unfinished"
+    if sim.player1_finished and sim.player2_finished:
+        return "draw"
+    return "player 1 wins" if sim.player1_finished else "player 2 wins"
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Play back a recorded round headless")
+    parser.add_argument("replay", help="replay file")
+    parser.add_argument("--repeat", type=int, default=1, help="play the replay N times (for profiling)")
+    args = parser.parse_args()
+
+    replay = Replay.load(args.replay)
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        sim = replay.play()
+    elapsed = time.perf_counter() - start
+
+    ticks = replay.ticks
+    game_seconds = ticks * replay.tick_seconds
+    print(f"{args.replay}: {replay.width}x{replay.height} {replay.algorithm} maze, seed {replay.seed}, {ticks} ticks, "
+          f"{len(replay.to_bytes())} bytes")
+    print(f"result: {describe_result(sim)} at {sim.game_timer:.2f}s, "
+          f"played {args.repeat * game_seconds / elapsed:,.0f}x faster than real time")
+
+if __name__ == "__main__":
+    main()
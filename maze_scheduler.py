@@ -0,0 +1,59 @@
+import time
+from collections.abc import Callable, Iterator
+from typing import Any
+
+class _Task:
+    __slots__ = ("iterator", "on_result", "max_per_run", "on_done")
+
+    def __init__(self, iterator: Iterator, on_result: Callable[[Any], None] | None,
+                 max_per_run: int | None, on_done: Callable[[], None] | None) -> None:
+        self.iterator = iterator
+        self.on_result = on_result
+        self.max_per_run = max_per_run
+        self.on_done = on_done
+
+class TimeSlicedScheduler:
+    def __init__(self, budget_ms: float = 4.0) -> None:
+        # Cooperative scheduler for long jobs written as generators: every run() resumes
+        # the queued tasks one yield at a time until the frame's time budget is spent
+        self.budget_ms = budget_ms
+        self.tasks: list[_Task] = []
+
+    def add(self, iterator: Iterator, on_result: Callable[[Any], None] | None = None,
+            max_per_run: int | None = None, on_done: Callable[[], None] | None = None) -> None:
+        # on_result gets every yielded value and on_done is called once the iterator is
+        # exhausted; max_per_run caps the yields per frame (to pace a job that would
+        # otherwise finish within a single frame)
+        self.tasks.append(_Task(iterator, on_result, max_per_run, on_done))
+
+    @property
+    def pending(self) -> bool:
+        return bool(self.tasks)
+
+    def clear(self) -> None:
+        self.tasks.clear()
+
+    def run(self, budget_ms: float | None = None) -> int:
+        # Resume tasks in the order they were added; returns the number of steps run.
+        # The first step always runs so a job makes progress even on an overrun frame.
+        budget = self.budget_ms if budget_ms is None else budget_ms
+        deadline = time.perf_counter() + budget / 1000
+        steps = 0
+        for task in list(self.tasks):
+            limit = task.max_per_run
+            done = 0
+            while limit is None or done < limit:
+                if steps and time.perf_counter() >= deadline:
+                    return steps
+                try:
+                    result = next(task.iterator)
+                except StopIteration:
+                    self.tasks.remove(task)
+                    if task.on_done is not None:
+                        task.on_done()
+                    break
+                done += 1
+                steps += 1
+                if task.on_result is not None:
+                    task.on_result(result)
+        return steps
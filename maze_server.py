@@ -0,0 +1,376 @@
+import argparse
+import asyncio
+import random
+import struct
+import time
+import zlib
+from array import array
+from collections import deque
+from collections.abc import Sequence
+
+from maze_format import pack_cells, unpack_rows
+from maze_grid import MazeGrid, Vec2I, parse_size
+from maze_replay import MASK_MOVES, moves_mask
+from maze_simulation import TICK_SECONDS, GameState, MazeSimulation
+
+# Wire format (TCP, little-endian): every message is a type byte and a payload length,
+# then the payload. The server owns the simulation; clients send the directions they
+# hold, and receive the maze once per round and then only what changed each tick.
+_FRAME = struct.Struct("<BI")
+
+# Client -> server
+MSG_JOIN = 1   # players (1 = against the server's AI, 2 = two clients), then the UTF-8 room name
+MSG_INPUT = 2  # held directions as a maze_replay 4-bit mask, applied every tick until changed
+MSG_PING = 3   # up to 8 bytes echoed in a PONG once the next tick has been sent
+
+# Server -> client
+MSG_MAZE = 16   # a new round: _ROUND, then the zlib-compressed 4-bit packed cells (see maze_format)
+MSG_MOVES = 17  # room tick, then (player, cell index) for each player that moved during it
+MSG_STATE = 18  # room tick, game state, finished flags and round time; sent when they change
+MSG_PONG = 19
+MSG_ERROR = 20  # UTF-8 reason; the server closes the connection after it
+
+_JOIN = struct.Struct("<B")
+_ROUND = struct.Struct("<BBIIQII")  # seat, players, width, height, seed, player 1 and 2 cells
+_TICK = struct.Struct("<I")
+_MOVE = struct.Struct("<BI")
+_STATE = struct.Struct("<IBBBf")
+
+DEFAULT_PORT = 7607
+MAX_PAYLOAD = 256  # largest message a client may send
+MAX_PINGS = 16  # unanswered pings kept per client
+MAX_WRITE_BUFFER = 1 << 20  # clients with this much unsent data are dropped
+MAX_TICK_LAG = 0.25  # seconds behind schedule before the tick loop skips ahead
+RESTART_TICKS = 180  # ticks between a round's result and the next maze
+
+def percentiles(samples: Sequence[float]) -> tuple[float, float, float]:
+    # p50, p95 and p99 in milliseconds
+    values = sorted(samples)
+    if not values:
+        return 0.0, 0.0, 0.0
+    last = len(values) - 1
+    return tuple(1000 * values[round(last * q)] for q in (0.50, 0.95, 0.99))
+
+class Connection:
+    def __init__(self, writer: asyncio.StreamWriter) -> None:
+        # One client: its seat in a room, the directions it holds and the messages
+        # queued for it this tick (written with one call per tick)
+        self.writer = writer
+        self.room: Room | None = None
+        self.seat = 0
+        self.held = 0
+        self.pings: list[bytes] = []
+        self.out = bytearray()
+
+    def send(self, kind: int, payload: bytes) -> None:
+        self.out += _FRAME.pack(kind, len(payload))
+        self.out += payload
+
+    def flush(self) -> bool:
+        # False once the client has stopped reading
+        if self.out:
+            self.writer.write(self.out)
+            self.out = bytearray()
+        return self.writer.transport.get_write_buffer_size() <= MAX_WRITE_BUFFER
+
+class Room:
+    def __init__(self, name: str, players: int, width: int, height: int, seed: int) -> None:
+        # One game: a MazeSimulation ticked by the server, with one seat per human
+        # player; a one-player room races the simulation's AI
+        self.name = name
+        self.players = players
+        self.sim = MazeSimulation(width, height, seed=seed)
+        self.seats: list[Connection | None] = [None] * players
+        self.playing = False
+        self.ticks = 0
+        self.restart_ticks = 0
+        self.positions = (-1, -1)
+        self.state: tuple | None = None
+
+    @property
+    def full(self) -> bool:
+        return all(self.seats)
+
+    @property
+    def empty(self) -> bool:
+        return not any(self.seats)
+
+    def join(self, conn: Connection) -> None:
+        seat = self.seats.index(None)
+        self.seats[seat] = conn
+        conn.room = self
+        conn.seat = seat + 1
+        if self.full:
+            self.start_round()
+
+    def leave(self, conn: Connection) -> None:
+        # The round is abandoned; it starts over when the seat is taken again
+        self.seats[conn.seat - 1] = None
+        conn.room = None
+        self.playing = False
+
+    def broadcast(self, kind: int, payload: bytes) -> None:
+        for conn in self.seats:
+            if conn is not None:
+                conn.send(kind, payload)
+
+    def start_round(self) -> None:
+        sim = self.sim
+        sim.start_round(two_player_mode=self.players == 2)
+        self.playing = True
+        self.restart_ticks = 0
+        self.positions = (sim.player1_index, sim.player2_index)
+        self.state = None
+
+        # The maze goes out once per round, packed and compressed
+        cells = zlib.compress(pack_cells(sim.maze))
+        for seat, conn in enumerate(self.seats, 1):
+            conn.send(MSG_MAZE, _ROUND.pack(seat, self.players, sim.maze_width, sim.maze_height, sim.seed,
+                                            sim.player1_index, sim.player2_index) + cells)
+        self.send_state()
+
+    def send_state(self) -> None:
+        sim = self.sim
+        state = (sim.game_state, sim.player1_finished, sim.player2_finished)
+        if state != self.state:
+            self.state = state
+            self.broadcast(MSG_STATE, _STATE.pack(self.ticks, sim.game_state.value, sim.player1_finished,
+                                                  sim.player2_finished, sim.game_timer))
+
+    def tick(self) -> None:
+        if not self.playing:
+            return
+        sim = self.sim
+        self.ticks += 1
+        if sim.game_state == GameState.RESULT:
+            self.restart_ticks += 1
+            if self.restart_ticks >= RESTART_TICKS:
+                self.start_round()
+            return
+
+        player2_moves = MASK_MOVES[self.seats[1].held] if self.players == 2 else ()
+        sim.step(MASK_MOVES[self.seats[0].held], player2_moves, TICK_SECONDS)
+
+        # Only the players that moved
+        player1, player2 = self.positions
+        if sim.player1_index != player1 or sim.player2_index != player2:
+            moves = bytearray(_TICK.pack(self.ticks))
+            if sim.player1_index != player1:
+                moves += _MOVE.pack(1, sim.player1_index)
+            if sim.player2_index != player2:
+                moves += _MOVE.pack(2, sim.player2_index)
+            self.positions = (sim.player1_index, sim.player2_index)
+            self.broadcast(MSG_MOVES, moves)
+        self.send_state()
+
+class MazeServer:
+    def __init__(self, width: int = 20, height: int = 15, seed: int | None = None, window: int = 3600) -> None:
+        # Authoritative server for any number of rooms, all ticked by one loop at the
+        # game's fixed tick rate; the last `window` ticks are kept for the statistics
+        self.width = width
+        self.height = height
+        self.seed_source = random.Random(seed)
+        self.rooms: dict[str, Room] = {}
+        self.connections: set[Connection] = set()
+        self.tick_times: deque[float] = deque(maxlen=window)
+        self.tick_lateness: deque[float] = deque(maxlen=window)
+        self.ticks = 0
+        self.bytes_sent = 0
+        self.server: asyncio.Server | None = None
+        self.ticker: asyncio.Task | None = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = DEFAULT_PORT) -> int:
+        # Listen and start ticking; returns the port (useful with port 0)
+        self.server = await asyncio.start_server(self.handle, host, port)
+        self.ticker = asyncio.create_task(self.run_ticks())
+        return self.server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        self.ticker.cancel()
+        self.server.close()
+        for conn in list(self.connections):
+            conn.writer.transport.abort()
+        while self.connections:
+            await asyncio.sleep(0)  # let handle() see the disconnects and clean up
+        await self.server.wait_closed()
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        conn = Connection(writer)
+        self.connections.add(conn)
+        try:
+            while True:
+                kind, length = _FRAME.unpack(await reader.readexactly(_FRAME.size))
+                if length > MAX_PAYLOAD:
+                    self.refuse(conn, "message too long")
+                    break
+                if not self.dispatch(conn, kind, await reader.readexactly(length)):
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self.disconnect(conn)
+            writer.close()
+
+    def dispatch(self, conn: Connection, kind: int, payload: bytes) -> bool:
+        # Apply one client message; False closes the connection
+        if kind == MSG_INPUT and len(payload) == 1:
+            conn.held = payload[0] & 15
+        elif kind == MSG_PING and len(payload) <= 8:
+            if len(conn.pings) < MAX_PINGS:
+                conn.pings.append(payload)
+        elif kind == MSG_JOIN and conn.room is None and payload:
+            players = payload[0]
+            name = payload[1:].decode("utf-8", "replace")
+            if players not in (1, 2):
+                return self.refuse(conn, "players must be 1 or 2")
+            room = self.rooms.get(name)
+            if room is None:
+                room = self.rooms[name] = Room(name, players, self.width, self.height,
+                                               self.seed_source.getrandbits(64))
+            elif room.players != players or room.full:
+                return self.refuse(conn, f"room {name!r} is full")
+            room.join(conn)
+        else:
+            return self.refuse(conn, "unexpected message")
+        return True
+
+    def refuse(self, conn: Connection, reason: str) -> bool:
+        conn.send(MSG_ERROR, reason.encode())
+        conn.flush()
+        return False
+
+    def disconnect(self, conn: Connection) -> None:
+        self.connections.discard(conn)
+        room = conn.room
+        if room is not None:
+            room.leave(conn)
+            if room.empty:
+                del self.rooms[room.name]
+
+    def tick(self) -> None:
+        # Step every room, then send each client everything queued for it at once
+        for room in self.rooms.values():
+            room.tick()
+        for conn in list(self.connections):
+            for token in conn.pings:
+                conn.send(MSG_PONG, token)
+            conn.pings.clear()
+            self.bytes_sent += len(conn.out)
+            if not conn.flush():
+                conn.writer.transport.abort()  # too slow to keep up: handle() cleans up
+        self.ticks += 1
+
+    async def run_ticks(self) -> None:
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
+        while True:
+            next_tick += TICK_SECONDS
+            delay = next_tick - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            lateness = loop.time() - next_tick
+            self.tick_lateness.append(max(lateness, 0.0))
+            start = time.perf_counter()
+            self.tick()
+            self.tick_times.append(time.perf_counter() - start)
+            if lateness > MAX_TICK_LAG:
+                next_tick = loop.time()  # overloaded: drop the backlog rather than burst
+
+    def stats(self) -> dict:
+        work = percentiles(self.tick_times)
+        late = percentiles(self.tick_lateness)
+        return {
+            "rooms": len(self.rooms), "clients": len(self.connections), "ticks": self.ticks,
+            "bytes_sent": self.bytes_sent,
+            "tick_ms": {"p50": work[0], "p95": work[1], "p99": work[2]},
+            "lateness_ms": {"p50": late[0], "p95": late[1], "p99": late[2]},
+        }
+
+class MazeClient:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        # Headless client: mirrors the room's round from the server's messages
+        self.reader = reader
+        self.writer = writer
+        self.seat = 0
+        self.players = 0
+        self.seed = 0
+        self.maze: MazeGrid | None = None
+        self.positions = [0, 0]
+        self.game_state = GameState.TITLE
+        self.finished = (False, False)
+        self.game_timer = 0.0
+        self.ticks = 0
+        self.rounds = 0
+
+    @classmethod
+    async def connect(cls, room: str, players: int = 1, host: str = "127.0.0.1",
+                      port: int = DEFAULT_PORT) -> "MazeClient":
+        reader, writer = await asyncio.open_connection(host, port)
+        client = cls(reader, writer)
+        client.send(MSG_JOIN, _JOIN.pack(players) + room.encode())
+        return client
+
+    def send(self, kind: int, payload: bytes) -> None:
+        self.writer.write(_FRAME.pack(kind, len(payload)) + payload)
+
+    def send_input(self, moves: Sequence[Vec2I]) -> None:
+        self.send(MSG_INPUT, bytes((moves_mask(moves),)))
+
+    def ping(self, token: bytes) -> None:
+        self.send(MSG_PING, token)
+
+    async def receive(self) -> tuple[int, bytes]:
+        kind, length = _FRAME.unpack(await self.reader.readexactly(_FRAME.size))
+        payload = await self.reader.readexactly(length)
+        self.apply(kind, payload)
+        return kind, payload
+
+    def apply(self, kind: int, payload: bytes) -> None:
+        if kind == MSG_MAZE:
+            self.seat, self.players, width, height, self.seed, player1, player2 = _ROUND.unpack_from(payload)
+            cells = unpack_rows(zlib.decompress(payload[_ROUND.size:]), width, height)
+            self.maze = MazeGrid(width, height, array("B", cells))
+            self.positions = [player1, player2]
+            self.rounds += 1
+        elif kind == MSG_MOVES:
+            (self.ticks,) = _TICK.unpack_from(payload)
+            for player, index in _MOVE.iter_unpack(payload[_TICK.size:]):
+                self.positions[player - 1] = index
+        elif kind == MSG_STATE:
+            self.ticks, state, finished1, finished2, self.game_timer = _STATE.unpack(payload)
+            self.game_state = GameState(state)
+            self.finished = (bool(finished1), bool(finished2))
+        elif kind == MSG_ERROR:
+            raise ConnectionError(payload.decode("utf-8", "replace"))
+
+    async def close(self) -> None:
+        self.writer.close()
+        await self.writer.wait_closed()
+
+async def serve(host: str, port: int, width: int, height: int, seed: int | None, report_seconds: float) -> None:
+    server = MazeServer(width, height, seed)
+    port = await server.start(host, port)
+    print(f"Serving {width}x{height} mazes on {host}:{port}")
+    while True:
+        await asyncio.sleep(report_seconds)
+        stats = server.stats()
+        print(f"{stats['rooms']} rooms, {stats['clients']} clients, tick p50/p99 "
+              f"{stats['tick_ms']['p50']:.3f}/{stats['tick_ms']['p99']:.3f} ms, "
+              f"lateness p99 {stats['lateness_ms']['p99']:.3f} ms")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Authoritative Amazing Maze server (asyncio, TCP)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--size", type=parse_size, default="20x15", help="maze size as WIDTHxHEIGHT")
+    parser.add_argument("--seed", type=int, help="seed for the rooms' maze seeds")
+    parser.add_argument("--report", type=float, default=10.0, metavar="SECONDS", help="statistics interval")
+    args = parser.parse_args()
+    width, height = args.size
+    try:
+        asyncio.run(serve(args.host, args.port, width, height, args.seed, args.report))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,472 @@
+import random
+from array import array
+from collections.abc import Iterator, Sequence
+from enum import Enum
+from typing import NamedTuple
+
+from maze_analysis import JunctionGraph, iter_junction_graph
+from maze_generators import get_generator
+from maze_grid import DIR_BIT, CellPath, MazeGrid, Vec2I, direction_index, iter_carve_dfs, shift_walls
+from maze_pathfinding import descend, distance_field, find_path, iter_distance_field
+from maze_racers import AIRacers
+from maze_replanning import SplicedPath
+
+# Game logic timing (seconds)
+AI_MOVE_INTERVAL = 0.25
+KEY_COOLDOWN = 0.1
+WARMUP_TIME = 3.0
+TICK_SECONDS = 1 / 60
+MAX_ENTRANCE_TRIES = 64  # entrance pairs tried per maze for a minimum difficulty
+CARVE_BATCH = 256  # cells carved per step of an incremental (resumable) generation
+SHIFT_INTERVAL = 1.5  # seconds between wall shifts in shifting-walls mode
+CELLS_PER_SHIFT = 100  # each shift moves one wall per this many cells (at least one)
+
+# Movement directions, in the order the keyboard handlers test them
+LEFT = Vec2I(-1, 0)
+RIGHT = Vec2I(1, 0)
+UP = Vec2I(0, -1)
+DOWN = Vec2I(0, 1)
+
+class GameState(Enum):
+    TITLE = 0
+    WARMUP = 1
+    PLAYING = 2
+    PAUSED = 3
+    RESULT = 4
+
+class PreparedMaze(NamedTuple):
+    # A round's maze generated ahead of time: the carved cells, the entrance rows and
+    # the round RNG state right after choosing them
+    seed: int
+    width: int
+    height: int
+    cells: bytes
+    left_entrance_y: int
+    right_entrance_y: int
+    rng_state: tuple
+
+def entrance_cells(grid: MazeGrid) -> list[int]:
+    # Every cell an entrance can open from: the left and right columns, minus the corners
+    w = grid.width
+    rows = range(1, grid.height - 1)
+    return [y * w for y in rows] + [y * w + w - 1 for y in rows]
+
+def choose_entrances(grid: MazeGrid, rng: random.Random, min_difficulty: float = 0.0,
+                     graph: JunctionGraph | None = None) -> tuple[int, int]:
+    # Left and right entrance rows. With a minimum difficulty (see JunctionGraph.difficulty)
+    # pairs are drawn until one is hard enough, up to MAX_ENTRANCE_TRIES, keeping the
+    # hardest; without one this is the original pair of draws. graph, when given, is
+    # the maze's graph with entrance_cells() as terminals, already built.
+    left = rng.randint(1, grid.height - 2)
+    right = rng.randint(1, grid.height - 2)
+    if min_difficulty <= 0:
+        return left, right
+
+    w = grid.width
+    graph = graph or JunctionGraph(grid, entrance_cells(grid))
+    best, best_score = (left, right), graph.difficulty(left * w, right * w + w - 1)
+    for _ in range(MAX_ENTRANCE_TRIES - 1):
+        if best_score >= min_difficulty:
+            break
+        left = rng.randint(1, grid.height - 2)
+        right = rng.randint(1, grid.height - 2)
+        score = graph.difficulty(left * w, right * w + w - 1)
+        if score > best_score:
+            best, best_score = (left, right), score
+    return best
+
+def prepare_maze(width: int, height: int, seed: int, algorithm: str = "dfs",
+                 min_difficulty: float = 0.0) -> PreparedMaze:
+    # Same draws, in the same order, as generate_maze followed by setup_game
+    rng = random.Random(seed)
+    grid = MazeGrid(width, height)
+    get_generator(algorithm)(grid, rng)
+    left_entrance_y, right_entrance_y = choose_entrances(grid, rng, min_difficulty)
+    return PreparedMaze(seed, width, height, grid.tobytes(), left_entrance_y, right_entrance_y, rng.getstate())
+
+class MazeSimulation:
+    # Pure game logic: no display, fonts or pygame. A front-end (or a batch
+    # runner) calls step() once per tick with the directions each player pressed.
+    def __init__(self, maze_width: int = 20, maze_height: int = 15, seed: int | None = None,
+                 algorithm: str = "dfs", racers: int = 0, min_difficulty: float = 0.0,
+                 shifting_walls: bool = False) -> None:
+        # Randomness: every round reseeds rng from its own seed, drawn from seed_source
+        # unless given, so any round can be reproduced from (seed, inputs)
+        self.seed_source = random.Random(seed)
+        self.seed = 0
+        self.rng = random.Random()
+        self.input_recorder = None  # object with record(player1_moves, player2_moves), e.g. a Replay
+
+        # Maze parameters
+        self.maze_width = maze_width
+        self.maze_height = maze_height
+        self.maze = MazeGrid(self.maze_width, self.maze_height)
+        get_generator(algorithm)  # fail early on an unknown name
+        self.maze_algorithm = algorithm  # a maze_generators.GENERATORS name
+        self.min_difficulty = min_difficulty  # entrances are chosen to make the maze at least this hard
+        self.carving: Iterator[array] | None = None  # set while a maze is generated incrementally
+        self.carve_batch = CARVE_BATCH
+
+        # Game state
+        self.game_state = GameState.TITLE
+        self.visited_cells = 0
+        self.ticks = 0
+
+        # Player and AI variables. Positions are flat cell indices (y * maze_width + x),
+        # so moving allocates nothing; player1_pos/player2_pos are Vec2I views of them.
+        self.player1_index = 0
+        self.player2_index = 0
+        self._player1_pos: Vec2I | None = None
+        self._player2_pos: Vec2I | None = None
+        self.player1_start = Vec2I(0, 0)
+        self.player2_start = Vec2I(0, 0)
+        self.player1_target = Vec2I(0, 0)
+        self.player2_target = Vec2I(0, 0)
+        self.player1_target_index = 0
+        self.player2_target_index = 0
+        self.maze_steps = self.maze.neighbour_offsets()  # flat-index delta per direction number
+        self.player1_finished = False
+        self.player2_finished = False
+        self.game_timer = 0.0
+        self.warmup_timer = 0.0
+        self.ai_move_timer = 0.0
+        self.player1_distances = array("i")
+        self.player2_distances = array("i")
+        self.distances_stale = False  # walls shifted since the fields were computed, see exit_distances
+        self.player1_key_timer = 0.0
+        self.player2_key_timer = 0.0
+
+        # Game mode
+        self.two_player_mode = False
+
+        # Extra AI racers in single-player mode, all descending player 2's distance field
+        self.racer_count = racers
+        self.racers: AIRacers | None = None
+
+        # Shifting-walls mode: walls move every SHIFT_INTERVAL seconds of play, and the
+        # computer follows an incremental planner instead of the (then stale) distance field
+        if shifting_walls and racers:
+            raise ValueError("extra racers share a fixed distance field and cannot play with shifting walls")
+        self.shifting_walls = shifting_walls
+        self.shift_timer = 0.0
+        self.wall_rng = random.Random()
+        self.planner: SplicedPath | None = None
+
+    @property
+    def player1_pos(self) -> Vec2I:
+        # Built on first use after a move, then shared until the next one
+        if self._player1_pos is None:
+            self._player1_pos = Vec2I(self.player1_index % self.maze_width, self.player1_index // self.maze_width)
+        return self._player1_pos
+
+    @player1_pos.setter
+    def player1_pos(self, pos: Vec2I) -> None:
+        self.player1_index = pos.y * self.maze_width + pos.x
+        self._player1_pos = pos
+
+    @property
+    def player2_pos(self) -> Vec2I:
+        if self._player2_pos is None:
+            self._player2_pos = Vec2I(self.player2_index % self.maze_width, self.player2_index // self.maze_width)
+        return self._player2_pos
+
+    @player2_pos.setter
+    def player2_pos(self, pos: Vec2I) -> None:
+        self.player2_index = pos.y * self.maze_width + pos.x
+        self._player2_pos = pos
+
+    def generate_maze(self) -> None:
+        # Carve a new maze into a compact one-byte-per-cell grid
+        self.maze = MazeGrid(self.maze_width, self.maze_height)
+        self.visited_cells = get_generator(self.maze_algorithm)(self.maze, self.rng)
+
+    def carve_incrementally(self, batch: int) -> Iterator[array]:
+        # generate_maze + setup_game as a resumable job: each next() carves `batch` more
+        # cells and returns their indices, and the round is set up after the last one.
+        # It makes the same rng draws, so the finished round is the one start_round
+        # would have produced for the seed.
+        self.maze = MazeGrid(self.maze_width, self.maze_height)
+        self.visited_cells = 0
+        return self._carve(batch)
+
+    def _carve(self, batch: int) -> Iterator[array]:
+        for carved in iter_carve_dfs(self.maze, self.rng, batch):
+            self.visited_cells += len(carved)
+            yield carved
+
+        # The junction graph for a minimum difficulty and the distance fields are as
+        # slow as the carving on big mazes, so they are resumable too; these steps
+        # carve nothing. Building the graph draws nothing from rng, so doing it before
+        # setup_game leaves the round unchanged.
+        graph = None
+        if self.min_difficulty > 0:
+            for graph in iter_junction_graph(self.maze, entrance_cells(self.maze), batch * 16):
+                yield array("I")
+        self.setup_game(distance_fields=False, graph=graph)
+
+        fields = []
+        for target in (self.player1_target_index, self.player2_target_index):
+            for field in iter_distance_field(self.maze, target, batch * 16):
+                yield array("I")
+            fields.append(field)
+        self.player1_distances, self.player2_distances = fields
+        self.spawn_racers()
+        self.start_planner()
+        self.carving = None
+
+    def setup_game(self, distance_fields: bool = True, graph: JunctionGraph | None = None) -> None:
+        # Set up entrances and player positions
+        # Randomly choose entrance positions on left and right sides
+        left_entrance_y, right_entrance_y = choose_entrances(self.maze, self.rng, self.min_difficulty, graph)
+        self.place_entrances(left_entrance_y, right_entrance_y, distance_fields)
+
+    def place_entrances(self, left_entrance_y: int, right_entrance_y: int, distance_fields: bool = True) -> None:
+        # Create openings at entrances
+        self.maze[left_entrance_y * self.maze_width] |= CellPath.WEST.value
+        self.maze[right_entrance_y * self.maze_width + (self.maze_width - 1)] |= CellPath.EAST.value
+
+        # Set player starting positions
+        self.player1_pos = Vec2I(0, left_entrance_y)
+        self.player2_pos = Vec2I(self.maze_width - 1, right_entrance_y)
+
+        self.player1_start = Vec2I(0, left_entrance_y)
+        self.player2_start = Vec2I(self.maze_width - 1, right_entrance_y)
+
+        # Set targets (opposite sides)
+        self.player1_target = Vec2I(self.maze_width - 1, right_entrance_y)
+        self.player2_target = Vec2I(0, left_entrance_y)
+        self.player1_target_index = right_entrance_y * self.maze_width + self.maze_width - 1
+        self.player2_target_index = left_entrance_y * self.maze_width
+        self.maze_steps = self.maze.neighbour_offsets()
+
+        self.player1_finished = False
+        self.player2_finished = False
+        self.game_timer = 0.0
+        self.warmup_timer = 0.0
+        self.ai_move_timer = 0.0
+        self.player1_key_timer = 0.0
+        self.player2_key_timer = 0.0
+        self.ticks = 0
+        self.shift_timer = 0.0
+
+        # Distance fields towards each exit, as the maze is when the round starts
+        self.racers = None
+        self.planner = None
+        self.distances_stale = False
+        if distance_fields:
+            self.player1_distances = distance_field(self.maze, self.player1_target_index)
+            self.player2_distances = distance_field(self.maze, self.player2_target_index)
+            self.spawn_racers()
+            self.start_planner()
+
+    def spawn_racers(self) -> None:
+        # The racers head for the computer's exit, so they share its distance field
+        if self.racer_count and not self.two_player_mode:
+            self.racers = AIRacers.spawn(self.maze, self.player2_distances, self.racer_count, self.seed,
+                                         AI_MOVE_INTERVAL)
+
+    def start_planner(self) -> None:
+        # Shifting walls: the computer's planner starts from its distance field, and the
+        # shifts draw from their own generator so the round's rng is left alone
+        if self.shifting_walls:
+            self.wall_rng.seed(f"walls:{self.seed}")
+            if not self.two_player_mode:
+                self.planner = SplicedPath(self.maze, self.player2_target_index, self.player2_index,
+                                           self.player2_distances)
+
+    def shift_walls(self) -> list[int]:
+        # Move some walls (see maze_grid.shift_walls), repairing the computer's path
+        # after each one; returns the top-left cells of the 2x2 blocks that changed.
+        # The exit distance fields are only marked stale: one rotation can reroute a
+        # whole branch, so they are recomputed when next asked for, not wall by wall.
+        changed = []
+        for _ in range(max(1, len(self.maze) // CELLS_PER_SHIFT)):
+            for index in shift_walls(self.maze, self.wall_rng, 1):
+                if self.planner is not None:
+                    self.planner.splice_block(index)
+                changed.append(index)
+        if changed:
+            self.distances_stale = True
+        return changed
+
+    def exit_distances(self, player: int = 2) -> array:
+        # The given player's exit distance field, recomputed (both fields) if walls
+        # shifted since they were last computed
+        if self.distances_stale:
+            self.player1_distances = distance_field(self.maze, self.player1_target_index)
+            self.player2_distances = distance_field(self.maze, self.player2_target_index)
+            self.distances_stale = False
+        return self.player1_distances if player == 1 else self.player2_distances
+
+    def start_round(self, two_player_mode: bool, warmup: bool = True, seed: int | None = None,
+                    prepared: PreparedMaze | None = None, incremental: bool = False) -> None:
+        # A prepared maze (e.g. from a MazePrefetcher) replaces generate_maze/setup_game
+        # and leaves the round in exactly the state they would have produced. With
+        # incremental=True a DFS maze is left to the caller to carve through
+        # self.carving, carve_batch cells per step (see carve_incrementally); the round
+        # is on hold until it is done.
+        if seed is not None and not 0 <= seed < 1 << 64:
+            raise ValueError(f"round seeds are 64-bit unsigned integers, got {seed}")
+        self.two_player_mode = two_player_mode
+        self.carving = None
+        self.input_recorder = None  # a recorder belongs to the round it was attached to
+        if prepared is not None:
+            self.maze_width, self.maze_height = prepared.width, prepared.height
+            self.seed = prepared.seed
+            self.rng.setstate(prepared.rng_state)
+            self.maze = MazeGrid(prepared.width, prepared.height, array("B", prepared.cells))
+            self.visited_cells = len(self.maze)
+            self.place_entrances(prepared.left_entrance_y, prepared.right_entrance_y)
+        else:
+            self.seed = self.seed_source.getrandbits(64) if seed is None else seed
+            self.rng.seed(self.seed)
+            if incremental and self.maze_algorithm == "dfs":
+                self.carving = self.carve_incrementally(self.carve_batch)
+            else:
+                self.generate_maze()
+                self.setup_game()
+        self.game_state = GameState.WARMUP if warmup else GameState.PLAYING
+
+    def player_ready(self, player: int, dt: float = TICK_SECONDS) -> bool:
+        # Whether the next step(dt) will apply this player's moves (key cooldown elapsed)
+        key_timer = self.player1_key_timer if player == 1 else self.player2_key_timer
+        return self.game_state == GameState.PLAYING and key_timer + dt > KEY_COOLDOWN
+
+    def can_move(self, from_pos: Vec2I, direction: Vec2I) -> bool:
+        d = direction_index(direction)
+        return d >= 0 and self.can_step(from_pos.y * self.maze_width + from_pos.x, d)
+
+    def can_step(self, index: int, d: int) -> bool:
+        # Whether the cell at index has a passage in direction number d; the entrance
+        # openings lead off the maze, so they do not count
+        if not self.maze[index] & DIR_BIT[d]:
+            return False
+        if d == 1:
+            return index % self.maze_width != self.maze_width - 1
+        if d == 3:
+            return index % self.maze_width != 0
+        return True
+
+    def move_player(self, player: int, direction: Vec2I) -> None:
+        d = direction_index(direction)
+        if d < 0:
+            return
+
+        if player == 1:
+            if self.can_step(self.player1_index, d):
+                self.player1_index += self.maze_steps[d]
+                self._player1_pos = None
+                # Check if player reached target
+                if self.player1_index == self.player1_target_index:
+                    self.player1_finished = True
+        elif self.can_step(self.player2_index, d):
+            self.player2_index += self.maze_steps[d]
+            self._player2_pos = None
+            if self.player2_index == self.player2_target_index:
+                self.player2_finished = True
+
+    def get_distance(self, pos_a: Vec2I, pos_b: Vec2I) -> int:
+        return abs(pos_a.x - pos_b.x) + abs(pos_a.y - pos_b.y)
+
+    def find_path(self, start: Vec2I, target: Vec2I) -> list[Vec2I]:
+        return find_path(self.maze, start, target)
+
+    def distance_to_exit(self, pos: Vec2I, player: int = 2) -> int:
+        # Moves from pos to the given player's exit, or -1 if it cannot be reached
+        return self.exit_distances(player)[pos.y * self.maze_width + pos.x]
+
+    def move_ai(self) -> None:
+        if self.planner is not None:
+            next_index = self.planner.next_cell()
+            if next_index >= 0:
+                self.planner.move_to(next_index)
+        else:
+            next_index = descend(self.maze, self.exit_distances(), self.player2_index)
+
+        if next_index >= 0:
+            self.player2_index = next_index
+            self._player2_pos = None
+            if next_index == self.player2_target_index:
+                self.player2_finished = True
+        else:
+            target = self.player2_target
+            current_pos = self.player2_pos
+            possible_moves = []
+            toward_target_moves = []
+
+            for move in [LEFT, RIGHT, UP, DOWN]:
+                if self.can_move(current_pos, move):
+                    possible_moves.append(move)
+
+            if not possible_moves:
+                return
+
+            for move in possible_moves:
+                new_pos: Vec2I = current_pos + move
+                dist_before = abs(current_pos.x - target.x) + abs(current_pos.y - target.y)
+                dist_after = abs(new_pos.x - target.x) + abs(new_pos.y - target.y)
+
+                if dist_after < dist_before:
+                    toward_target_moves.append(move)
+
+            if toward_target_moves:
+                best_move = self.rng.choice(toward_target_moves)
+            else:
+                best_move = self.rng.choice(possible_moves)
+
+            new_ai_pos = current_pos + best_move
+            if new_ai_pos == target:
+                self.player2_finished = True
+            self.player2_pos = new_ai_pos
+
+    def step(self, player1_moves: Sequence[Vec2I] = (), player2_moves: Sequence[Vec2I] = (),
+             dt: float = TICK_SECONDS) -> None:
+        # Advance the round by one tick of dt seconds. The move sequences hold the
+        # directions held down this tick; player 2's are ignored when the AI plays.
+        if self.carving is not None:
+            return  # no time passes until the maze is complete, so replays stay in step
+        if self.input_recorder is not None:
+            # Only inputs that take effect this tick matter for playback
+            self.input_recorder.record(
+                player1_moves if self.player_ready(1, dt) else (),
+                player2_moves if self.two_player_mode and self.player_ready(2, dt) else ())
+        if self.game_state == GameState.WARMUP:
+            # Check if still in warm-up phase
+            self.warmup_timer += dt
+            if self.warmup_timer >= WARMUP_TIME:
+                self.game_state = GameState.PLAYING
+        elif self.game_state == GameState.PLAYING:
+            self.ticks += 1
+            self.game_timer += dt
+            self.player1_key_timer += dt
+            self.player2_key_timer += dt
+            if self.shifting_walls:
+                self.shift_timer += dt
+                if self.shift_timer > SHIFT_INTERVAL:
+                    self.shift_walls()
+                    self.shift_timer = 0.0
+
+            # Player 1's movement with cooldown
+            if player1_moves and self.player1_key_timer > KEY_COOLDOWN:
+                for direction in player1_moves:
+                    self.move_player(1, direction)
+                self.player1_key_timer = 0.0  # Reset cooldown timer
+
+            if self.two_player_mode:
+                # Player 2's movement with cooldown
+                if player2_moves and self.player2_key_timer > KEY_COOLDOWN:
+                    for direction in player2_moves:
+                        self.move_player(2, direction)
+                    self.player2_key_timer = 0.0  # Reset cooldown timer
+            else:
+                # AI movement
+                self.ai_move_timer += dt
+                if self.ai_move_timer > AI_MOVE_INTERVAL:
+                    self.move_ai()
+                    self.ai_move_timer = 0.0
+                if self.racers is not None:
+                    self.racers.step(dt)
+
+            # Check game over
+            if self.player1_finished or self.player2_finished or (self.racers is not None and self.racers.finished):
+                self.game_state = GameState.RESULT
@@ -0,0 +1,127 @@
+import random
+from collections import OrderedDict
+from collections.abc import Sequence
+
+from maze_generators import get_generator
+from maze_grid import DIR_BIT, DIR_DX, DIR_DY, EAST, WEST, MazeGrid, Vec2I, direction_index
+from maze_simulation import KEY_COOLDOWN, TICK_SECONDS, WARMUP_TIME, GameState
+
+STREAM_CACHE_CHUNKS = 8  # chunks kept generated: the ones in view plus room to turn back
+
+# Endless runs: the maze collapses from the west, a little faster every second
+COLLAPSE_HEAD_START = 8  # columns between the collapse and the entrance when the run starts
+COLLAPSE_SPEED = 0.5  # columns per second at the start
+COLLAPSE_ACCELERATION = 0.005  # columns per second gained every second
+
+class StreamingMaze:
+    def __init__(self, height: int, chunk_width: int, seed: int, algorithm: str = "dfs",
+                 max_chunks: int = STREAM_CACHE_CHUNKS) -> None:
+        # A maze `height` rows tall that goes on to the east forever, in chunks of
+        # chunk_width columns: chunk cx holds columns cx * chunk_width and up. Each chunk
+        # is a perfect maze carved by a generator seeded from (seed, cx) alone, so it
+        # comes out the same whenever it is made. Neighbouring chunks are joined by one
+        # doorway whose row is seeded from their boundary, so both sides agree on it
+        # without the other being generated, and the whole stream is one perfect maze.
+        # Only the max_chunks most recently used chunks are kept; any other is generated
+        # again when needed, so memory does not grow with the distance travelled.
+        self.height = height
+        self.chunk_width = chunk_width
+        self.seed = seed
+        self.generator = get_generator(algorithm)
+        self.max_chunks = max_chunks
+        self.chunks: OrderedDict[int, MazeGrid] = OrderedDict()
+        self.generated = 0
+        self.evicted = 0
+
+    def door_row(self, cx: int) -> int:
+        # Row of the doorway from chunk cx to chunk cx + 1; door_row(-1) is the entrance
+        return random.Random(f"door:{self.seed}:{cx}").randrange(self.height)
+
+    def chunk(self, cx: int) -> MazeGrid:
+        grid = self.chunks.get(cx)
+        if grid is not None:
+            self.chunks.move_to_end(cx)
+            return grid
+
+        grid = self.generate_chunk(cx)
+        self.chunks[cx] = grid
+        if len(self.chunks) > self.max_chunks:
+            self.chunks.popitem(last=False)
+            self.evicted += 1
+        return grid
+
+    def generate_chunk(self, cx: int) -> MazeGrid:
+        if cx < 0:
+            raise ValueError(f"The maze starts at chunk 0, not {cx}")
+        w = self.chunk_width
+        grid = MazeGrid(w, self.height)
+        self.generator(grid, random.Random(f"chunk:{self.seed}:{cx}"))
+        grid[self.door_row(cx - 1) * w] |= WEST
+        grid[self.door_row(cx) * w + w - 1] |= EAST
+        self.generated += 1
+        return grid
+
+    def cell(self, x: int, y: int) -> int:
+        cx, column = divmod(x, self.chunk_width)
+        return self.chunk(cx)[y * self.chunk_width + column]
+
+    def can_step(self, x: int, y: int, d: int) -> bool:
+        # Whether cell (x, y) has a passage in direction number d; doorways between
+        # chunks are passages like any other, only the entrance leads off the maze
+        return bool(self.cell(x, y) & DIR_BIT[d]) and not (d == 3 and x == 0)
+
+class EndlessRun:
+    # Endless-runner logic on a StreamingMaze, with no display like MazeSimulation: one
+    # player heads east from the entrance while the maze collapses behind them, and the
+    # run ends when the collapse catches up. The first chunk is as wide as a regular
+    # maze, so its doorway east is where the regular exit would be.
+    def __init__(self, height: int = 15, chunk_width: int = 20, seed: int | None = None,
+                 algorithm: str = "dfs", max_chunks: int = STREAM_CACHE_CHUNKS) -> None:
+        self.seed = random.getrandbits(64) if seed is None else seed
+        self.stream = StreamingMaze(height, chunk_width, self.seed, algorithm, max_chunks)
+        self.x = 0
+        self.y = self.stream.door_row(-1)
+        self.furthest = 0  # the column reached furthest east: the run's score
+        self.moves = 0  # cells travelled
+        self.collapse = float(-COLLAPSE_HEAD_START)  # columns west of this have collapsed
+        self.game_state = GameState.WARMUP
+        self.ticks = 0
+        self.game_timer = 0.0
+        self.warmup_timer = 0.0
+        self.key_timer = 0.0
+
+    @property
+    def pos(self) -> Vec2I:
+        return Vec2I(self.x, self.y)
+
+    def move(self, d: int) -> bool:
+        # Step the player one cell in direction number d if a passage leads there
+        if not self.stream.can_step(self.x, self.y, d):
+            return False
+        self.x += DIR_DX[d]
+        self.y += DIR_DY[d]
+        self.moves += 1
+        if self.x > self.furthest:
+            self.furthest = self.x
+        return True
+
+    def step(self, moves: Sequence[Vec2I] = (), dt: float = TICK_SECONDS) -> None:
+        # Advance the run by one tick of dt seconds with the directions held this tick
+        if self.game_state == GameState.WARMUP:
+            self.warmup_timer += dt
+            if self.warmup_timer >= WARMUP_TIME:
+                self.game_state = GameState.PLAYING
+        elif self.game_state == GameState.PLAYING:
+            self.ticks += 1
+            self.game_timer += dt
+            self.key_timer += dt
+            if moves and self.key_timer > KEY_COOLDOWN:
+                for direction in moves:
+                    d = direction_index(direction)
+                    if d >= 0:
+                        self.move(d)
+                self.key_timer = 0.0
+
+            self.collapse += (COLLAPSE_SPEED + COLLAPSE_ACCELERATION * self.game_timer) * dt
+            if self.collapse > self.x:
+                self.game_state = GameState.RESULT
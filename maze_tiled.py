@@ -0,0 +1,266 @@
+import argparse
+import os
+import random
+import time
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import NamedTuple
+
+from maze_format import save_maze
+from maze_generators import GENERATORS, get_generator
+from maze_grid import EAST, NORTH, SOUTH, WEST, MazeGrid, parse_size
+
+# A single generator run is sequential, so a huge maze is carved as square tiles, one
+# per task across worker processes, into one grid in shared memory. Each tile is a
+# perfect maze seeded from its position, so the result does not depend on the number
+# of workers; a spanning tree over the tiles then opens one doorway per tree edge.
+TILE_SIZE = 1024  # cells per tile side: about a second of DFS carving per task
+
+_shared: shared_memory.SharedMemory | None = None  # the grid being carved or checked, in a worker
+
+class MazeCheck(NamedTuple):
+    connected: bool  # every cell reaches every other one
+    acyclic: bool  # through exactly one route
+    consistent: bool  # every passage is open from both of its cells
+
+    @property
+    def perfect(self) -> bool:
+        return self.connected and self.acyclic and self.consistent
+
+class SharedGrid:
+    def __init__(self, width: int, height: int, name: str | None = None) -> None:
+        # A MazeGrid whose cells live in a shared memory block, so worker processes can
+        # carve and check parts of it in place. The creator (name is None) unlinks the
+        # block on close(); NumPy views of the cells must be dropped before that.
+        self.shm = shared_memory.SharedMemory(name=name, create=name is None, size=max(width * height, 1))
+        self.owner = name is None
+        self.grid = MazeGrid(width, height, self.shm.buf[:width * height])
+
+    def __enter__(self) -> "SharedGrid":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self.grid is None:
+            return
+        self.grid.cells.release()
+        self.grid = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+    def to_grid(self) -> MazeGrid:
+        # A copy in a regular array, e.g. for MazeSimulation
+        cells = array("B")
+        cells.frombytes(self.grid.cells)
+        return MazeGrid(self.grid.width, self.grid.height, cells)
+
+def tiles(width: int, height: int, tile_size: int) -> list[tuple[int, int, int, int]]:
+    # (x, y, width, height) of every tile, row by row; the last row and column are narrower
+    return [(x0, y0, min(tile_size, width - x0), min(tile_size, height - y0))
+            for y0 in range(0, height, tile_size) for x0 in range(0, width, tile_size)]
+
+def _attach(name: str) -> None:
+    # Worker initializer
+    global _shared
+    _shared = shared_memory.SharedMemory(name=name)
+
+def _map(function, tasks: list[tuple], grid: SharedGrid, workers: int) -> list:
+    # function(*task) for every task with the grid's block as _shared, in worker
+    # processes, or in this one for a single worker
+    global _shared
+    if workers <= 1:
+        _shared = grid.shm
+        try:
+            return [function(*task) for task in tasks]
+        finally:
+            _shared = None
+    with ProcessPoolExecutor(max_workers=workers, initializer=_attach, initargs=(grid.shm.name,)) as executor:
+        return list(executor.map(function, *zip(*tasks)))
+
+def carve_tile(width: int, x0: int, y0: int, tile_width: int, tile_height: int, seed: int, algorithm: str) -> None:
+    # Worker task: one tile as a perfect maze, copied row by row into the shared grid
+    tile = MazeGrid(tile_width, tile_height)
+    get_generator(algorithm)(tile, random.Random(f"tile:{seed}:{x0}:{y0}"))
+    buf = _shared.buf
+    for y in range(tile_height):
+        start = (y0 + y) * width + x0
+        buf[start:start + tile_width] = tile.cells[y * tile_width:(y + 1) * tile_width]
+
+def join_tiles(grid: MazeGrid, tile_size: int, rng: random.Random, algorithm: str = "dfs") -> int:
+    # Open one doorway, at a random place along the shared edge, between the tiles
+    # joined by a spanning tree over the tile graph: a maze carved with the tiles as its
+    # cells. Returns the number of doorways (tiles - 1).
+    w, h = grid.width, grid.height
+    tree = MazeGrid(-(-w // tile_size), -(-h // tile_size))
+    if len(tree) == 0:
+        return 0
+    get_generator(algorithm)(tree, rng)
+    doorways = 0
+    for t in range(len(tree)):
+        x0, y0 = t % tree.width * tile_size, t // tree.width * tile_size
+        x1, y1 = min(x0 + tile_size, w), min(y0 + tile_size, h)
+        if tree[t] & EAST:
+            index = rng.randrange(y0, y1) * w + x1 - 1
+            grid[index] |= EAST
+            grid[index + 1] |= WEST
+            doorways += 1
+        if tree[t] & SOUTH:
+            index = (y1 - 1) * w + rng.randrange(x0, x1)
+            grid[index] |= SOUTH
+            grid[index + w] |= NORTH
+            doorways += 1
+    return doorways
+
+def generate_tiled(width: int, height: int, seed: int, tile_size: int = TILE_SIZE, workers: int | None = None,
+                   algorithm: str = "dfs") -> SharedGrid:
+    # A perfect width x height maze carved a tile per task by `workers` processes (all
+    # cores by default). The caller closes the returned grid.
+    get_generator(algorithm)  # fail early on an unknown name
+    tasks = [(width, x0, y0, tw, th, seed, algorithm) for x0, y0, tw, th in tiles(width, height, tile_size)]
+    shared = SharedGrid(width, height)
+    try:
+        _map(carve_tile, tasks, shared, min(workers or os.cpu_count() or 1, len(tasks)))
+        join_tiles(shared.grid, tile_size, random.Random(f"tiles:{seed}"), algorithm)
+    except BaseException:
+        shared.close()
+        raise
+    return shared
+
+def check_tile(width: int, height: int, x0: int, y0: int, tile_width: int, tile_height: int) -> tuple:
+    # Worker task: the passages within one tile, labelled into connected components.
+    # Returns (components, acyclic, consistent, passages east, passages south, west
+    # labels, north labels): the crossings to the next tiles as (row or column,
+    # component) and the components of this tile's west and north border cells by row
+    # or column, for check_perfect() to join up.
+    buf = _shared.buf
+    cells = bytearray().join(buf[(y0 + y) * width + x0:(y0 + y) * width + x0 + tile_width]
+                             for y in range(tile_height))
+    tw = tile_width
+    total = len(cells)
+    last_row = total - tw
+    label = array("i", [-1]) * total
+    components = passages = 0
+    consistent = True
+    for first in range(total):
+        if label[first] >= 0:
+            continue
+        label[first] = components
+        queue = deque([first])
+        while queue:
+            index = queue.popleft()
+            cell = cells[index]
+            x = index % tw
+            for bit, back, inside, neighbour in ((EAST, WEST, x < tw - 1, index + 1),
+                                                 (SOUTH, NORTH, index < last_row, index + tw),
+                                                 (WEST, EAST, x > 0, index - 1),
+                                                 (NORTH, SOUTH, index >= tw, index - tw)):
+                if not inside:
+                    continue
+                if bool(cell & bit) != bool(cells[neighbour] & back):
+                    consistent = False
+                elif cell & bit:
+                    passages += bit in (EAST, SOUTH)
+                    if label[neighbour] < 0:
+                        label[neighbour] = components
+                        queue.append(neighbour)
+        components += 1
+
+    east, south = [], []
+    if x0 + tw < width:
+        for y in range(tile_height):
+            a, b = cells[y * tw + tw - 1] & EAST, buf[(y0 + y) * width + x0 + tw] & WEST
+            if a and b:
+                east.append((y, label[y * tw + tw - 1]))
+            elif a or b:
+                consistent = False
+    if y0 + tile_height < height:
+        for x in range(tw):
+            a, b = cells[last_row + x] & SOUTH, buf[(y0 + tile_height) * width + x0 + x] & NORTH
+            if a and b:
+                south.append((x, label[last_row + x]))
+            elif a or b:
+                consistent = False
+    west = {y: label[y * tw] for y in range(tile_height) if cells[y * tw] & WEST} if x0 else {}
+    north = {x: label[x] for x in range(tw) if cells[x] & NORTH} if y0 else {}
+    return components, passages == total - components, consistent, east, south, west, north
+
+def check_perfect(shared: SharedGrid, tile_size: int = TILE_SIZE, workers: int | None = None) -> MazeCheck:
+    # Whether the maze is connected and acyclic, one tile per task like generate_tiled
+    # (any tile size works). Each tile's passages are labelled into components in a
+    # worker; a union-find over those components then follows the passages between
+    # tiles: the maze is connected when they all end up in one set, and acyclic when no
+    # tile has a cycle and no crossing joins a set to itself. Openings to the outside
+    # (the entrances) are ignored.
+    w, h = shared.grid.width, shared.grid.height
+    layout = tiles(w, h, tile_size)
+    results = _map(check_tile, [(w, h, *tile) for tile in layout], shared,
+                   min(workers or os.cpu_count() or 1, len(layout)))
+    columns = -(-w // tile_size)
+    first = array("i")  # union-find node of each tile's component 0
+    nodes = 0
+    for result in results:
+        first.append(nodes)
+        nodes += result[0]
+    parent = array("i", range(nodes))
+
+    def find(node: int) -> int:
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    acyclic = all(result[1] for result in results)
+    consistent = all(result[2] for result in results)
+    sets = len(parent)
+    for t, (_, _, _, east, south, _, _) in enumerate(results):
+        for crossings, neighbour, side in ((east, t + 1, 5), (south, t + columns, 6)):
+            for position, component in crossings:
+                border = results[neighbour][side]  # the neighbour's west or north labels
+                a, b = find(first[t] + component), find(first[neighbour] + border[position])
+                if a == b:
+                    acyclic = False
+                else:
+                    parent[b] = a
+                    sets -= 1
+    return MazeCheck(sets <= 1, acyclic, consistent)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate a huge maze across CPU cores, tile by tile")
+    parser.add_argument("size", type=parse_size, help="maze size as WIDTHxHEIGHT, e.g. 20000x20000")
+    parser.add_argument("path", nargs="?", help="save the maze to this maze file (see maze_format.py)")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--algorithm", choices=list(GENERATORS), default="dfs", help="algorithm carving each tile")
+    parser.add_argument("--tile", type=int, default=TILE_SIZE, metavar="CELLS", help="tile side in cells")
+    parser.add_argument("--workers", type=int, help="worker processes (default: one per core)")
+    parser.add_argument("--check", action="store_true", help="verify that the maze is perfect")
+    args = parser.parse_args()
+
+    width, height = args.size
+    seed = random.getrandbits(64) if args.seed is None else args.seed
+    workers = args.workers or os.cpu_count() or 1
+    start = time.perf_counter()
+    with generate_tiled(width, height, seed, args.tile, workers, args.algorithm) as shared:
+        elapsed = time.perf_counter() - start
+        print(f"Carved {width}x{height} {args.algorithm} maze (seed {seed}) in {len(tiles(width, height, args.tile))} "
+              f"tiles with {workers} workers in {elapsed:.2f}s")
+        if args.check:
+            start = time.perf_counter()
+            check = check_perfect(shared, args.tile, workers)
+            print(f"connected: {check.connected}, acyclic: {check.acyclic}, consistent: {check.consistent} "
+                  f"(checked in {time.perf_counter() - start:.2f}s)")
+        if args.path:
+            # Entrances as a round on this maze would open them
+            rng = random.Random(seed)
+            left, right = rng.randint(1, height - 2), rng.randint(1, height - 2)
+            shared.grid[left * width] |= WEST
+            shared.grid[right * width + width - 1] |= EAST
+            save_maze(args.path, shared.grid, left, right, seed)
+            print(f"Saved to {args.path}")
+
+if __name__ == "__main__":
+    main()
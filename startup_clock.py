@@ -0,0 +1,5 @@
+import time
+
+# Imported first by amazing_maze, so this reading predates its other (slow) imports;
+# --measure-startup times everything from here to the first title frame
+STARTUP_CLOCK = time.perf_counter()
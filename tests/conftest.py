@@ -0,0 +1,20 @@
+import os
+
+import pytest
+
+# Offscreen rendering for the tests that build the game; must be set before pygame
+# creates the display
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from tests.mazes import SEED
+
+@pytest.fixture
+def game():
+    # The pygame front-end with its prefetcher closed, so rounds generate synchronously
+    from amazing_maze import AmazingMaze
+
+    game = AmazingMaze(seed=SEED)
+    game.prefetcher.close()
+    game.prefetcher.take = lambda: (None, None)
+    return game
@@ -0,0 +1,31 @@
+from collections import deque
+
+from maze_grid import DIR_BIT, DIR_DX, DIR_DY, MazeGrid
+
+SEED = 1976
+
+def is_perfect(grid: MazeGrid) -> bool:
+    # Every cell reached from cell 0 through passages that are open from both sides,
+    # over exactly cells - 1 of them (a spanning tree); openings at the edge (such as
+    # the entrances) lead off the grid and are not counted
+    w, h = grid.width, grid.height
+    cells = grid.cells
+    seen = bytearray(len(cells))
+    seen[0] = 1
+    queue = deque([0])
+    edges = 0
+    while queue:
+        index = queue.popleft()
+        x, y = index % w, index // w
+        for d in range(4):
+            nx, ny = x + DIR_DX[d], y + DIR_DY[d]
+            if not (cells[index] & DIR_BIT[d] and 0 <= nx < w and 0 <= ny < h):
+                continue
+            neighbour = ny * w + nx
+            if not cells[neighbour] & DIR_BIT[(d + 2) % 4]:
+                return False  # a passage open from one side only
+            edges += d in (1, 2)
+            if not seen[neighbour]:
+                seen[neighbour] = 1
+                queue.append(neighbour)
+    return all(seen) and edges == len(cells) - 1
@@ -0,0 +1,18 @@
+import pytest
+
+from benchmarks.bench_allocations import ai_steps, measure, player_steps
+from maze_simulation import MazeSimulation
+from tests.mazes import SEED
+
+# Memory traced while the AI (or a player) steps through a maze must not grow, and
+# the transient peak must stay within a few objects
+RETAINED_LIMIT = 1.0  # bytes per step
+PEAK_LIMIT = 4096  # bytes above the starting point
+
+@pytest.mark.parametrize("func", [ai_steps, player_steps], ids=["move_ai", "step"])
+def test_movement_does_not_allocate(func):
+    sim = MazeSimulation(100, 100)
+    sim.start_round(two_player_mode=False, warmup=False, seed=SEED)
+    retained, peak, _ = measure(func, sim, 10_000)
+    assert retained <= RETAINED_LIMIT
+    assert peak <= PEAK_LIMIT
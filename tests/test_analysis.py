@@ -0,0 +1,40 @@
+import random
+
+import pytest
+
+from benchmarks.bench_analysis import border_cells, cell_degrees, path_statistics
+from maze_analysis import JunctionGraph, iter_junction_graph
+from maze_generators import GENERATORS
+from maze_simulation import MazeSimulation
+from tests.mazes import SEED
+
+MAZES = 10
+
+@pytest.mark.parametrize("name", list(GENERATORS))
+def test_junction_graph_matches_find_path(name):
+    # The index against find_path and per-cell counts
+    rng = random.Random(SEED)
+    for i in range(MAZES):
+        width, height = rng.randint(3, 50), rng.randint(3, 40)
+        sim = MazeSimulation(width, height, algorithm=name)
+        sim.start_round(two_player_mode=False, seed=SEED + i)
+        graph = JunctionGraph(sim.maze, border_cells(width, height))
+        degrees = cell_degrees(sim)
+        assert graph.dead_end_count == degrees.count(1)
+        assert graph.longest_corridor <= width * height
+        for _ in range(5):
+            start, target = rng.randrange(height) * width, rng.randrange(height) * width + width - 1
+            assert (graph.solution_length(start, target), graph.decisions(start, target)) == \
+                path_statistics(sim, start, target, degrees)
+
+def test_incremental_graph_matches_one_pass():
+    # Every step of iter_junction_graph leaves a usable graph, and the last one is the
+    # same index the constructor builds
+    assert JunctionGraph().dead_end_count == 0
+    sim = MazeSimulation(60, 40)
+    sim.start_round(two_player_mode=False, seed=SEED)
+    terminals = border_cells(60, 40)
+    expected = JunctionGraph(sim.maze, terminals)
+    for graph in iter_junction_graph(sim.maze, terminals, batch=64):
+        assert graph.longest_corridor >= 0
+    assert vars(graph) == vars(expected)
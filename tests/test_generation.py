@@ -0,0 +1,33 @@
+import argparse
+import hashlib
+import random
+
+import pytest
+
+import maze_grid
+from maze_grid import generate_dfs, parse_size
+from tests.mazes import SEED
+
+# sha256 prefix of the cells, and the next 32 random bits: the same on every
+# installation, with or without NumPy, so seeds, saved levels and replays carry over
+PINNED = {(20, 15): ("9a9970350541ac7b", 101192786), (200, 150): ("2af9580839fb491c", 3095550682)}
+
+def carve(width: int, height: int) -> tuple[str, int]:
+    rng = random.Random(SEED)
+    grid = generate_dfs(width, height, rng)
+    return hashlib.sha256(grid.tobytes()).hexdigest()[:16], rng.getrandbits(32)
+
+def test_seeded_mazes_are_pinned():
+    for size, expected in PINNED.items():
+        assert carve(*size) == expected, size
+
+def test_generation_does_not_depend_on_numpy(monkeypatch):
+    with_numpy = [carve(*size) for size in PINNED]
+    monkeypatch.setattr(maze_grid, "np", None)
+    assert [carve(*size) for size in PINNED] == with_numpy
+
+def test_parse_size():
+    assert parse_size("20x15") == parse_size("20X15") == (20, 15)
+    for text in ("20", "20x", "x15", "20x15x2", "0x15", "-1x5", "20 by 15"):
+        with pytest.raises(argparse.ArgumentTypeError):
+            parse_size(text)
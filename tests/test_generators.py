@@ -0,0 +1,20 @@
+import random
+
+import pytest
+
+from maze_generators import GENERATORS
+from maze_grid import VISITED, MazeGrid
+from tests.mazes import SEED, is_perfect
+
+SIZES = 30
+
+@pytest.mark.parametrize("name", list(GENERATORS))
+def test_generators_carve_perfect_mazes(name):
+    # A spanning tree: every cell carved and reachable, cells - 1 passages
+    rng = random.Random(SEED)
+    carve = GENERATORS[name]
+    for i in range(SIZES):
+        width, height = rng.randint(1, 60), rng.randint(1, 60)
+        grid = MazeGrid(width, height)
+        carve(grid, random.Random(SEED + i))
+        assert all(cell & VISITED for cell in grid.cells) and is_perfect(grid), f"{width}x{height} seed {SEED + i}"
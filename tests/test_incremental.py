@@ -0,0 +1,24 @@
+from maze_simulation import MazeSimulation
+from tests.mazes import SEED
+
+ROUNDS = 50
+
+def test_incremental_rounds_match_blocking_generation():
+    # An incrementally carved round must end up exactly like a blocking one: same
+    # maze, entrances, distance fields and rng state, whatever the batch size; every
+    # other round also builds the junction graph for a minimum difficulty
+    for i in range(ROUNDS):
+        width, height = 2 + (i * 7) % 61, 3 + (i * 11) % 47
+        min_difficulty = 20.0 if i % 2 else 0.0
+        blocking = MazeSimulation(width, height, min_difficulty=min_difficulty)
+        blocking.start_round(two_player_mode=False, seed=SEED + i)
+        incremental = MazeSimulation(width, height, min_difficulty=min_difficulty)
+        incremental.carve_batch = 1 + i % 300
+        incremental.start_round(two_player_mode=False, seed=SEED + i, incremental=True)
+        carved = sum(len(cells) for cells in incremental.carving)
+        assert carved == width * height and incremental.carving is None
+        assert incremental.maze.cells == blocking.maze.cells
+        assert (incremental.player1_pos, incremental.player2_pos) == (blocking.player1_pos, blocking.player2_pos)
+        assert incremental.player1_distances == blocking.player1_distances
+        assert incremental.player2_distances == blocking.player2_distances
+        assert incremental.rng.getstate() == blocking.rng.getstate()
@@ -0,0 +1,22 @@
+import random
+
+from maze_format import load_maze, save_maze
+from maze_grid import generate_dfs
+from tests.mazes import SEED
+
+MAZES = 50
+
+def test_mazes_round_trip(tmp_path):
+    # generate_maze output saved and loaded again must be identical
+    rng = random.Random(SEED)
+    path = str(tmp_path / "maze.amz")
+    for i in range(MAZES):
+        width, height = rng.randint(1, 80), rng.randint(3, 60)
+        grid = generate_dfs(width, height, rng)
+        left, right = rng.randint(1, height - 2), rng.randint(1, height - 2)
+        save_maze(path, grid, left, right, SEED + i)
+        with load_maze(path) as maze:
+            assert (maze.width, maze.height, maze.left_entrance_y, maze.right_entrance_y, maze.seed) == \
+                (width, height, left, right, SEED + i)
+            assert maze.to_grid().tobytes() == grid.tobytes()
+            assert all(maze.cell(x, y) == grid[y * width + x] & 15 for y in range(height) for x in range(width))
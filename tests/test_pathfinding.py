@@ -0,0 +1,30 @@
+import random
+
+from benchmarks.bench_pathfinding import legacy_can_move, legacy_find_path, random_endpoints
+from maze_grid import Vec2I, generate_dfs
+from maze_pathfinding import find_path
+from tests.mazes import SEED
+
+MAZES = 200
+
+def test_find_path_matches_the_original():
+    # On seeded random mazes the heap A* must return paths of the same length as the
+    # original, and every step must be a legal one-cell move
+    rng = random.Random(SEED)
+    for i in range(MAZES):
+        width, height = rng.randint(3, 60), rng.randint(3, 45)
+        grid = generate_dfs(width, height, rng)
+        start, target = random_endpoints(grid, rng)
+        if rng.random() < 0.5:
+            target = Vec2I(rng.randrange(width), rng.randrange(height))
+
+        expected = legacy_find_path(grid, start, target)
+        actual = find_path(grid, start, target)
+        assert len(actual) == len(expected), f"maze {i} ({width}x{height})"
+        previous = start
+        for pos in actual:
+            direction = Vec2I(pos.x - previous.x, pos.y - previous.y)
+            assert legacy_can_move(grid, previous, direction), f"maze {i}: illegal step {previous} -> {pos}"
+            previous = pos
+        if actual:
+            assert actual[-1] == target
@@ -0,0 +1,51 @@
+import random
+import threading
+from concurrent.futures import Future
+
+from maze_prefetch import MazePrefetcher
+from maze_simulation import prepare_maze
+from tests.mazes import SEED
+
+def prefetcher_with(future: Future) -> MazePrefetcher:
+    # A prefetcher whose only pending maze is future, for seed 7
+    prefetcher = MazePrefetcher(20, 15, random.Random(SEED), size=0, use_processes=False, start=False)
+    prefetcher.pending.append((7, future))
+    return prefetcher
+
+def test_take_waits_for_a_running_maze():
+    future = Future()
+    future.set_running_or_notify_cancel()
+    maze = prepare_maze(20, 15, 7)
+    threading.Timer(0.05, future.set_result, [maze]).start()
+    prefetcher = prefetcher_with(future)
+    assert prefetcher.take() == (7, maze) and prefetcher.hits == 1
+    prefetcher.close()
+
+def test_take_cancels_a_queued_maze():
+    future = Future()
+    prefetcher = prefetcher_with(future)
+    assert prefetcher.take() == (7, None) and prefetcher.misses == 1
+    assert future.cancelled()
+    prefetcher.close()
+
+def test_take_generates_a_failed_maze_itself():
+    future = Future()
+    future.set_running_or_notify_cancel()
+    future.set_exception(RuntimeError("worker died"))
+    prefetcher = prefetcher_with(future)
+    assert prefetcher.take() == (7, None) and prefetcher.misses == 1
+    prefetcher.close()
+
+def test_seeds_do_not_depend_on_worker_timing():
+    # The same seed sequence whether or not the worker has finished
+    seeds = []
+    for wait in (False, True):
+        prefetcher = MazePrefetcher(20, 15, random.Random(SEED), use_processes=False)
+        taken = []
+        for _ in range(3):
+            if wait:
+                prefetcher.pending[0][1].result()
+            taken.append(prefetcher.take()[0])
+        prefetcher.close()
+        seeds.append(taken)
+    assert seeds[0] == seeds[1]
@@ -0,0 +1,22 @@
+from benchmarks.bench_racers import round_with_racers, step_individually
+from maze_simulation import TICK_SECONDS
+from tests.mazes import SEED
+
+def test_batched_looped_and_individual_racers_agree():
+    # Batched (NumPy), looped and per-agent stepping must move every racer identically
+    for width, height, count in ((20, 15, 7), (60, 40, 50), (150, 100, 300)):
+        fast = round_with_racers(width, height, count, SEED, True)
+        slow = round_with_racers(width, height, count, SEED, False)
+        positions = list(slow.racers.positions)
+        timers = [0.0] * count
+        intervals = list(slow.racers.intervals)
+        for _ in range(3000):
+            if fast.racers.numpy:
+                fast.racers.step(TICK_SECONDS)
+            slow.racers.step(TICK_SECONDS)
+            step_individually(slow, positions, timers, intervals, TICK_SECONDS)
+        assert list(slow.racers.positions) == positions
+        assert slow.racers.finished == positions.count(slow.player2_target_index)
+        if fast.racers.numpy:
+            assert fast.racers.positions.tolist() == positions and fast.racers.finished == slow.racers.finished
+            assert fast.racers.moves == slow.racers.moves
@@ -0,0 +1,57 @@
+import random
+
+import pygame
+import pytest
+
+import maze_raster
+from maze_generators import GENERATORS
+from maze_grid import MazeGrid, iter_carve_dfs, np
+from tests.mazes import SEED
+
+pytestmark = pytest.mark.skipif(np is None, reason="the rasteriser needs NumPy")
+
+MAZES = 5
+
+def layers(game) -> list[bytes]:
+    # The static maze layer or, in camera mode, a few chunks around the maze's corners
+    if not game.camera_mode:
+        return [pygame.image.tobytes(game.build_maze_surface(), "RGB")]
+    last_x = (game.maze_width * game.cell_pitch) // (16 * game.cell_pitch) + 1
+    last_y = (game.maze_height * game.cell_pitch) // (16 * game.cell_pitch) + 1
+    return [pygame.image.tobytes(game.render_chunk(cx, cy), "RGB")
+            for cx in (0, 1, last_x) for cy in (0, 1, last_y)]
+
+def drawn_both_ways(game) -> bool:
+    game.rasterise = True
+    rasterised = layers(game)
+    game.rasterise = False
+    drawn = layers(game)
+    game.rasterise = True
+    return rasterised == drawn
+
+@pytest.mark.parametrize("name", list(GENERATORS))
+def test_rasterised_layers_match_draw_calls(game, name):
+    # Rasterised layers must match the per-cell draw calls pixel for pixel, on and off
+    # camera; a thumbnail must show every cell, every passage and both entrances open
+    rng = random.Random(SEED)
+    game.maze_algorithm = name
+    for i in range(MAZES):
+        game.maze_width, game.maze_height = rng.choice([(rng.randint(2, 21), rng.randint(2, 14)),
+                                                        (rng.randint(22, 70), rng.randint(2, 50))])
+        game.start_round(two_player_mode=False, warmup=False, seed=SEED + i)
+        assert drawn_both_ways(game)
+        units = maze_raster.open_units(game.maze, border=True)
+        cells = game.maze_width * game.maze_height
+        assert int(units.sum()) == cells + (cells - 1) + 2
+
+def test_part_carved_mazes_match_draw_calls(game):
+    rng = random.Random(SEED)
+    for i in range(MAZES):
+        game.maze_width, game.maze_height = rng.randint(2, 70), rng.randint(2, 50)
+        game.start_round(two_player_mode=False, warmup=False, seed=SEED + i)
+        game.maze = MazeGrid(game.maze_width, game.maze_height)
+        game.carving = carving = iter_carve_dfs(game.maze, random.Random(SEED + i), batch=7)
+        for _ in range(rng.randint(0, len(game.maze) // 7)):
+            next(carving, None)
+        assert drawn_both_ways(game)
+    game.carving = None
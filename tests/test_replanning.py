@@ -0,0 +1,44 @@
+import random
+
+from benchmarks.bench_replanning import block_cells
+from maze_pathfinding import descend, distance_field
+from maze_replanning import DStarLite
+from maze_simulation import MazeSimulation
+from tests.mazes import SEED
+
+ROUNDS = 10
+
+def test_planners_follow_shifting_walls():
+    # Through whole rounds of shifting walls the maze must stay perfect, and after every
+    # shift both planners must agree with a fresh breadth-first search on the distance
+    # and on the computer's next move, until it reaches its exit
+    rng = random.Random(SEED)
+    for i in range(ROUNDS):
+        width, height = rng.randint(2, 60), rng.randint(3, 40)
+        sim = MazeSimulation(width, height, shifting_walls=True)
+        sim.start_round(two_player_mode=False, warmup=False, seed=SEED + i)
+        dstar = DStarLite(sim.maze, sim.player2_target_index, sim.player2_index)  # searched, not from the field
+        moves = 0
+        while not sim.player2_finished and moves < 100_000:
+            field = distance_field(sim.maze, sim.player2_target_index)
+            passages = sum(bin(cell & 15).count("1") for cell in sim.maze.cells)
+            assert -1 not in field and passages == 2 * (width * height - 1) + 2
+            assert sim.planner.distance() == dstar.distance() == field[sim.player2_index]
+            expected = descend(sim.maze, field, sim.player2_index)
+            assert sim.planner.next_cell() == dstar.next_cell() == expected
+            sim.move_ai()
+            dstar.move_to(sim.player2_index)
+            moves += 1
+            dstar.update_walls(block_cells(width, sim.shift_walls()))
+        assert sim.player2_finished
+
+def test_exit_distances_follow_shifting_walls():
+    # distance_to_exit answers for the maze as it is now, for both players
+    sim = MazeSimulation(30, 20, shifting_walls=True)
+    sim.start_round(two_player_mode=True, warmup=False, seed=SEED)
+    for _ in range(20):
+        assert sim.shift_walls()
+        for player, target in ((1, sim.player1_target_index), (2, sim.player2_target_index)):
+            field = distance_field(sim.maze, target)
+            assert sim.exit_distances(player) == field
+            assert sim.distance_to_exit(sim.player1_start, player) == field[sim.player1_index]
@@ -0,0 +1,47 @@
+import random
+
+import pytest
+
+from maze_format import load_maze, save_round
+from maze_replay import MASK_MOVES, Replay
+from maze_simulation import TICK_SECONDS, MazeSimulation
+from tests.mazes import SEED
+
+def state(sim: MazeSimulation) -> tuple:
+    racers = list(sim.racers.positions) if sim.racers is not None else []
+    return (sim.game_state, sim.ticks, sim.player1_index, sim.player2_index, sim.maze.tobytes(), racers)
+
+def record(sim: MazeSimulation, loaded=None) -> Replay:
+    # A round with random held directions, recorded through step(); racers only run
+    # in single-player rounds
+    replay = Replay.record_round(sim, not sim.racer_count, warmup=False, seed=SEED, loaded=loaded)
+    rng = random.Random(SEED)
+    for _ in range(2000):
+        sim.step(MASK_MOVES[rng.randrange(16)], MASK_MOVES[rng.randrange(16)], TICK_SECONDS)
+    return replay
+
+@pytest.mark.parametrize("options", [{}, {"algorithm": "kruskal", "racers": 5, "min_difficulty": 5.0},
+                                     {"shifting_walls": True}])
+def test_replay_round_trip(options):
+    sim = MazeSimulation(20, 15, **options)
+    replay = Replay.from_bytes(record(sim).to_bytes())
+    assert replay.algorithm == sim.maze_algorithm and replay.racers == sim.racer_count
+    assert replay.min_difficulty == sim.min_difficulty and replay.shifting_walls == sim.shifting_walls
+    assert state(replay.play()) == state(sim)
+
+def test_replay_embeds_loaded_mazes(tmp_path):
+    source = MazeSimulation(30, 20)
+    source.start_round(two_player_mode=False, warmup=False, seed=SEED + 1)
+    save_round(tmp_path / "level.amz", source)
+    with load_maze(tmp_path / "level.amz") as mapped:
+        loaded = mapped.prepared()
+    sim = MazeSimulation(30, 20)
+    replay = Replay.from_bytes(record(sim, loaded).to_bytes())
+    assert replay.maze is not None
+    assert state(replay.play()) == state(sim)
+
+def test_replay_rejects_other_versions():
+    data = bytearray(Replay(20, 15, SEED, False).to_bytes())
+    data[4] = 2
+    with pytest.raises(ValueError, match="version"):
+        Replay.from_bytes(bytes(data))
@@ -0,0 +1,43 @@
+import asyncio
+import random
+
+from benchmarks.bench_server import DIRECTIONS, receive_all
+from maze_server import MazeClient, MazeServer
+from maze_simulation import TICK_SECONDS, MazeSimulation
+from tests.mazes import SEED
+
+ROOMS = 4
+
+async def play_rooms(rooms: int) -> None:
+    # Two-player rooms over loopback: every client's maze must be the one its seed
+    # generates, and once input stops its mirrored positions must match the server's
+    server = MazeServer(20, 15, seed=SEED)
+    port = await server.start("127.0.0.1", 0)
+    clients = [await MazeClient.connect(f"room-{i // 2}", 2, port=port) for i in range(2 * rooms)]
+    readers = [asyncio.create_task(receive_all(client, [])) for client in clients]
+    rng = random.Random(SEED)
+    try:
+        for _ in range(150):  # warm-up plus two seconds of play
+            for client in clients:
+                client.send_input(rng.choice(DIRECTIONS))
+            await asyncio.sleep(TICK_SECONDS * 2)
+        for client in clients:
+            client.send_input(())
+        await asyncio.sleep(0.3)
+
+        for i, client in enumerate(clients):
+            sim = server.rooms[f"room-{i // 2}"].sim
+            expected = MazeSimulation(20, 15)
+            expected.start_round(two_player_mode=True, seed=client.seed)
+            assert client.seat == i % 2 + 1 and client.seed == sim.seed
+            assert bytes(client.maze.cells) == bytes(b & 15 | 16 for b in expected.maze.cells)
+            assert client.positions == [sim.player1_index, sim.player2_index]
+    finally:
+        for client in clients:
+            await client.close()
+        for reader in readers:
+            reader.cancel()
+        await server.stop()
+
+def test_clients_mirror_the_server():
+    asyncio.run(play_rooms(ROOMS))
@@ -0,0 +1,39 @@
+import random
+
+from maze_generators import GENERATORS
+from maze_grid import EAST, WEST, MazeGrid
+from maze_stream import StreamingMaze
+from tests.mazes import SEED, is_perfect
+
+STREAMS = 20
+
+def stitch(stream: StreamingMaze, chunks: int) -> MazeGrid:
+    # The first chunks of a stream side by side, as one grid
+    w, h = stream.chunk_width, stream.height
+    grid = MazeGrid(w * chunks, h)
+    for cx in range(chunks):
+        cells = stream.chunk(cx).cells
+        for y in range(h):
+            grid.cells[y * grid.width + cx * w:y * grid.width + (cx + 1) * w] = cells[y * w:(y + 1) * w]
+    return grid
+
+def test_chunks_are_reproducible_and_stitch_into_one_maze():
+    # Chunks come out the same however often they are evicted and made again, in any
+    # order, and chunks side by side form one perfect maze entered from the west
+    rng = random.Random(SEED)
+    for i in range(STREAMS):
+        algorithm = list(GENERATORS)[i % len(GENERATORS)]
+        width, height, chunks = rng.randint(2, 30), rng.randint(1, 20), rng.randint(2, 12)
+        reference = [StreamingMaze(height, width, SEED + i, algorithm, chunks).chunk(cx).tobytes()
+                     for cx in range(chunks)]
+        small = StreamingMaze(height, width, SEED + i, algorithm, max_chunks=2)
+        for cx in rng.sample(range(chunks), chunks) + list(range(chunks)):
+            assert small.chunk(cx).tobytes() == reference[cx]
+        assert len(small.chunks) == 2 and small.generated == small.evicted + 2
+
+        stream = StreamingMaze(height, width, SEED + i, algorithm, chunks)
+        grid = stitch(stream, chunks)
+        assert is_perfect(grid)
+        assert grid[stream.door_row(-1) * grid.width] & WEST
+        assert sum(grid[y * grid.width] & WEST != 0 for y in range(height)) == 1
+        assert sum(grid[(y + 1) * grid.width - 1] & EAST != 0 for y in range(height)) == 1
@@ -0,0 +1,39 @@
+import random
+
+from maze_generators import GENERATORS
+from maze_grid import EAST, SOUTH, WEST
+from maze_tiled import check_perfect, generate_tiled
+from tests.mazes import SEED, is_perfect
+
+MAZES = 10
+
+def test_tiled_mazes_are_perfect_for_any_worker_count():
+    # Tiled mazes are the same for any number of workers and perfect by both
+    # check_perfect (with any tile size) and a plain breadth-first search, and
+    # check_perfect catches an extra passage (a cycle), a missing one and a one-sided one
+    rng = random.Random(SEED)
+    for i in range(MAZES):
+        algorithm = list(GENERATORS)[i % len(GENERATORS)]
+        width, height, tile = rng.randint(2, 80), rng.randint(2, 60), rng.randint(1, 24)
+        with generate_tiled(width, height, SEED + i, tile, 1, algorithm) as one, \
+                generate_tiled(width, height, SEED + i, tile, 2, algorithm) as two:
+            assert one.grid.tobytes() == two.grid.tobytes()
+            assert check_perfect(two, rng.randint(1, 30), 2).perfect and is_perfect(two.to_grid())
+            grid = two.grid
+            walls = [c for c in range(len(grid)) if not grid[c] & EAST and c % width < width - 1]
+            if walls:
+                index = rng.choice(walls)
+                grid[index] |= EAST
+                grid[index + 1] |= WEST
+                assert check_perfect(two, tile, 2) == (True, False, True)
+
+            grid = one.grid
+            passages = [c for c in range(len(grid)) if grid[c] & EAST and c % width < width - 1]
+            index = rng.choice(passages)
+            grid[index] &= ~EAST
+            grid[index + 1] &= ~WEST
+            assert check_perfect(one, tile, 1) == (False, True, True)
+            walls = [c for c in range(len(grid) - width) if not grid[c] & SOUTH]
+            if walls:
+                grid[rng.choice(walls)] |= SOUTH
+                assert not check_perfect(one, tile, 1).consistent
@@ -0,0 +1,158 @@
+import argparse
+import csv
+import itertools
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from ai_strategies import STRATEGIES, create_strategy
+from maze_generators import GENERATORS
+from maze_grid import parse_size
+from maze_simulation import GameState, MazeSimulation
+
+RESULT_FIELDS = ["seed", "player1", "player2", "winner", "ticks", "player1_steps", "player2_steps", "wall_ms"]
+
+def play_match(sim: MazeSimulation, seed: int, player1: str, player2: str, max_ticks: int) -> dict:
+    # One seeded round between two strategies, both stepping on the player key cooldown
+    start = time.perf_counter()
+    sim.start_round(two_player_mode=True, warmup=False, seed=seed)
+    first, second = create_strategy(player1), create_strategy(player2)
+    first.reset(sim, 1)
+    second.reset(sim, 2)
+    steps = [0, 0]
+
+    while sim.game_state == GameState.PLAYING and sim.ticks < max_ticks:
+        moves1 = moves2 = ()
+        if sim.player_ready(1):
+            move = first.choose(sim, 1)
+            if move is not None:
+                moves1 = (move,)
+                steps[0] += 1
+        if sim.player_ready(2):
+            move = second.choose(sim, 2)
+            if move is not None:
+                moves2 = (move,)
+                steps[1] += 1
+        sim.step(moves1, moves2)
+
+    if sim.player1_finished and sim.player2_finished:
+        winner = "draw"
+    elif sim.player1_finished:
+        winner = player1
+    elif sim.player2_finished:
+        winner = player2
+    else:
+        winner = "timeout"
+    return {
+        "seed": seed, "player1": player1, "player2": player2, "winner": winner, "ticks": sim.ticks,
+        "player1_steps": steps[0], "player2_steps": steps[1],
+        "wall_ms": round((time.perf_counter() - start) * 1000, 3),
+    }
+
+def run_chunk(jobs: list[tuple[int, str, str]], width: int, height: int, max_ticks: int,
+              algorithm: str = "dfs") -> list[dict]:
+    # Worker entry point: a whole chunk of rounds per task keeps IPC overhead low
+    sim = MazeSimulation(width, height, algorithm=algorithm)
+    return [play_match(sim, seed, player1, player2, max_ticks) for seed, player1, player2 in jobs]
+
+def build_jobs(strategies: list[str], rounds: int, seed: int) -> list[tuple[int, str, str]]:
+    # Every pairing plays the same seeded mazes twice, once from each side
+    jobs = []
+    for a, b in itertools.combinations(strategies, 2):
+        for i in range(rounds):
+            jobs.append((seed + i, a, b))
+            jobs.append((seed + i, b, a))
+    return jobs
+
+class ResultWriter:
+    def __init__(self, path: str) -> None:
+        self.file = open(path, "w", newline="")
+        self.csv = None
+        if path.endswith(".csv"):
+            self.csv = csv.DictWriter(self.file, fieldnames=RESULT_FIELDS)
+            self.csv.writeheader()
+
+    def write(self, results: list[dict]) -> None:
+        for result in results:
+            if self.csv is not None:
+                self.csv.writerow(result)
+            else:
+                self.file.write(json.dumps(result) + "\n")
+        self.file.flush()
+
+    def close(self) -> None:
+        self.file.close()
+
+def print_summary(results: list[dict], elapsed: float) -> None:
+    games = defaultdict(int)
+    wins = defaultdict(int)
+    pair_games = defaultdict(int)
+    pair_wins = defaultdict(int)
+    for result in results:
+        pair = tuple(sorted((result["player1"], result["player2"])))
+        pair_games[pair] += 1
+        for name in (result["player1"], result["player2"]):
+            games[name] += 1
+        if result["winner"] in games:
+            wins[result["winner"]] += 1
+            pair_wins[pair, result["winner"]] += 1
+
+    print(f"\n{len(results)} rounds in {elapsed:.2f}s ({len(results) / elapsed:,.0f} rounds/s)")
+    print(f"{'strategy':>12} {'games':>8} {'win rate':>9}")
+    for name in sorted(games, key=lambda n: wins[n] / games[n], reverse=True):
+        print(f"{name:>12} {games[name]:>8} {wins[name] / games[name]:>9.1%}")
+    print()
+    for (a, b), count in sorted(pair_games.items()):
+        print(f"{a:>12} vs {b:<12} {pair_wins[(a, b), a] / count:6.1%} : {pair_wins[(a, b), b] / count:6.1%}")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Round-robin AI strategy tournament on seeded mazes")
+    parser.add_argument("strategies", nargs="*", default=list(STRATEGIES),
+                        help=f"strategies to enter: {', '.join(STRATEGIES)} (default: all)")
+    parser.add_argument("--rounds", type=int, default=200, help="mazes per pairing (each played from both sides)")
+    parser.add_argument("--size", type=parse_size, default="20x15", help="maze size as WIDTHxHEIGHT")
+    parser.add_argument("--seed", type=int, default=1976, help="seed of the first maze")
+    parser.add_argument("--algorithm", choices=list(GENERATORS), default="dfs", help="maze generation algorithm")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--chunk-size", type=int, default=64, help="rounds per worker task")
+    parser.add_argument("--max-ticks", type=int, default=200_000, help="ticks before a round is a timeout")
+    parser.add_argument("--output", default="tournament.jsonl", help="per-round results (.jsonl or .csv)")
+    args = parser.parse_args()
+
+    unknown = [name for name in args.strategies if name not in STRATEGIES]
+    if unknown:
+        parser.error(f"unknown strategies: {', '.join(unknown)}")
+    if len(args.strategies) < 2:
+        parser.error("at least two strategies are needed")
+    width, height = args.size
+    jobs = build_jobs(args.strategies, args.rounds, args.seed)
+    chunks = [jobs[i:i + args.chunk_size] for i in range(0, len(jobs), args.chunk_size)]
+
+    writer = ResultWriter(args.output)
+    results: list[dict] = []
+    start = time.perf_counter()
+    # Keep a bounded number of chunks in flight and stream results as they finish
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        pending_chunks = iter(chunks)
+        in_flight = set()
+        for chunk in itertools.islice(pending_chunks, 2 * args.workers):
+            in_flight.add(executor.submit(run_chunk, chunk, width, height, args.max_ticks, args.algorithm))
+        while in_flight:
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                chunk_results = future.result()
+                writer.write(chunk_results)
+                results.extend(chunk_results)
+                for chunk in itertools.islice(pending_chunks, 1):
+                    in_flight.add(executor.submit(run_chunk, chunk, width, height, args.max_ticks, args.algorithm))
+            print(f"\r{len(results)}/{len(jobs)} rounds", end="", file=sys.stderr)
+    writer.close()
+    print(file=sys.stderr)
+    print_summary(results, time.perf_counter() - start)
+    print(f"Results written to {args.output}")
+
+if __name__ == "__main__":
+    main()